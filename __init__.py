@@ -1,7 +1,17 @@
 #!/usr/bin/python
 from utilz import *
-from time import sleep
-from threading import Thread
+from engine import CheckEngine, RoundRunner, OverlapPolicy, CheckScheduler, SingleFlight
+from updates import StatusUpdateQueue, TokenBucket, RateLimited
+from outbox import Outbox
+from state import StateFile, StatusTable
+from adaptive import LatencyTracker, CircuitBreaker
+from registry import CheckerRegistry, FunctionChecker, BaseChecker
+from config_watch import ConfigWatcher
+from ConfigParser import Error as ConfigError
+from logging import getLogger
+from os.path import join, dirname, isabs
+from time import sleep, time
+from threading import Thread, Lock
 
 import abc
 
@@ -10,6 +20,8 @@ __date__ = '09/11/2016'
 
 # clem 11/11/2016
 __config_cache = None
+__checker_registry = None
+__registry_lock = Lock()
 CONFIG_FILE_NAME = 'config.ini'
 DEFAULT_REFRESH = 30.
 
@@ -19,77 +31,272 @@ DEFAULT_REFRESH = 30.
 #########
 class HTTPMethods(SpecialEnum):
 	GET = 'GET'
+	HEAD = 'HEAD'
 	POST = 'POST'
 	PATCH = 'PATCH'
 	DELETE = 'DELETE'
 
 
+# clem 18/10/2026
+class ProbeModes(SpecialEnum):
+	""" how url checks query their url (without a body validation, that needs a full GET) """
+	GET = 'get' # full GET, conditional if the url gave an ETag
+	HEAD = 'head' # headers only
+	RANGE = 'range' # GET of the first byte only (Range: bytes=0-0)
+
+
+# clem 18/10/2026
+class ExecutionModes(SpecialEnum):
+	THREAD = 'thread' # rounds run one at a time, with an overlap policy
+	POOL = 'pool' # rounds run one at a time on the worker pool, with a deadline and an overlap policy
+	PROCESS = 'process' # checks run on worker processes, each owning a partition of them (see shards.ShardPool)
+
+
 ##################
 # ACTUAL OBJECTS #
 ##################
 
 # move to utilz ?
 class Checkers(FunctionEnum):
-	""" the actual checks functions """
+	""" the actual checks functions of the built-in check types (registered through get_checker_registry) """
 	@staticmethod
 	def url(check):
+		""" :return: the details of the probe, true if successful
+		:rtype: networking.HTTPProbeResult | bool
+		"""
 		assert isinstance(check, CheckObject)
-		from networking import test_url
-		return test_url(check.check_data)
+		from networking import get_probe_client
+		try:
+			validator = check.new_validator()
+		except ValueError as e:
+			getLogger().warning('check %s : %s' % (check.id, e))
+			return False
+		method, headers = HTTPMethods.GET, dict()
+		if not validator and check.probe_mode == ProbeModes.HEAD:
+			method = HTTPMethods.HEAD
+		elif not validator and check.probe_mode == ProbeModes.RANGE:
+			headers['Range'] = 'bytes=0-0'
+		return get_probe_client().probe(check.check_data, check.timeout, method, headers, validator, check.probe_key)
 	
 	@staticmethod
 	def tcp(check):
 		assert isinstance(check, CheckObject)
 		from networking import test_tcp_connect
+		host, port = Checkers._tcp_target(check)
+		return test_tcp_connect(host, port, check.timeout)
+	
+	# clem 18/10/2026
+	@staticmethod
+	def _tcp_target(check):
+		""" :return: (host, port) of a tcp check
+		:rtype: tuple
+		"""
 		spl = check.check_data.split(' ')
-		host = spl[0]
-		port = spl[1]
-		return test_tcp_connect(host, port)
+		return spl[0], spl[1]
 	
 	@staticmethod
 	def ping(check):
 		assert isinstance(check, CheckObject)
 		from networking import is_host_online
-		return is_host_online(check.check_data)
+		return is_host_online(check.check_data, check.timeout)
 	
 	# clem 10/11/2016
-	@staticmethod # TODO
+	@staticmethod
 	def docker(check):
 		assert isinstance(check, CheckObject)
-		# import DockerClient
-		return False
+		from docker_client import get_docker_client, DockerClient, DockerError
+		try:
+			return DockerClient.is_up(get_docker_client(check._config.docker_socket).find(check.check_data))
+		except DockerError as e:
+			getLogger().warning('check %s : %s' % (check.id, e))
+			return False
+	
+	# clem 18/10/2026
+	@staticmethod
+	def dns(check):
+		assert isinstance(check, CheckObject)
+		return BatchCheckers.dns([check])[check][0]
+	
+	# clem 18/10/2026
+	@staticmethod
+	def _dns_question(check):
+		""" :return: (name, record type, expected value or '') of a dns check, its data being "name [type] [value]"
+		:rtype: tuple
+		:raises: ValueError
+		"""
+		spl = check.check_data.split()
+		if not spl or len(spl) > 3:
+			raise ValueError('invalid dns check data "%s"' % check.check_data)
+		from resolver import RecordTypes
+		qtype = RecordTypes.by_name(spl[1]) if len(spl) > 1 else RecordTypes.A
+		return spl[0].lower().rstrip('.'), qtype, spl[2].lower().rstrip('.') if len(spl) > 2 else ''
+
+
+# clem 18/10/2026
+class TargetNormalizers(FunctionEnum):
+	""" functions returning the canonical form of a check data, so that checks of the same type probing the same
+	target share a single probe per round """
+	@staticmethod
+	def url(data):
+		from urlparse import urlsplit, urlunsplit
+		parts = urlsplit(data.strip())
+		scheme, host, port = parts.scheme.lower(), (parts.hostname or '').rstrip('.'), parts.port
+		netloc = host if not port or (scheme, port) in [('http', 80), ('https', 443)] else '%s:%s' % (host, port)
+		if parts.username:
+			netloc = '%s@%s' % (parts.netloc.rsplit('@', 1)[0], netloc)
+		return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+	
+	@staticmethod
+	def tcp(data):
+		spl = data.split()
+		return '%s %s' % (spl[0].lower().rstrip('.'), spl[1].lstrip('0') or '0') if len(spl) == 2 else data.strip()
+	
+	@staticmethod
+	def ping(data):
+		return data.strip().lower().rstrip('.')
+	
+	@staticmethod
+	def docker(data):
+		return data.strip().lstrip('/')
+	
+	@staticmethod
+	def dns(data):
+		spl = data.split()
+		if not spl:
+			return data.strip()
+		return ' '.join([spl[0].lower().rstrip('.'), (spl[1] if len(spl) > 1 else 'A').upper()] +
+			[each.lower().rstrip('.') for each in spl[2:]])
+
+
+# clem 18/10/2026
+class BatchCheckers(FunctionEnum):
+	""" the checks functions resolving a whole list of checks of the same type at once, returning
+	{check: (status, latency)}, latency being in seconds or None if not measured """
+	@staticmethod
+	def ping(checks):
+		from networking import get_pinger
+		deadline = max(each.timeout for each in checks)
+		results = get_pinger().ping_many(set(each.check_data for each in checks), deadline=deadline)
+		return dict((each, (results[each.check_data].online, results[each.check_data].rtt)) for each in checks)
+	
+	@staticmethod
+	def tcp(checks):
+		import select
+		from networking import tcp_connect_many
+		targets = dict((each, Checkers._tcp_target(each)) for each in checks)
+		try:
+			timeouts = dict()
+			for each, target in targets.iteritems():
+				timeouts[target] = max(timeouts.get(target, 0), each.timeout)
+			results = tcp_connect_many(targets.values(), timeouts=timeouts)
+		except (select.error, IOError, OSError) as e: # single-shot fallback
+			getLogger().warning('tcp batch failed, checking one by one : %s' % e)
+			return dict((each, (Checkers.tcp(each), None)) for each in checks)
+		return dict((each, (results[target] is not None, results[target])) for each, target in targets.iteritems())
+	
+	@staticmethod
+	def docker(checks):
+		from docker_client import get_docker_client, DockerClient, DockerError
+		client = get_docker_client(checks[0]._config.docker_socket)
+		started = time()
+		try:
+			client.index() # a single listing of all the containers, for all the docker checks of the round
+		except DockerError as e:
+			getLogger().warning('docker checks : %s' % e)
+			return dict((each, (False, None)) for each in checks)
+		latency = time() - started
+		return dict((each, (DockerClient.is_up(client.find(each.check_data)), latency)) for each in checks)
+	
+	@staticmethod
+	def dns(checks):
+		from resolver import get_resolver
+		results, questions = dict(), dict()
+		for each in checks:
+			try:
+				questions[each] = Checkers._dns_question(each)
+			except ValueError as e:
+				getLogger().warning('check %s : %s' % (each.id, e))
+				results[each] = (False, None)
+		# all the queries of the round over a single socket, uncached as they check the DNS itself
+		answers = get_resolver().query_many(set((name, qtype) for name, qtype, _ in questions.itervalues()),
+			max(each.timeout for each in checks))
+		for each, (name, qtype, expected) in questions.iteritems():
+			answer = answers[(name, qtype)]
+			values = [value.lower().rstrip('.') for value in answer.values()]
+			results[each] = (answer.ok and (not expected or expected in values), answer.elapsed)
+			if not results[each][0]:
+				getLogger().debug('check %s : %s' % (each.id, answer))
+		return results
 
 
 # move to utilz ?
 class CheckObject(object): # Thread Safe
-	""" a Thread Safe check object representing a CHECK config entry with its own check() function and status memory """
-	_enabled = ''
-	_name = ''
-	_type = ''
-	_data = ''
-	_pass_t = ''
-	_pass_d = ''
-	_id = None
-	_last_status = None
-	_thread_lock = None
-	_check_def = None
-	_config = None
+	""" a Thread Safe check object representing a CHECK config entry with its own check() function and status memory
+
+	Instances are slotted, the config items other than ITEM_SLOTS being only stored if set, and their statuses are rows
+	of a StatusTable (shared by all the checks of an interface), so that very large inventories stay compact.
+	"""
+	__slots__ = ('_enabled', '_name', '_type', '_data', '_pass_t', '_pass_d', '_extra', '_id', '_config', '_state',
+		'_table', '_number', '_latency_tracker', '_breaker', '_last_probe')
+	ITEM_SLOTS = ('enabled', 'name', 'type', 'data', 'pass_t', 'pass_d')
+	UNIQUE_ITEMS = ('name', 'data', 'pass_d') # not worth interning
 	ON_TEXT = 'ONLINE'
 	OFF_TEXT = 'OFFLINE'
 	UNK_TEXT = 'UNKNOWN'
+	DEFAULT_TIMEOUT = 5.
+	DEFAULT_TIMEOUTS = {'url': 5., 'tcp': 2., 'ping': 5.}
 	
-	_checker_dict = Checkers.enum_functions() # {'url': Checkers.url, 'tcp': Checkers.tcp, 'ping': Checkers.ping}
 	
-	def __init__(self, a_tuple_list, res_id=None, config=None): # Thread Safe
+	def __init__(self, a_tuple_list, res_id=None, config=None, state=None, table=None, number=None): # Thread Safe
+		"""
+
+		:param state: where to save and restore the last status of this check
+		:type state: StateFile | None
+		:param table: where to keep the status of this check, defaults to a table of its own
+		:type table: StatusTable | None
+		:param number: the row of table to use (i.e. the one of a former definition of this check), a new one by default
+		:type number: int | None
+		"""
 		assert isinstance(a_tuple_list, list)
-		self._thread_lock = AutoLock()
 		self._config = config or get_config()
-		self._check_def = self._config.check_items_default_values_dict
-		with self._thread_lock as _:
-			self.__dict__.update(self._check_def)
-			for each in a_tuple_list:
-				self.__dict__['_%s' % each[0]] = each[1] or self._check_def.get(each[0], '')
-			self._id = res_id
+		self._state = state
+		self._table = table if table is not None else StatusTable()
+		self._number = number if number is not None else self._table.add()
+		self._id = res_id
+		self._extra = None # the other items, if any
+		self._latency_tracker, self._breaker, self._last_probe = None, None, None
+		check_def = self._config.check_items_default_values_dict
+		for each in self.ITEM_SLOTS:
+			setattr(self, '_%s' % each, check_def.get(each, ''))
+		for key, value in a_tuple_list:
+			value = value or check_def.get(key, '')
+			if isinstance(value, str) and key not in self.UNIQUE_ITEMS:
+				value = intern(value) # types, flags, defaults, ... are shared by many checks
+			if key in self.ITEM_SLOTS:
+				setattr(self, '_%s' % key, value)
+			elif value:
+				if self._extra is None:
+					self._extra = dict()
+				self._extra[key] = value
+	
+	# clem 18/10/2026
+	def _item(self, key, default=''):
+		""" :return: the value of the config item key of this check """
+		if key in self.ITEM_SLOTS:
+			return getattr(self, '_%s' % key)
+		return self._extra.get(key, default) if self._extra else default
+	
+	# clem 18/10/2026
+	def _take_over(self, previous):
+		""" keeps the status of previous, the former definition of this check (i.e. before a config reload) """
+		previous._restore()
+		self._table.set(self._number, *previous._table.get(previous._number))
+	
+	# clem 18/10/2026
+	@property
+	def _thread_lock(self):
+		""" the lock of this check, shared with a few others of its StatusTable """
+		return self._table.lock(self._number)
 	
 	@property
 	def id(self):
@@ -113,24 +320,102 @@ class CheckObject(object): # Thread Safe
 	def check_data(self):
 		return self._data
 
+	# clem 18/10/2026
+	@property
+	def interval(self):
+		""" the optional check specific interval in seconds, None if not set (i.e. use the refresh_interval) """
+		return float(self._item('interval') or 0) or None
+	
+	# clem 18/10/2026
+	@property
+	def timeout_cap(self):
+		""" the maximum timeout of the check in seconds (optional timeout key, defaults to DEFAULT_TIMEOUTS) """
+		return float(self._item('timeout') or 0) or self.DEFAULT_TIMEOUTS.get(self.check_type, self.DEFAULT_TIMEOUT)
+	
+	# clem 18/10/2026
+	@property
+	def timeout(self):
+		""" the timeout of the next probe in seconds, derived from the latencies of the last probes, see LatencyTracker """
+		if not self._config.timeout_percentile:
+			return self.timeout_cap
+		return self.latency_tracker.timeout(self.timeout_cap, self._config.timeout_percentile,
+			self._config.timeout_margin)
+	
+	# clem 18/10/2026
+	@property
+	def latency_tracker(self):
+		if self._latency_tracker is None: # an empty LatencyTracker is falsy
+			with self._thread_lock as _:
+				if self._latency_tracker is None:
+					self._latency_tracker = LatencyTracker()
+		return self._latency_tracker
+	
+	# clem 18/10/2026
+	@property
+	def breaker(self):
+		""" the CircuitBreaker of this check, retrying a persistently down check every interval, then twice less often
+		after each failure """
+		if self._breaker is None:
+			with self._thread_lock as _:
+				if self._breaker is None:
+					self._breaker = CircuitBreaker('check %s' % self.id, self.interval or self._config.refresh_interval,
+						self._config.breaker_threshold, self._config.breaker_max_spacing)
+		return self._breaker
+	
+	# clem 18/10/2026
+	@property
+	def depends_on(self):
+		""" ids of the checks this check depends on (optional depends_on key, space or comma separated), if one of them
+		is down this check is marked down as well without being probed """
+		return self._item('depends_on').replace(',', ' ').split()
+
+	# clem 18/10/2026
+	@property
+	def probe_key(self):
+		""" (check type, normalized check data) identifying the actual probe, shared by identical checks """
+		checker = self.checker
+		key = self.check_type, checker.normalize(self.check_data) if checker else self.check_data.strip()
+		if self.check_validation_type: # same target, but not the same probe
+			key += (self.check_validation_type, self.check_validation_data)
+		if self.check_type == 'url':
+			key += (self.probe_mode, )
+		return key
+	
+	# clem 18/10/2026
+	@property
+	def probe_mode(self):
+		""" how a url check queries its url (optional probe_mode key, see ProbeModes), defaults to conf.url_probe_mode """
+		mode = (self._item('probe_mode') or self._config.url_probe_mode).lower()
+		return mode if mode in ProbeModes() else ProbeModes.GET
+
 	@property
 	def check_validation_type(self):
 		return self._pass_t
 
 	@property
 	def check_validation_data(self):
-		return self._pass_t
+		return self._pass_d
+	
+	# clem 18/10/2026
+	def new_validator(self):
+		""" :return: a new validator of the response body, according to check_validation_type (substring, regex, json
+		or max_size) and check_validation_data, None if the check has no validation type
+		:rtype: validation.BodyValidator | None
+		:raises: ValueError if the validation type is unknown or its data invalid
+		"""
+		from validation import get_validator
+		return get_validator(self.check_validation_type.strip().lower(), self.check_validation_data)
 	
 	# clem 14/11/2016
 	@property
 	def check_api_key(self):
-		return self.__dict__.get('_%s' % self._config.KEY_API_KEY, self._config.api_key)
+		return self._item(self._config.KEY_API_KEY, self._config.api_key)
 	
 	@property
 	def data_dict(self):
 		a_dict = AutoOrderedDict({'id': self.id})
-		for each in self._check_def:
-			a_dict.update({each: self.__getattribute__(each)})
+		for each in self._config.check_items_default_values_dict:
+			a_dict.update({each: self._item(each)})
 		return a_dict
 
 	# clem 10/11/2016
@@ -138,7 +423,41 @@ class CheckObject(object): # Thread Safe
 	def last_status(self):
 		# if not self._last_status:
 		# 	self.check()
-		return self._last_status
+		self._restore()
+		return self._table.get(self._number)[0]
+	
+	# clem 18/10/2026
+	@property
+	def last_change(self):
+		""" time of the last status change, None if unknown """
+		self._restore()
+		return self._table.get(self._number)[1]
+	
+	# clem 18/10/2026
+	@property
+	def last_latency(self):
+		""" duration of the last check in seconds, None if unknown """
+		self._restore()
+		return self._table.get(self._number)[2]
+	
+	# clem 18/10/2026
+	def _restore(self): # Thread Safe
+		""" lazily loads the last status saved by a previous run, if any """
+		if self._table.loaded(self._number):
+			return
+		record = self._state.get(self.id) if self._state is not None else None
+		with self._thread_lock as _:
+			if not self._table.loaded(self._number):
+				self._table.set(self._number, *(record or (None, None, None)))
+				if record:
+					self._publish(*record)
+	
+	# clem 18/10/2026
+	def _publish(self, status, change, latency):
+		""" updates the record of this check on the StatusBoard of its table, if any """
+		board = self._table.board
+		if board is not None:
+			board.publish(self.id, self.name, status, change, latency)
 	
 	# clem 10/11/2016
 	def status_text(self, status):
@@ -149,25 +468,149 @@ class CheckObject(object): # Thread Safe
 	def textual_status(self):
 		return self.status_text(self.last_status)
 
-	def check(self):  # Thread Safe
-		status = False
+	# clem 18/10/2026
+	def _probe(self):
+		""" :return: the status and the duration of the probe, and its details if the checker gives any
+		:rtype: (bool, float, object)
+		"""
+		result = False
+		started = time()
+		checker = self.checker
+		if checker:
+			result = checker.check(self)
+		else:
+			print 'There is no "%s" checker' % self.check_type
+		return bool(result), time() - started, result if not isinstance(result, bool) else None
+	
+	def check(self, flight=None):  # Thread Safe
+		"""
+
+		:param flight: the SingleFlight of the round, to share the probe with identical checks
+		:type flight: SingleFlight | None
+		"""
+		status, latency = False, None
 		if self.enabled:
-			if self.check_type in self._checker_dict.keys():
-				status = self._checker_dict[self.check_type](self)
-			else:
-				print 'There is no "%s" checker' % self.check_type
+			started = time()
+			status, latency, self._last_probe = flight.do(self.probe_key, self._probe) if flight else self._probe()
+			self._record_probe(status, latency, started)
+		return self._set_status(status, latency)
+	
+	# clem 18/10/2026
+	@property
+	def last_probe(self):
+		""" the details of the last probe if its checker gives any, i.e. the HTTPProbeResult of a url check and its
+		connect, TLS, TTFB and total timings """
+		return self._last_probe
+	
+	# clem 18/10/2026
+	def _record_probe(self, status, latency, started=None):  # Thread Safe
+		""" feeds the outcome of a probe to the latency tracker and the circuit breaker
+
+		:param started: start time of the probe, defaults to now
+		:type started: float | None
+		"""
+		self.latency_tracker.record(bool(status), latency)
+		self.breaker.record(bool(status), started)
+	
+	# clem 18/10/2026
+	def set_result(self, status, latency=None, details=None):  # Thread Safe
+		""" sets the outcome of a probe made by another process (i.e. a worker of a ShardPool)
+
+		:type status: bool
+		:type latency: float | None
+		:param details: the text of its details, if any
+		:type details: str | None
+		:return: the new status
+		:rtype: bool
+		"""
+		self._last_probe = details
+		return self._set_status(status, latency)
+	
+	# clem 18/10/2026
+	def detach_state(self):
+		""" loads the last saved status, and stops saving the next ones to the StateFile, which another process owns """
+		if self._state is not None:
+			self._restore()
+			self._state = None
+	
+	# clem 18/10/2026
+	def skip(self):  # Thread Safe
+		""" marks the check as down without probing it, i.e. when a check it depends on is down """
+		return self._set_status(False)
+	
+	# clem 18/10/2026
+	def _set_status(self, status, latency=None):  # Thread Safe
+		self._restore()
 		with self._thread_lock as _:
-			self._last_status = status
-		return self._last_status
+			last_status, last_change, _ = self._table.get(self._number)
+			if status != last_status or last_change is None:
+				last_change = time()
+			self._table.set(self._number, status, last_change, latency)
+			self._publish(status, last_change, latency)
+		if self._state is not None:
+			self._state.set(self.id, status, latency)
+		return status
+	
+	# clem 18/10/2026
+	@property
+	def checker(self):
+		""" the checker of this check type, None if there is none
+		:rtype: BaseChecker | None
+		"""
+		return get_checker_registry(self._config).get(self.check_type)
+	
+	# clem 18/10/2026
+	@classmethod
+	def has_batch_checker(cls, check_type, conf=None):
+		checker = get_checker_registry(conf).get(check_type)
+		return checker is not None and checker.batches
+	
+	# clem 18/10/2026
+	@classmethod
+	def check_many(cls, check_list, flight=None):  # Thread Safe
+		""" checks a list of checks of the same type with a single call to their batch checker, probing each target once
+
+		:type check_list: list[CheckObject]
+		:param flight: the SingleFlight of the round, to share the probes with identical checks of other calls
+		:type flight: SingleFlight | None
+		:return: the new statuses, in the same order as check_list
+		:rtype: list[bool]
+		"""
+		if not check_list:
+			return list()
+		check_type = check_list[0].check_type
+		assert all(each.check_type == check_type for each in check_list)
+		enabled = [each for each in check_list if each.enabled]
+		keys = dict((each, each.probe_key) for each in enabled)
+		representatives = dict() # probe key : the check probing it
+		for each in enabled:
+			representatives.setdefault(keys[each], each)
+		
+		def batch(keys):
+			results = check_list[0].checker.check_many([representatives[key] for key in keys])
+			return dict((key, results.get(representatives[key])) for key in keys)
+		
+		flight = flight or SingleFlight()
+		started = time()
+		results = flight.do_many([keys[each] for each in enabled], batch) if enabled else dict()
+		statuses = list()
+		for each in check_list:
+			status, latency = False, None
+			if each in keys:
+				status, latency = results.get(keys[each]) or (False, None)
+				each._record_probe(status, latency, started)
+			statuses.append(each._set_status(status, latency))
+		return statuses
 
 	def __str__(self):
-		return str(self.data_dict)
+		return 'check %s (%s %s)' % (self.id, self._type, self._data)
 
 
 # move to utilz ?
 class MyConfig(ConfigObject):
 	""" a concrete ConfigObject for this specific project """
 	DEFAULT_FILE_NAME = 'config.ini'
+	COMPILED_SUFFIX = '.compiled'
 	config_file_name = ''
 	
 	KEY_API_KEY = 'api_key'
@@ -178,7 +621,33 @@ class MyConfig(ConfigObject):
 	KEY_HTTP_MODE = 'http_mode'
 	KEY_CONF_ITEMS = 'conf_items'
 	KEY_ITEMS_PREFIX = 'items_prefix'
+	KEY_TEMPLATES_PREFIX = 'templates_prefix'
 	KEY_REFRESH_INTERVAL = 'refresh_interval'
+	KEY_MAX_CONCURRENCY = 'max_concurrency'
+	KEY_EXECUTION_MODE = 'execution_mode'
+	KEY_ROUND_DEADLINE = 'round_deadline'
+	KEY_OVERLAP_POLICY = 'overlap_policy'
+	KEY_WORKER_PROCESSES = 'worker_processes'
+	KEY_HTTP_POOL_SIZE = 'http_pool_size'
+	KEY_API_RATE = 'api_rate'
+	KEY_API_BURST = 'api_burst'
+	KEY_UPDATE_BATCH_SIZE = 'update_batch_size'
+	KEY_OUTBOX_FILE = 'outbox_file'
+	KEY_STATE_FILE = 'state_file'
+	KEY_TIMEOUT_PERCENTILE = 'timeout_percentile'
+	KEY_TIMEOUT_MARGIN = 'timeout_margin'
+	KEY_BREAKER_THRESHOLD = 'breaker_threshold'
+	KEY_BREAKER_MAX_SPACING = 'breaker_max_spacing'
+	KEY_URL_PROBE_MODE = 'url_probe_mode'
+	KEY_DOCKER_SOCKET = 'docker_socket'
+	KEY_CHECKER_MODULES = 'checker_modules'
+	KEY_DNS_SERVERS = 'dns_servers'
+	KEY_CLUSTER_NODE = 'cluster_node'
+	KEY_CLUSTER_PEERS = 'cluster_peers'
+	KEY_CLUSTER_HEARTBEAT = 'cluster_heartbeat'
+	KEY_CLUSTER_TIMEOUT = 'cluster_timeout'
+	KEY_CLUSTER_SECRET = 'cluster_secret'
+	KEY_STATUS_BOARD_FILE = 'status_board_file'
 	
 	SECTION_ITEMS_DEFAULTS_KEY = 'DEFAULT'
 	CONFIG_GENERAL_SECTION = 'SYSTEM'
@@ -190,6 +659,13 @@ class MyConfig(ConfigObject):
 		self.config_file_name = config_file_name
 		super(MyConfig, self).__init__(self.config_file_name, 'conf', 'general config for this monitor instance')
 	
+	# clem 18/10/2026
+	def _file_path(self, path):
+		""" :return: path, relative to the directory of the config file unless absolute (or empty)
+		:rtype: str
+		"""
+		return join(dirname(self.config_file_path), path) if path and not isabs(path) else path
+	
 	@property
 	def api_key(self): return self.get(self.KEY_API_KEY)
 	
@@ -215,14 +691,60 @@ class MyConfig(ConfigObject):
 	@property
 	def section_items_prefix(self): return self.get(self.KEY_ITEMS_PREFIX)
 	
+	# clem 18/10/2026
+	@property
+	def section_templates_prefix(self):
+		""" prefix of the template sections, each standing for many checks (see templates.CheckTemplate) """
+		return self.get_or_default(self.KEY_TEMPLATES_PREFIX, 'TEMPLATE_')
+	
 	# 11/11/2016
 	@property
 	def refresh_interval(self): return float(self.get(self.KEY_REFRESH_INTERVAL)) or DEFAULT_REFRESH
 	
+	# clem 18/10/2026
+	@property
+	def max_concurrency(self):
+		return int(self.get_or_default(self.KEY_MAX_CONCURRENCY, 0)) or CheckEngine.DEFAULT_CONCURRENCY
+	
+	# clem 18/10/2026
+	@property
+	def execution_mode(self):
+		mode = self.get_or_default(self.KEY_EXECUTION_MODE, ExecutionModes.THREAD).lower()
+		if mode not in ExecutionModes():
+			self.log.warning('Invalid %s "%s", using "%s"' % (self.KEY_EXECUTION_MODE, mode, ExecutionModes.THREAD))
+			mode = ExecutionModes.THREAD
+		return mode
+	
+	# clem 18/10/2026
+	@property
+	def round_deadline(self):
+		""" maximum duration of a round in pool mode, defaults to refresh_interval """
+		return float(self.get_or_default(self.KEY_ROUND_DEADLINE, 0)) or self.refresh_interval
+	
+	# clem 18/10/2026
+	@property
+	def overlap_policy(self):
+		policy = self.get_or_default(self.KEY_OVERLAP_POLICY, OverlapPolicy.SKIP).lower()
+		if policy not in OverlapPolicy():
+			self.log.warning('Invalid %s "%s", using "%s"' % (self.KEY_OVERLAP_POLICY, policy, OverlapPolicy.SKIP))
+			policy = OverlapPolicy.SKIP
+		return policy
+	
+	# clem 18/10/2026
+	@property
+	def worker_processes(self):
+		""" number of worker processes in process mode, defaults to the number of CPUs """
+		return int(self.get_or_default(self.KEY_WORKER_PROCESSES, 0)) or None
+	
 	################
 	# CUSTOM PROPS #
 	################
 	
+	# clem 18/10/2026
+	def reload(self):
+		super(MyConfig, self).reload()
+		self._check_items_defaults = dict()
+	
 	@property
 	def check_items_default_values_dict(self):
 		""" an AutoOrderedDict of default items values for checks """
@@ -236,6 +758,131 @@ class MyConfig(ConfigObject):
 	@property
 	def use_ssl(self): return self.http_mode.lower() == 'https'
 	
+	# clem 18/10/2026
+	@property
+	def http_pool_size(self):
+		""" maximum number of idle keep-alive connections kept per host """
+		from networking import HTTPConnectionPool
+		return int(self.get_or_default(self.KEY_HTTP_POOL_SIZE, HTTPConnectionPool.DEFAULT_POOL_SIZE))
+	
+	# clem 18/10/2026
+	@property
+	def api_rate(self):
+		""" maximum number of calls per second to the status page API, 0 for no limit """
+		return float(self.get_or_default(self.KEY_API_RATE, 0))
+	
+	# clem 18/10/2026
+	@property
+	def api_burst(self):
+		""" maximum number of calls to the status page API at once, defaults to api_rate """
+		return float(self.get_or_default(self.KEY_API_BURST, 0)) or None
+	
+	# clem 18/10/2026
+	@property
+	def update_batch_size(self):
+		""" maximum number of check status updates sent at once """
+		return int(self.get_or_default(self.KEY_UPDATE_BATCH_SIZE, StatusUpdateQueue.DEFAULT_BATCH_SIZE))
+	
+	# clem 18/10/2026
+	@property
+	def outbox_file(self):
+		""" path of the durable log of pending status updates (next to the config file by default), empty to disable it """
+		return self._file_path(self.get_or_default(self.KEY_OUTBOX_FILE, 'outbox.log'))
+	
+	# clem 18/10/2026
+	@property
+	def state_file(self):
+		""" path of the file saving the last status of each check across restarts (next to the config file by default),
+		empty to disable it """
+		return self._file_path(self.get_or_default(self.KEY_STATE_FILE, 'state.db'))
+	
+	# clem 18/10/2026
+	@property
+	def timeout_percentile(self):
+		""" percentile of the recent latencies of a check its timeout is derived from, 0 to always use its cap """
+		return float(self.get_or_default(self.KEY_TIMEOUT_PERCENTILE, 99))
+	
+	# clem 18/10/2026
+	@property
+	def timeout_margin(self):
+		""" seconds added to the derived timeouts """
+		return float(self.get_or_default(self.KEY_TIMEOUT_MARGIN, .25))
+	
+	# clem 18/10/2026
+	@property
+	def breaker_threshold(self):
+		""" consecutive failures after which a check is only probed at growing intervals, 0 to disable """
+		return int(self.get_or_default(self.KEY_BREAKER_THRESHOLD, CircuitBreaker.DEFAULT_THRESHOLD))
+	
+	# clem 18/10/2026
+	@property
+	def breaker_max_spacing(self):
+		""" maximum delay between two probes of a check with an open circuit, in seconds """
+		return float(self.get_or_default(self.KEY_BREAKER_MAX_SPACING, CircuitBreaker.DEFAULT_MAX_SPACING))
+	
+	# clem 18/10/2026
+	@property
+	def url_probe_mode(self):
+		""" how url checks query their url by default : get, head or range (see ProbeModes) """
+		return self.get_or_default(self.KEY_URL_PROBE_MODE, ProbeModes.GET)
+	
+	# clem 18/10/2026
+	@property
+	def docker_socket(self):
+		""" path of the unix socket of the Docker daemon, for docker checks """
+		return self.get_or_default(self.KEY_DOCKER_SOCKET, '/var/run/docker.sock')
+	
+	# clem 18/10/2026
+	@property
+	def checker_modules(self):
+		""" names of the modules to load additional checkers from (see CheckerRegistry) """
+		return self.get_or_default(self.KEY_CHECKER_MODULES, '').replace(',', ' ').split()
+	
+	# clem 18/10/2026
+	@property
+	def dns_servers(self):
+		""" ip or ip:port of the DNS servers used to resolve names and by dns checks, defaults to the ones of
+		/etc/resolv.conf """
+		return self.get_or_default(self.KEY_DNS_SERVERS, '').replace(',', ' ').split()
+	
+	# clem 18/10/2026
+	@property
+	def cluster_node(self):
+		""" host:port of this monitor in a cluster of monitors sharing the checks, empty when running alone """
+		return self.get_or_default(self.KEY_CLUSTER_NODE, '').strip()
+	
+	# clem 18/10/2026
+	@property
+	def cluster_peers(self):
+		""" host:port of all the monitors of the cluster """
+		return self.get_or_default(self.KEY_CLUSTER_PEERS, '').replace(',', ' ').split()
+	
+	# clem 18/10/2026
+	@property
+	def cluster_heartbeat(self):
+		""" seconds between two heart-beats sent to the peers """
+		from cluster import ClusterNode
+		return float(self.get_or_default(self.KEY_CLUSTER_HEARTBEAT, 0)) or ClusterNode.HEARTBEAT
+	
+	# clem 18/10/2026
+	@property
+	def cluster_timeout(self):
+		""" seconds without heart-beat after which a peer is down, defaults to 3 heart-beats """
+		return float(self.get_or_default(self.KEY_CLUSTER_TIMEOUT, 0)) or 3 * self.cluster_heartbeat
+	
+	# clem 18/10/2026
+	@property
+	def cluster_secret(self):
+		""" secret shared by the monitors of the cluster to sign their messages, none if empty """
+		return self.get_or_default(self.KEY_CLUSTER_SECRET, '')
+	
+	# clem 18/10/2026
+	@property
+	def status_board_file(self):
+		""" path of the memory-mapped file publishing the statuses to local tools (see board.BoardReader), relative to
+		the config file, empty to disable it """
+		return self._file_path(self.get_or_default(self.KEY_STATUS_BOARD_FILE, ''))
+	
 	@property
 	def api_full_url_base(self):
 		""" full url including host """
@@ -252,6 +899,30 @@ def get_config():
 	return __config_cache
 
 
+# clem 18/10/2026
+# accessor
+def get_checker_registry(conf=None):
+	""" :return: the CheckerRegistry of this process : the built-in checkers (Checkers, with their BatchCheckers and
+	TargetNormalizers), then the ones of the infra_monitor.checkers entry points, then the ones of the
+	conf.checker_modules (conf being get_config() if not given when first called)
+	:rtype: CheckerRegistry
+	"""
+	global __checker_registry
+	if not __checker_registry:
+		with __registry_lock:
+			if not __checker_registry:
+				registry = CheckerRegistry()
+				batch_functions, normalizers = BatchCheckers.enum_functions(), TargetNormalizers.enum_functions()
+				for check_type, function in Checkers.enum_functions().iteritems():
+					registry.register(check_type, FunctionChecker(function, batch_functions.get(check_type),
+						normalizers.get(check_type)))
+				registry.load_entry_points()
+				for module_name in (conf or get_config()).checker_modules:
+					registry.load_module(module_name)
+				__checker_registry = registry
+	return __checker_registry
+
+
 # clem 11/11/2016
 class HTTPSenderAbstract(object):
 	""" A basic HTTP sender meta Class that uses a MyConfig object """
@@ -259,6 +930,8 @@ class HTTPSenderAbstract(object):
 	_conf = None
 	_check_cache = None
 	_use_https = True
+	_http_pool = None
+	_rate_limiter = None
 	
 	def __init__(self, inst_conf, https=None):
 		"""
@@ -273,17 +946,36 @@ class HTTPSenderAbstract(object):
 			https = self._conf.use_ssl
 		self._use_https = https
 	
+	# clem 18/10/2026
+	@property
+	def http_pool(self):
+		""" the HTTPConnectionPool of keep-alive connections used by _sender, see its hits and misses counters """
+		if not self._http_pool:
+			from networking import HTTPConnectionPool
+			self._http_pool = HTTPConnectionPool(self._conf.http_pool_size)
+		return self._http_pool
+	
+	# clem 18/10/2026
+	@property
+	def rate_limiter(self):
+		""" the TokenBucket that every call of _sender goes through, paused on HTTP 429 """
+		if not self._rate_limiter:
+			self._rate_limiter = TokenBucket(self._conf.api_rate, self._conf.api_burst)
+		return self._rate_limiter
+	
 	# clem 11/11/2016
 	def _sender(self, host, url, method=HTTPMethods.GET, data=None, use_auth=False):
-		""" send a HTTP query to remote url
+		""" send a HTTP query to remote url, over a pooled keep-alive connection
 
 		:type host: str
 		:type url: str
 		:type method: str
 		:type data: dict
 		:type use_auth: bool
+		:return: the fully read response
+		:rtype: networking.PooledResponse
+		:raises: RateLimited on HTTP 429
 		"""
-		import httplib
 		import urllib
 		
 		assert method in HTTPMethods()
@@ -296,14 +988,16 @@ class HTTPSenderAbstract(object):
 		if use_auth:
 			headers.update({"Authorization": "OAuth " + self._conf.api_key})
 		
-		connector = httplib.HTTPSConnection if self._use_https else httplib.HTTPConnection
-		conn = connector(host)
-		conn.request(method, url, params, headers)
-		response = conn.getresponse()
+		self.rate_limiter.acquire()
+		response = self.http_pool.request(host, method, url, params, headers, self._use_https)
 		
 		proto, method = TermColoring.bold("HTTPS" if self._use_https else 'HTTP'), TermColoring.bold(method)
 		status = TermColoring.bold(response.status)
 		print "%s %s %s %s HTTP %s %s" % (proto, '%s%s' % (host, url), method, data, status, response.length)
+		if response.status == 429:
+			error = RateLimited(response.getheader('Retry-After'))
+			self.rate_limiter.pause(error.retry_after)
+			raise error
 		return response
 	
 	@abc.abstractmethod
@@ -331,9 +1025,39 @@ class ServiceInterfaceAbstract(HTTPSenderAbstract):
 	""" Interface between configured checks and a generic status reporting service """
 	__metaclass__ = abc.ABCMeta
 	__check_title_max_len = 0
+	_engine = None
+	_scheduler = None
+	_update_queue = None
+	_state = None
+	_status_table = None
+	_board = None
+	_dependency_cache = None
+	_released_rows = tuple()
 	
 	def __init__(self, inst_conf, https=None):
 		super(ServiceInterfaceAbstract, self).__init__(inst_conf, https)
+		if inst_conf.dns_servers:
+			from resolver import get_resolver
+			get_resolver().set_servers(inst_conf.dns_servers)
+	
+	# clem 18/10/2026
+	@property
+	def engine(self):
+		""" the CheckEngine running threaded rounds, bounded to conf.max_concurrency concurrent checks """
+		if not self._engine:
+			self._engine = CheckEngine(self._conf.max_concurrency)
+		return self._engine
+	
+	# clem 18/10/2026
+	@property
+	def scheduler(self):
+		""" the CheckScheduler of all enabled checks, each at its own interval or at conf.refresh_interval """
+		if self._scheduler is None:
+			self._scheduler = CheckScheduler()
+			for key, check_instance in self.checks_dict.iteritems():
+				if check_instance.enabled:
+					self._scheduler.add(key, check_instance.interval or self._conf.refresh_interval)
+		return self._scheduler
 		
 	@abc.abstractmethod
 	def update_check(self, *args, **kwargs):
@@ -348,6 +1072,17 @@ class ServiceInterfaceAbstract(HTTPSenderAbstract):
 		:type value: bool
 		"""
 	
+	# clem 18/10/2026
+	def set_checks(self, updates):
+		""" Override if your service can update several checks with a single call, defaults to calling set_check for
+		each of them
+
+		:param updates: list of (check_instance, value)
+		:type updates: list[(CheckObject, bool)]
+		"""
+		for check_instance, value in updates:
+			self.set_check(check_instance, value)
+	
 	@abc.abstractmethod
 	def no_status_change(self, check_instance, old_status, new_status):
 		""" If you need to trigger some action if the status doesn't change at regular interval (i.e. heart-beat)
@@ -357,30 +1092,269 @@ class ServiceInterfaceAbstract(HTTPSenderAbstract):
 		:type new_status: bool
 		"""
 	
+	# clem 18/10/2026
+	@property
+	def update_queue(self):
+		""" the StatusUpdateQueue through which check_all sends set_checks and no_status_change calls, backed by an
+		Outbox unless conf.outbox_file is empty """
+		if self._update_queue is None:
+			outbox = Outbox(self._conf.outbox_file) if self._conf.outbox_file else None
+			self._update_queue = StatusUpdateQueue(self.set_checks, self.no_status_change,
+				self._conf.update_batch_size, outbox=outbox, resolve=lambda check_id: self.checks_dict.get(check_id))
+		return self._update_queue
+	
 	@property
 	def check_def(self):
 		""" a shortcut to the configuration AutoOrderedDict of default items values for checks """
 		return self._conf.check_items_default_values_dict
 	
+	# clem 18/10/2026
+	@property
+	def state(self):
+		""" the StateFile of the checks last statuses, None if conf.state_file is empty """
+		if self._state is None and self._conf.state_file:
+			self._state = StateFile(self._conf.state_file)
+		return self._state
+	
+	# clem 18/10/2026
+	@property
+	def status_table(self):
+		""" the StatusTable of the statuses of all the checks """
+		if self._status_table is None:
+			self._status_table = StatusTable()
+			self._status_table.board = self.board
+		return self._status_table
+	
+	# clem 18/10/2026
+	@property
+	def board(self):
+		""" the StatusBoard publishing the statuses of the checks, None if conf.status_board_file is empty """
+		if self._board is None and self._conf.status_board_file:
+			from board import StatusBoard
+			self._board = StatusBoard(self._conf.status_board_file)
+		return self._board
+	
 	@property
 	def checks_dict(self):
-		""" :return: a dictionary of all the available checks as found in the config file """
+		""" :return: a dictionary of all the available checks as found in the config file, the ones of the template
+		sections included """
 		if not self._check_cache:
-			res = dict()
-			for each in self._conf.sections.filter(self._conf.section_items_prefix):
-				check_id = SupStr(each) - self._conf.section_items_prefix
-				res.update({check_id: CheckObject(self._conf.section(each), check_id)})
+			res, prefix, state = dict(), self._conf.section_items_prefix, self.state
+			for each in self._conf.sections.filter(prefix):
+				check_id = SupStr(each) - prefix
+				res.update({check_id: self._new_check(check_id, state)})
+			for template in self._templates(self._template_sections()):
+				for check_id, items in template.expand(): # one check at a time, the template is never materialized
+					if check_id in res:
+						getLogger().warning('template %s : check %s already exists' % (template.template_id, check_id))
+						continue
+					res[check_id] = self._new_check(check_id, state, items)
 			self._check_cache = res
 		return self._check_cache
 	
+	# clem 18/10/2026
+	def _new_check(self, check_id, state, items=None, number=None):
+		""" :return: the CheckObject of check_id, from items, or from its CHECK_ section if not given
+		:type state: StateFile | None
+		:type items: list | None
+		:param number: its row in the status table, a new one by default
+		:type number: int | None
+		:rtype: CheckObject
+		"""
+		if items is None:
+			items = self._conf.section(self._conf.section_items_prefix + check_id)
+		return CheckObject(items, check_id, self._conf, state, self.status_table, number)
+	
+	# clem 18/10/2026
+	def _check_sections(self):
+		""" :return: check id : sorted items of its CHECK_ section (DEFAULT ones included)
+		:rtype: dict
+		"""
+		prefix = self._conf.section_items_prefix
+		return dict((SupStr(each) - prefix, sorted(self._conf.section(each))) for each in self._conf.sections.filter(prefix))
+	
+	# clem 18/10/2026
+	def _template_sections(self):
+		""" :return: template id : sorted items of its TEMPLATE_ section (DEFAULT ones included)
+		:rtype: dict
+		"""
+		prefix = self._conf.section_templates_prefix
+		return dict((SupStr(each) - prefix, sorted(self._conf.section(each))) for each in self._conf.sections.filter(prefix))
+	
+	# clem 18/10/2026
+	@staticmethod
+	def _templates(template_sections):
+		""" :param template_sections: template id : items
+		:type template_sections: dict
+		:return: the CheckTemplate of each template section, the invalid ones being logged and skipped
+		:rtype: list[templates.CheckTemplate]
+		"""
+		from templates import CheckTemplate, TemplateError
+		res = list()
+		for template_id, items in sorted(template_sections.iteritems()):
+			try:
+				res.append(CheckTemplate(template_id, items))
+			except TemplateError as e:
+				getLogger().error('template %s : %s' % (template_id, e))
+		return res
+	
+	# clem 18/10/2026
+	def reload_config(self):
+		""" re-reads the config file, and only rebuilds the checks whose CHECK_ section was added, removed or changed :
+		the others keep their status, latency history, circuit breaker and schedule, and changed ones their status
+
+		:return: the ids of the added, removed and changed checks, None if the file could not be read (the current
+			configuration being kept)
+		:rtype: (list, list, list) | None
+		"""
+		old_sections, old_templates = self._check_sections(), self._template_sections()
+		old_system = sorted(self._conf.section(self._conf.CONFIG_GENERAL_SECTION))
+		try:
+			self._conf.reload()
+		except (IOError, ConfigError) as e:
+			getLogger().error('config reload failed, keeping the current one : %s' % e)
+			return None
+		new_sections, new_templates = self._check_sections(), self._template_sections()
+		# only the templates that changed are expanded, to diff their checks one by one
+		changed_templates = [key for key in set(old_templates) | set(new_templates)
+			if old_templates.get(key) != new_templates.get(key)]
+		for sections, templates in ((old_sections, old_templates), (new_sections, new_templates)):
+			for template in self._templates(dict((key, templates[key]) for key in changed_templates if key in templates)):
+				for check_id, items in template.expand():
+					sections.setdefault(check_id, sorted(items))
+		added = sorted(set(new_sections) - set(old_sections))
+		removed = sorted(set(old_sections) - set(new_sections))
+		changed = sorted(key for key in set(new_sections) & set(old_sections) if new_sections[key] != old_sections[key])
+		if sorted(self._conf.section(self._conf.CONFIG_GENERAL_SECTION)) != old_system:
+			getLogger().warning('[%s] changed : settings read at startup (concurrency, pools, files, ...) only apply '
+				'after a restart' % self._conf.CONFIG_GENERAL_SECTION)
+		if self._check_cache and (added or removed or changed):
+			checks = dict(self._check_cache) # swapped at once, rounds in progress keep the former one
+			# the rows of the checks removed by the previous reload are only reused now, once no round writes to them
+			self.status_table.free(self._released_rows)
+			self._released_rows = [checks.pop(key)._number for key in removed]
+			for key in added + changed:
+				previous = checks.get(key)
+				check_instance = self._new_check(key, self.state, new_sections[key],
+					previous._number if previous else None) # a changed check keeps its row
+				if previous:
+					check_instance._take_over(previous)
+				checks[key] = check_instance
+			if self._scheduler is not None:
+				for key in removed:
+					self._scheduler.remove(key)
+				for key in added + changed:
+					previous = self._check_cache.get(key)
+					if previous and (previous.enabled, previous.interval) == (checks[key].enabled, checks[key].interval):
+						continue # keeps its place in the schedule
+					self._scheduler.remove(key)
+					if checks[key].enabled:
+						self._scheduler.add(key, checks[key].interval or self._conf.refresh_interval)
+			self._check_cache = checks
+			self._dependency_cache = None
+			self.__check_title_max_len = 0
+		return added, removed, changed
+	
+	# clem 18/10/2026
+	@property
+	def dependencies(self):
+		""" :return: the ids of the checks each check depends on, without the unknown ones nor the ones closing a cycle
+		(both being logged)
+		:rtype: dict
+		"""
+		if self._dependency_cache is None:
+			res, visiting = dict(), set()
+			
+			def visit(key):
+				visiting.add(key)
+				parents = list()
+				for parent in self.checks_dict[key].depends_on:
+					if parent not in self.checks_dict:
+						getLogger().warning('check %s depends on unknown check %s, ignoring it' % (key, parent))
+					elif parent in visiting:
+						getLogger().warning('check %s depending on %s is a cycle, ignoring it' % (key, parent))
+					else:
+						if parent not in res:
+							visit(parent)
+						parents.append(parent)
+				visiting.discard(key)
+				res[key] = parents
+			
+			for each in sorted(self.checks_dict):
+				if each not in res:
+					visit(each)
+			self._dependency_cache = res
+		return self._dependency_cache
+	
+	# clem 18/10/2026
+	def dependency_depth(self, key, _depths=None):
+		""" :return: the length of the longest chain of checks key depends on (0 if it depends on none)
+		:rtype: int
+		"""
+		_depths = _depths if _depths is not None else dict()
+		if key not in _depths:
+			_depths[key] = 1 + max([self.dependency_depth(parent, _depths) for parent in self.dependencies[key]] or [-1])
+		return _depths[key]
+	
+	# clem 18/10/2026
+	def down_dependency(self, key):
+		""" :return: the first enabled check key depends on whose last status is down, None if there is none
+		:rtype: CheckObject | None
+		"""
+		for parent in self.dependencies.get(key, list()):
+			parent_instance = self.checks_dict[parent]
+			if parent_instance.enabled and parent_instance.last_status is False:
+				return parent_instance
+		return None
+	
 	# TODO : make it a decorator
-	def __check_apply(self, callback, threading=False):
+	def __check_apply(self, callback, threading=False, deadline=None, keys=None, batch_callback=None):
+		""" apply callback(key, check_instance) to every check, in sequence or on the bounded check engine
+
+		:param deadline: maximum duration of a threaded round in seconds, None for no limit
+		:type deadline: float | None
+		:param keys: restrict to those checks, defaults to all
+		:type keys: list | None
+		:param batch_callback: if threading, called instead of callback with the list of (key, check_instance) of all
+			the enabled checks of each type having a batch checker (and of the same dependency depth)
+		:type batch_callback: callable | None
+		:return: the RoundStats of the round if threading, None otherwise
+		:rtype: RoundStats | None
+		
+		Checks run after the checks they depend on (see depends_on), the independent ones in parallel if threading.
+		"""
 		assert callable(callback)
-		for key, check_instance in self.checks_dict.iteritems():
-			if not threading:
-				callback(key, check_instance)
-			else:
-				Thread(target=callback, args=(key, check_instance)).start()
+		if keys is None:
+			items = self.checks_dict.items()
+		else:
+			items = [(key, self.checks_dict[key]) for key in keys if key in self.checks_dict]
+		depths = dict()
+		items.sort(key=lambda item: self.dependency_depth(item[0], depths))
+		if threading:
+			jobs, groups, job_of = list(), dict(), dict()
+			for key, check_instance in items:
+				if batch_callback and check_instance.enabled and \
+					CheckObject.has_batch_checker(check_instance.check_type, self._conf):
+					group_key = (check_instance.check_type, depths[key])
+					groups.setdefault(group_key, list()).append((key, check_instance))
+				else:
+					job_of[key] = (callback, (key, check_instance))
+					jobs.append(job_of[key])
+			for group in groups.itervalues():
+				group = tuple(group)
+				job_of.update((key, (batch_callback, (group, ))) for key, _ in group)
+				jobs.append((batch_callback, (group, )))
+			
+			def depends(job):
+				""" the jobs holding the checks of job depend on """
+				check_keys = [key for key, _ in job[1][0]] if job[0] == batch_callback else [job[1][0]]
+				return set(job_of[parent] for key in check_keys for parent in self.dependencies[key] if parent in job_of)
+			
+			has_dependencies = any(self.dependencies[key] for key, _ in items)
+			return self.engine.run(jobs, lambda job: job[0](*job[1]), deadline,
+				lambda job: len(job[1][0]) if job[0] == batch_callback else 1, depends if has_dependencies else None)
+		for key, check_instance in items:
+			callback(key, check_instance)
 	
 	# clem 10/11/2016
 	@property
@@ -414,31 +1388,89 @@ class ServiceInterfaceAbstract(HTTPSenderAbstract):
 		
 		new_stat_text = check_instance.textual_status
 		new_stat_text = TermColoring.fail(new_stat_text) if not new_status else TermColoring.ok_green(new_stat_text)
-		print '%s : %s => %s' % (_rightly_padded_instance_name(), old_stat_text, new_stat_text)
+		details = ' (%s)' % check_instance.last_probe if check_instance.last_probe is not None else ''
+		print '%s : %s => %s%s' % (_rightly_padded_instance_name(), old_stat_text, new_stat_text, details)
 	
-	def check_all(self, update=False, threading=False):
-		def _nop(*_):
-			pass
-		
-		def _update_check(check_instance, old_status, new_status):
+	# clem 18/10/2026
+	def report_check(self, check_instance, old_status, new_status, update=False):
+		""" prints the new status of a check, and if update queues it for the status page service (no_status_change
+		being called instead of set_check if it did not change)
+
+		:type check_instance: CheckObject
+		:type old_status: bool | None
+		:type new_status: bool
+		:type update: bool
+		"""
+		if not update:
+			self._print_check_stat(check_instance, old_status, new_status)
+			return
+		if new_status != old_status:
 			self._print_check_stat(check_instance, old_status, new_status)
-			self.set_check(check_instance, new_status)
+		self.update_queue.put(check_instance, old_status, new_status)
+	
+	def check_all(self, update=False, threading=False, deadline=None, keys=None, report=None):
+		"""
+
+		:param report: called with (check_instance, old_status, new_status) of each check instead of report_check, the
+			round statistics not being printed either (i.e. in a worker process)
+		:type report: callable | None
+		"""
+		flight = SingleFlight() # identical probes run once per round
+		
+		def _report(check_instance, old_status, new_status):
+			if report:
+				report(check_instance, old_status, new_status)
+			else:
+				self.report_check(check_instance, old_status, new_status, update)
 		
-		def sub(_, check_instance):
+		def _skip(key, check_instance):
+			""" marks check_instance down without probing it, if a check it depends on is down """
+			parent = self.down_dependency(key)
+			if parent is None:
+				return False
+			skipped.append(key)
+			old_status = check_instance.last_status
+			_report(check_instance, old_status, check_instance.skip())
+			if old_status is not False:
+				print '%s : skipped as %s is down' % (check_instance.name, parent.name)
+			return True
+		
+		def _tripped(key, check_instance):
+			""" marks check_instance down without probing it, if its circuit is open and not due for a retry """
+			if check_instance.breaker.allow():
+				return False
+			tripped.append(key)
+			_report(check_instance, check_instance.last_status, check_instance.skip())
+			return True
+		
+		def sub(key, check_instance):
 			assert isinstance(check_instance, CheckObject)
-			if check_instance.enabled:
-				old_status, new_status = check_instance.last_status, check_instance.check()
-				
-				if update:
-					calling = _update_check if new_status != old_status else self.no_status_change
-				else:
-					calling = self._print_check_stat
-				calling(check_instance, old_status, new_status)
+			if check_instance.enabled and not _skip(key, check_instance) and not _tripped(key, check_instance):
+				old_status, new_status = check_instance.last_status, check_instance.check(flight)
+				_report(check_instance, old_status, new_status)
+		
+		def batch_sub(group):
+			check_list = [check_instance for key, check_instance in group
+				if not _skip(key, check_instance) and not _tripped(key, check_instance)]
+			old_statuses = [check_instance.last_status for check_instance in check_list]
+			for check_instance, old_status, new_status in \
+				zip(check_list, old_statuses, CheckObject.check_many(check_list, flight)):
+				_report(check_instance, old_status, new_status)
 		
-		self.__check_apply(sub, threading)
+		skipped = list() # keys of the checks not probed, list.append being thread safe
+		tripped = list()
+		
+		stats = self.__check_apply(sub, threading, deadline, keys, batch_sub)
+		if stats:
+			stats.flight = flight
+			stats.skipped = len(skipped)
+			stats.tripped = len(tripped)
+			if not report:
+				print TermColoring.bold(stats)
+		return stats
 	
-	def update_all(self):
-		return self.check_all(True)
+	def update_all(self, deadline=None, keys=None):
+		return self.check_all(True, True, deadline, keys)
 	
 
 # clem 10/11/2016
@@ -446,40 +1478,139 @@ class Watcher(object):
 	""" a static class that monitors indefinitely all enabled checks and update them at a specific interval """
 	_interface = None # StatusPageIoInterface(get_config())
 	_counter = 0
-	_wait_interval = get_config().refresh_interval # in seconds
-	_wait_resolution = .5 # in seconds
-	_timer = _wait_interval
+	_runner = None
+	_shards = None
+	_cluster = None
+	_config_watcher = None
+	
+	# clem 18/10/2026
+	@classmethod
+	def _wait(cls):
+		""" sleeps until the next scheduled check is due, displaying the remaining time, or until the config file changes
+
+		:return: whether the config file changed
+		:rtype: bool
+		"""
+		next_due = cls._interface.scheduler.next_due()
+		total_wait = max(0., next_due - time()) if next_due is not None else cls._interface._conf.refresh_interval
+		if total_wait:
+			with IncPrint() as term:
+				term.put('next update in %.1f sec ...' % total_wait)
+				return cls._config_watcher.wait(total_wait)
+		return cls._config_watcher.changed()
 	
+	# clem 18/10/2026
 	@classmethod
-	def _reset_timer(cls):
-		cls._timer = cls._wait_interval
+	def _reload(cls):
+		""" applies the changes of the config file to the checks """
+		result = cls._interface.reload_config()
+		if result is not None and cls._shards:
+			cls._shards.reload()
+		if result is not None and cls._cluster:
+			cls._cluster.reload()
+		if result and any(result):
+			print TermColoring.bold('Config reloaded : %s checks added, %s removed, %s changed' % tuple(map(len, result)))
 	
+	# clem 18/10/2026
 	@classmethod
-	def _wait(cls):
-		""" waiting function with incremental sleep duration of _wait_resolution and display of remaining time """
-		cls._reset_timer()
-		total_wait = cls._timer
-		base_text = 'next update in %s sec ...' # % total_wait
-		with IncPrint() as term:
-			term.put(base_text % total_wait)
-			while cls._timer > 0:
-				term.put(base_text % cls._timer)
-				sleep(cls._wait_resolution)
-				cls._timer -= cls._wait_resolution
+	def _pool_round(cls, keys):
+		return cls._round(keys, cls._interface._conf.round_deadline)
+	
+	# clem 18/10/2026
+	@classmethod
+	def _round(cls, keys, deadline=None):
+		""" runs a round of keys, through the ClusterNode if in a cluster """
+		if cls._cluster:
+			return cls._cluster.run_round(keys, deadline)
+		return cls._interface.update_all(deadline, keys)
+	
+	# clem 18/10/2026
+	@staticmethod
+	def _merge_keys(pending_args, new_args):
+		""" merges the due keys of two coalesced rounds """
+		keys = list(pending_args[0])
+		keys.extend(key for key in new_args[0] if key not in keys)
+		return keys,
+	
+	# clem 18/10/2026
+	@staticmethod
+	def _remaining_keys(new_args, busy_args):
+		""" the due keys of a new round that are not in the running or pending rounds already """
+		busy = set(key for args in busy_args for key in args[0])
+		keys = [key for key in new_args[0] if key not in busy]
+		return (keys, ) if keys else None
+	
+	# clem 18/10/2026
+	@classmethod
+	def _start_round(cls, keys):
+		""" starts the round of keys in the background, through the RoundRunner, or on the worker processes in process
+		mode """
+		if cls._shards:
+			skipped, coalesced = cls._shards.skipped_rounds, cls._shards.coalesced_rounds
+			keys = cls._shards.submit(keys) # the ones of the workers that are gone, if any
+			if keys:
+				Thread(target=cls._interface.update_all, args=(None, keys)).start()
+			if (cls._shards.skipped_rounds, cls._shards.coalesced_rounds) != (skipped, coalesced):
+				print TermColoring.warning('Workers still running, round %s partly %s (%s)' % (cls._counter,
+					'skipped' if cls._shards.skipped_rounds > skipped else 'merged', cls._shards.policy))
+		else:
+			skipped = cls._runner.skipped_rounds
+			if not cls._runner.submit(keys):
+				print TermColoring.warning('Previous round still running, round %s %s (%s)' % (cls._counter,
+					'skipped' if cls._runner.skipped_rounds > skipped else 'merged', cls._runner.policy))
 	
 	@classmethod # TODO make a loop decorator
 	def loop(cls, interface):
 		assert isinstance(interface, ServiceInterfaceAbstract)
 		try:
 			cls._interface = interface
+			conf = interface._conf
+			if conf.cluster_node:
+				from cluster import ClusterNode
+				cls._cluster = ClusterNode(interface, conf.cluster_node, conf.cluster_peers, conf.cluster_heartbeat,
+					conf.cluster_timeout, conf.cluster_secret)
+			if conf.execution_mode == ExecutionModes.PROCESS and cls._cluster:
+				print TermColoring.warning('%s mode is not available in a cluster, using %s mode' %
+					(ExecutionModes.PROCESS, ExecutionModes.THREAD))
+			elif conf.execution_mode == ExecutionModes.PROCESS:
+				from shards import ShardPool
+				cls._shards = ShardPool(interface, conf.worker_processes, conf.overlap_policy, cls._merge_keys,
+					cls._remaining_keys)
+				cls._shards.start() # before any other thread
+			if not cls._shards:
+				cls._runner = RoundRunner(cls._pool_round if conf.execution_mode == ExecutionModes.POOL else cls._round,
+					conf.overlap_policy, cls._merge_keys, cls._remaining_keys)
+			if cls._cluster:
+				cls._cluster.start()
+			cls._config_watcher = ConfigWatcher(interface._conf.config_file_path)
 			while True:
-				cls._counter += 1
-				print 'Checking round %s ...' % cls._counter
-				Thread(target=cls._interface.update_all).start() # Thread maybe not so useful
-				# cls._interface.update_all()
-				cls._wait()
+				due = interface.scheduler.pop_due()
+				if due and cls._cluster: # the other checks are run by the other nodes
+					due = cls._cluster.owned(due)
+				if due:
+					cls._counter += 1
+					print 'Checking round %s (%s checks) ...' % (cls._counter, len(due))
+					cls._start_round(due)
+				if cls._wait():
+					cls._reload()
 		except KeyboardInterrupt:
 			print 'Exiting'
+			if cls._shards:
+				cls._shards.close(interface._conf.refresh_interval)
+			if cls._cluster:
+				cls._cluster.close()
+			update_queue = interface._update_queue # not the property, that would start a queue just to close it
+			if update_queue is not None:
+				if update_queue.pending_count:
+					print 'Sending %s pending status updates ...' % update_queue.pending_count
+					update_queue.join(interface._conf.refresh_interval)
+				update_queue.close()
+			if interface._state is not None:
+				interface._state.close()
+			if interface._board is not None:
+				interface._board.close()
+			if cls._config_watcher:
+				cls._config_watcher.close()
 			return True
 		# implicitly returns False on any other Exception as it will raise
 
@@ -491,5 +1622,3 @@ def main():
 
 if __name__ == '__main__':
 	exit(0 if main() else 1)
-else:
-	conf = get_config()
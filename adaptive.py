@@ -0,0 +1,152 @@
+from threading import Lock
+from collections import deque
+from logging import getLogger
+from time import time
+from math import ceil
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+# clem 18/10/2026
+class LatencyTracker(object):
+	""" Sliding window of the latencies of the successful probes of a check, deriving the check timeout from them
+
+	The timeout is a high percentile of the recent latencies, times a factor, plus a margin, and never more than the
+	configured cap. Until enough probes succeeded, and right after a failure (so that a slow answer is not mistaken for
+	a dead target), the full cap is used.
+	"""
+	DEFAULT_WINDOW = 100
+	MIN_SAMPLES = 10
+	FACTOR = 2.
+
+	_failed = False
+
+	def __init__(self, window=DEFAULT_WINDOW):
+		"""
+
+		:param window: number of latencies kept
+		:type window: int
+		"""
+		self._samples = deque(maxlen=max(1, int(window)))
+		self._lock = Lock()
+
+	def record(self, success, latency=None):
+		""" records the outcome of a probe
+
+		:type success: bool
+		:param latency: duration of the probe in seconds, only kept if successful
+		:type latency: float | None
+		"""
+		with self._lock:
+			self._failed = not success
+			if success and latency is not None:
+				self._samples.append(latency)
+
+	def __len__(self):
+		return len(self._samples)
+
+	def percentile(self, percent):
+		""" :param percent: in [0, 100]
+		:type percent: float
+		:return: the latency under which percent of the recorded ones are (nearest rank), None if none recorded
+		:rtype: float | None
+		"""
+		with self._lock:
+			samples = sorted(self._samples)
+		if not samples:
+			return None
+		rank = int(ceil(percent / 100. * len(samples))) - 1
+		return samples[min(len(samples) - 1, max(0, rank))]
+
+	def timeout(self, cap, percent=99., margin=.25):
+		""" :param cap: maximum timeout in seconds
+		:type cap: float
+		:param percent: the percentile of the latencies the timeout is derived from
+		:type percent: float
+		:param margin: added to the timeout, in seconds
+		:type margin: float
+		:return: the timeout for the next probe, in seconds
+		:rtype: float
+		"""
+		if self._failed or len(self) < self.MIN_SAMPLES:
+			return cap
+		return min(cap, self.percentile(percent) * self.FACTOR + margin)
+
+
+# clem 18/10/2026
+class CircuitBreaker(object):
+	""" Stops probing a persistently failing target : after threshold consecutive failures the circuit opens, and the
+	target is only probed again after base_spacing seconds, then twice that after each new failure, up to max_spacing.
+	The first success closes the circuit.
+
+	Spacings are counted from the start of the failed probe, and a retry is allowed up to TOLERANCE seconds early (or
+	half the base spacing if shorter), as the rounds due at the retry time may start slightly before it.
+	"""
+	DEFAULT_THRESHOLD = 3
+	DEFAULT_MAX_SPACING = 600.
+	TOLERANCE = 1. # seconds, a tick of the scheduler
+
+	name = ''
+	base_spacing = 0.
+	threshold = DEFAULT_THRESHOLD
+	max_spacing = DEFAULT_MAX_SPACING
+	failures = 0 # consecutive
+	opened = 0 # consecutive times the circuit opened
+	retry_at = 0.
+
+	def __init__(self, name, base_spacing, threshold=DEFAULT_THRESHOLD, max_spacing=DEFAULT_MAX_SPACING):
+		"""
+
+		:param name: of the target, for the logs
+		:type name: str
+		:param base_spacing: delay before the first probe once the circuit opened, in seconds
+		:type base_spacing: float
+		:param threshold: consecutive failures opening the circuit, 0 to never open it
+		:type threshold: int
+		:param max_spacing: maximum delay between two probes, in seconds
+		:type max_spacing: float
+		"""
+		self.name = name
+		self.base_spacing = float(base_spacing)
+		self.threshold = int(threshold)
+		self.max_spacing = float(max_spacing)
+		self._lock = Lock()
+
+	@property
+	def is_open(self):
+		return bool(self.threshold) and self.failures >= self.threshold
+
+	def allow(self, now=None):
+		""" :return: whether the target should be probed now
+		:rtype: bool
+		"""
+		return not self.is_open or (now or time()) >= self.retry_at - min(self.TOLERANCE, self.base_spacing / 2)
+
+	def record(self, success, now=None):
+		""" records the outcome of a probe, opening or closing the circuit
+
+		:type success: bool
+		:param now: start time of the probe, defaults to now
+		:type now: float | None
+		"""
+		with self._lock:
+			if success:
+				if self.is_open:
+					logger.info('%s : recovered, circuit closed' % self.name)
+				self.failures, self.opened, self.retry_at = 0, 0, 0.
+				return
+			self.failures += 1
+			if self.is_open:
+				spacing = min(self.max_spacing, self.base_spacing * 2 ** self.opened)
+				self.opened += 1
+				self.retry_at = (now or time()) + spacing
+				logger.warning('%s : %s consecutive failures, circuit open, next probe in %.0f sec' %
+					(self.name, self.failures, spacing))
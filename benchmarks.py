@@ -0,0 +1,287 @@
+from utilz import AutoOrderedDict
+from state import StatusTable
+from time import time
+import gc
+import os
+import sys
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+# run with python -m infra_monitor.benchmarks [count]
+
+
+# clem 18/10/2026
+class _BenchConfig(object):
+	""" the part of MyConfig checks need to be built, without a config file """
+	check_items_default_values_dict = AutoOrderedDict({'enabled': '0', 'name': '', 'type': '', 'data': ''},
+		['enabled', 'name', 'type', 'data'])
+
+
+def _rss():
+	""" :return: the resident memory of this process in bytes, None where /proc is not available
+	:rtype: int | None
+	"""
+	try:
+		with open('/proc/self/statm') as statm:
+			return int(statm.read().split()[1]) * 4096
+	except (IOError, IndexError, ValueError):
+		return None
+
+
+# clem 18/10/2026
+def memory_benchmark(count=100000):
+	""" builds count tcp checks sharing one StatusTable, sets their status, and prints the memory they use
+
+	:type count: int
+	:return: bytes per check (resident memory)
+	:rtype: float | None
+	"""
+	from . import CheckObject
+	gc.collect()
+	before, started = _rss(), time()
+	config, table = _BenchConfig(), StatusTable()
+	checks = list()
+	for number in xrange(count):
+		checks.append(CheckObject([('enabled', '1'), ('name', 'check%s' % number), ('type', 'tcp'),
+			('data', '10.%s.%s.%s 80' % (number >> 16, (number >> 8) & 0xff, number & 0xff))], 'c%s' % number, config,
+			None, table))
+	for number, each in enumerate(checks):
+		each._set_status(number % 2 == 0, .001)
+	gc.collect()
+	after, elapsed = _rss(), time() - started
+	print '%s checks built and set in %.2f sec' % (count, elapsed)
+	print 'CheckObject : %s bytes, status table : %s bytes (%.0f per check)' % \
+		(sys.getsizeof(checks[0]), table.nbytes, float(table.nbytes) / count)
+	if before is None or after is None:
+		return None
+	per_check = float(after - before) / count
+	print 'resident memory : %.1f MB (%.0f bytes per check, with its name and data strings)' % \
+		((after - before) / 1048576., per_check)
+	return per_check
+
+
+_STARTUP_SCRIPT = """
+import sys, os, json, time
+started = time.time()
+import %(package)s as im
+imported = time.time()
+
+class Interface(im.ServiceInterfaceAbstract):
+	def _send(self, *args, **kwargs): pass
+	def _gen_url(self, *args, **kwargs): pass
+	def update_check(self, *args, **kwargs): pass
+	def set_check(self, check_instance, value=False): pass
+	def no_status_change(self, check_instance, old_status, new_status): pass
+
+sys.stdout = open(os.devnull, 'w')
+interface = Interface(im.MyConfig(%(config)r))
+checks = len(interface.checks_dict)
+loaded = time.time()
+interface.check_all(threading=True)
+done = time.time()
+sys.__stdout__.write(json.dumps({'import': imported - started, 'load': loaded - imported, 'round': done - loaded,
+	'total': done - started, 'checks': checks}))
+"""
+
+_STARTUP_CONFIG = """[DEFAULT]
+enabled = 1
+name =
+type = tcp
+data =
+
+[SYSTEM]
+api_key = KEY
+page_id = PAGE
+api_base = localhost
+api_url = /
+api_data =
+http_mode = http
+conf_items = enabled name type data
+items_prefix = CHECK_
+refresh_interval = 60
+outbox_file =
+state_file =
+"""
+
+
+# clem 18/10/2026
+def startup_benchmark(count=10000):
+	""" measures, in a new process, the time to import the package (without any config file), to load a config of count
+	tcp checks (to closed ports of localhost), and to run the first round, and prints them. The second run loads the
+	compiled config saved by the first one.
+
+	:type count: int
+	:return: {'import', 'load', 'round', 'total': seconds, 'checks': count} of the first and the second run
+	:rtype: (dict, dict)
+	"""
+	import json
+	import shutil
+	import tempfile
+	import subprocess as sp
+	package_dir = os.path.dirname(os.path.abspath(__file__))
+	work_dir = tempfile.mkdtemp()
+	try:
+		config = os.path.join(work_dir, 'large.ini')
+		with open(config, 'w') as config_file:
+			config_file.write(_STARTUP_CONFIG)
+			for number in xrange(count):
+				config_file.write('\n[CHECK_c%s]\nname = check%s\ndata = 127.0.0.1 %s\n' %
+					(number, number, 1 + number % 1000))
+		env = dict(os.environ, PYTHONPATH=os.path.dirname(package_dir))
+		script = _STARTUP_SCRIPT % {'package': os.path.basename(package_dir), 'config': config}
+		runs = list()
+		with open(os.devnull, 'w') as devnull:
+			for label in ('parsed', 'compiled'):
+				timings = json.loads(sp.check_output([sys.executable, '-c', script], cwd=work_dir, env=env,
+					stderr=devnull))
+				print '%s config : import %.3f sec, loading %s checks %.3f sec, first round %.3f sec, total %.3f sec' % \
+					(label, timings['import'], timings['checks'], timings['load'], timings['round'], timings['total'])
+				runs.append(timings)
+	finally:
+		shutil.rmtree(work_dir, ignore_errors=True)
+	return tuple(runs)
+
+
+_SHARD_SCRIPT = """
+import sys, os, json, time
+import %(package)s as im
+from %(package)s.shards import ShardPool
+
+class Interface(im.ServiceInterfaceAbstract):
+	def _send(self, *args, **kwargs): pass
+	def _gen_url(self, *args, **kwargs): pass
+	def update_check(self, *args, **kwargs): pass
+	def set_check(self, check_instance, value=False): pass
+	def no_status_change(self, check_instance, old_status, new_status): pass
+
+sys.stdout = open(os.devnull, 'w')
+interface = Interface(im.MyConfig(%(config)r))
+keys = list(interface.checks_dict)
+workers = int(sys.argv[1])
+if workers:
+	pool = ShardPool(interface, workers)
+	pool.start()
+	run = lambda: pool.submit(keys) or pool.join()
+else: # threads of a single process
+	run = lambda: interface.check_all(True, True)
+run() # warm up
+started = time.time()
+for _ in range(%(rounds)s):
+	run()
+elapsed = time.time() - started
+interface.update_queue.join(60)
+sys.__stdout__.write(json.dumps({'rate': %(rounds)s * len(keys) / elapsed}))
+if workers:
+	pool.close()
+"""
+
+_SHARD_CHECKER = """
+from binascii import crc32
+from %(package)s.registry import BaseChecker
+
+
+class CPUChecker(BaseChecker):
+	\""" a check spending its time in the interpreter, like TLS handshakes and response parsing do \"""
+	def check(self, check):
+		value = 0
+		for each in xrange(int(check.check_data.split()[0])):
+			value = crc32(str(each), value)
+		return True
+
+CHECKERS = {'cpu': CPUChecker}
+"""
+
+
+# clem 18/10/2026
+def shard_benchmark(count=2000, workers=(1, 2, 4), rounds=3, work=2000):
+	""" measures, in new processes, the checks per second of a config of count checks spending their time in the
+	interpreter (work iterations each), run by the threads of one process, then by each number of worker processes
+
+	:type count: int
+	:param workers: the numbers of worker processes to measure
+	:type workers: tuple[int]
+	:type rounds: int
+	:type work: int
+	:return: {number of worker processes (0 for threads only) : checks per second}
+	:rtype: dict
+	"""
+	import json
+	import shutil
+	import tempfile
+	import multiprocessing
+	import subprocess as sp
+	package_dir = os.path.dirname(os.path.abspath(__file__))
+	package = os.path.basename(package_dir)
+	work_dir = tempfile.mkdtemp()
+	try:
+		config = os.path.join(work_dir, 'shards.ini')
+		with open(os.path.join(work_dir, 'cpu_checker.py'), 'w') as checker_file:
+			checker_file.write(_SHARD_CHECKER % {'package': package})
+		with open(config, 'w') as config_file:
+			config_file.write(_STARTUP_CONFIG.replace('type = tcp', 'type = cpu'))
+			config_file.write('checker_modules = cpu_checker\n')
+			for number in xrange(count):
+				config_file.write('\n[CHECK_c%s]\nname = check%s\ndata = %s %s\n' % (number, number, work, number))
+		env = dict(os.environ, PYTHONPATH=os.pathsep.join((os.path.dirname(package_dir), work_dir)))
+		script = _SHARD_SCRIPT % {'package': package, 'config': config, 'rounds': rounds}
+		rates = dict()
+		with open(os.devnull, 'w') as devnull:
+			for number in (0, ) + tuple(workers):
+				rates[number] = json.loads(sp.check_output([sys.executable, '-c', script, str(number)], cwd=work_dir,
+					env=env, stderr=devnull))['rate']
+				print '%s : %.0f checks per sec (x%.2f)' % ('%s worker processes' % number if number else 'threads only',
+					rates[number], rates[number] / rates[0])
+	finally:
+		shutil.rmtree(work_dir, ignore_errors=True)
+	print '(%s CPUs)' % multiprocessing.cpu_count()
+	return rates
+
+
+# clem 18/10/2026
+def board_benchmark(count=10000, reads=100):
+	""" publishes the status of count checks on a StatusBoard, and prints the time it takes per check, and the time a
+	BoardReader takes to read one of them and all of them
+
+	:type count: int
+	:param reads: number of snapshots of all the checks
+	:type reads: int
+	:return: seconds per publish, per get and per snapshot
+	:rtype: (float, float, float)
+	"""
+	import shutil
+	import tempfile
+	from board import StatusBoard, BoardReader
+	work_dir = tempfile.mkdtemp()
+	try:
+		path = os.path.join(work_dir, 'status.board')
+		board = StatusBoard(path)
+		started = time()
+		for number in xrange(count):
+			board.publish('c%s' % number, 'check%s' % number, number % 2 == 0, started, .001)
+		publish = (time() - started) / count
+		reader = BoardReader(path)
+		started = time()
+		for number in xrange(count):
+			reader.get('c%s' % number)
+		get = (time() - started) / count
+		started = time()
+		for _ in xrange(reads):
+			reader.snapshot()
+		snapshot = (time() - started) / reads
+		print 'status board : publish %.1f us, get %.1f us, snapshot of %s checks %.2f ms (%s bytes)' % \
+			(publish * 1e6, get * 1e6, count, snapshot * 1e3, os.path.getsize(path))
+		reader.close()
+		board.close()
+	finally:
+		shutil.rmtree(work_dir, ignore_errors=True)
+	return publish, get, snapshot
+
+
+if __name__ == '__main__':
+	count = int(sys.argv[1]) if len(sys.argv) > 1 else None
+	memory_benchmark(count or 100000)
+	startup_benchmark(count or 10000)
+	shard_benchmark(count or 2000)
+	board_benchmark(count or 10000)
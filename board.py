@@ -0,0 +1,272 @@
+from threading import Lock
+from logging import getLogger
+from collections import namedtuple
+from hashlib import sha1
+from time import time
+import struct
+import mmap
+import os
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+# only depends on the standard library, so that local tools can use BoardReader without the rest of the package
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+MAGIC = 'IMB1'
+KEY_SIZE = 64
+NAME_SIZE = 64
+# magic, record size, capacity, count, creation time, moved (1 once replaced by a larger file)
+_HEADER = struct.Struct('<4sIIIdB7x')
+# sequence (odd while being written), key, name, status (-1 unknown, 0 offline, 1 online), change time, latency,
+# update time (the times being seconds since the epoch, NaN if unknown)
+_RECORD = struct.Struct('<I%ss%ssb3xddd' % (KEY_SIZE, NAME_SIZE))
+_SEQUENCE = struct.Struct('<I')
+_VALUES = struct.Struct('<b3xddd')
+_VALUES_OFFSET = _SEQUENCE.size + KEY_SIZE + NAME_SIZE
+_COUNT = struct.Struct('<I')
+_COUNT_OFFSET = 12
+_MOVED_OFFSET = _HEADER.size - 8
+_NAN = float('nan')
+_STATUS = {None: -1, False: 0, True: 1}
+_STATUS_REVERSE = {-1: None, 0: False, 1: True}
+
+
+def board_key(check_id):
+	""" check ids that do not fit in a record are replaced by their hash """
+	key = str(check_id)
+	return key if len(key) <= KEY_SIZE else sha1(key).hexdigest()
+
+
+def _offset(number):
+	return _HEADER.size + number * _RECORD.size
+
+
+# clem 18/10/2026
+BoardEntry = namedtuple('BoardEntry', ['id', 'name', 'status', 'change', 'latency', 'updated'])
+
+
+# clem 18/10/2026
+class StatusBoard(object):
+	""" Memory-mapped file publishing the current status, status change time and latency of each check, for local
+	tools (dashboards, load balancer hooks, alerting agents) to read with a BoardReader
+
+	The file is a header followed by fixed size records, one per check, updated in place. Each record starts with a
+	sequence number (a seqlock) : the writer makes it odd before changing the record and even again after, so that
+	readers never lock anything, and retry the rare reads that overlapped a write. Writers never wait for readers.
+
+	The file is never resized in place : when it is full, a twice larger copy replaces it (by a rename) and the old one
+	is flagged as moved, which readers check on each read to map the new one.
+	"""
+	GROWTH = 1024 # records
+
+	path = ''
+	capacity = 0
+	_file = None
+	_map = None
+	_count = 0
+
+	def __init__(self, path, capacity=GROWTH):
+		"""
+
+		:param path: path of the board file, replaced if it exists
+		:type path: str
+		:param capacity: initial number of records
+		:type capacity: int
+		"""
+		self.path = path
+		self._index = dict() # key : record number
+		self._names = dict() # record number : name
+		self._lock = Lock()
+		self._create(max(1, capacity))
+
+	def _create(self, capacity):
+		""" writes a new board file of capacity records, with the records of the current one, and renames it over path
+		(to call locked) """
+		temp_path = '%s.%s.tmp' % (self.path, os.getpid())
+		new_file = open(temp_path, 'w+b')
+		new_file.truncate(_offset(capacity))
+		new_map = mmap.mmap(new_file.fileno(), _offset(capacity))
+		if self._map:
+			new_map[_HEADER.size:_offset(self._count)] = self._map[_HEADER.size:_offset(self._count)]
+		_HEADER.pack_into(new_map, 0, MAGIC, _RECORD.size, capacity, self._count, time(), 0)
+		old_map, old_file = (self._map, self._file) if self._map else self._previous_map()
+		os.rename(temp_path, self.path)
+		if old_map is not None:
+			old_map[_MOVED_OFFSET] = '\1' # readers of the previous file switch to the new one
+			old_map.close()
+			old_file.close()
+		self._map, self._file, self.capacity = new_map, new_file, capacity
+
+	def _previous_map(self):
+		""" :return: the map and file of a board left by a previous run, (None, None) if there is none """
+		try:
+			previous = open(self.path, 'r+b')
+		except IOError:
+			return None, None
+		try:
+			if os.fstat(previous.fileno()).st_size >= _HEADER.size and previous.read(len(MAGIC)) == MAGIC:
+				return mmap.mmap(previous.fileno(), _HEADER.size), previous
+		except (OSError, mmap.error) as e:
+			logger.debug('ignoring previous board %s : %s' % (self.path, e))
+		previous.close()
+		return None, None
+
+	def _slot(self, key, name):
+		""" :return: the record number of key, allocating it if needed (to call locked)
+		:rtype: int
+		"""
+		number = self._index.get(key)
+		if number is None:
+			if self._count >= self.capacity:
+				self._create(self.capacity * 2)
+			number = self._index[key] = self._count
+			_RECORD.pack_into(self._map, _offset(number), 0, key, name, -1, _NAN, _NAN, _NAN)
+			self._names[number] = name
+			self._count += 1
+			_COUNT.pack_into(self._map, _COUNT_OFFSET, self._count) # once the record is written, for the readers
+		return number
+
+	def publish(self, check_id, name, status, change=None, latency=None):
+		""" updates the record of check_id
+
+		:type check_id: str
+		:type name: str
+		:type status: bool | None
+		:param change: time of the last status change
+		:type change: float | None
+		:param latency: duration of the last check in seconds
+		:type latency: float | None
+		"""
+		key, name = board_key(check_id), str(name)[:NAME_SIZE]
+		with self._lock:
+			if self._map is None:
+				return
+			number = self._slot(key, name)
+			offset = _offset(number)
+			sequence = _SEQUENCE.unpack_from(self._map, offset)[0]
+			_SEQUENCE.pack_into(self._map, offset, (sequence + 1) & 0xffffffff)
+			if self._names[number] != name:
+				self._map[offset + _SEQUENCE.size + KEY_SIZE:offset + _VALUES_OFFSET] = name.ljust(NAME_SIZE, '\0')
+				self._names[number] = name
+			_VALUES.pack_into(self._map, offset + _VALUES_OFFSET, _STATUS.get(status, -1),
+				change if change is not None else _NAN, latency if latency is not None else _NAN, time())
+			_SEQUENCE.pack_into(self._map, offset, (sequence + 2) & 0xffffffff)
+
+	def __len__(self):
+		return self._count
+
+	def close(self):
+		with self._lock:
+			if self._map:
+				self._map.close()
+				self._file.close()
+			self._map, self._file = None, None
+
+
+# clem 18/10/2026
+class BoardReader(object):
+	""" Reads the records of a StatusBoard file, from a read-only map of it : once open, reads are plain memory reads,
+	without any system call, lock or parsing, so that they can be done at any frequency
+
+	i.e. BoardReader('status.board').get('my_check').status
+	"""
+	SPINS = 1000 # retries of a record being written before giving up on it
+
+	path = ''
+	_file = None
+	_map = None
+	_count = 0
+
+	def __init__(self, path):
+		"""
+
+		:param path: path of the board file
+		:type path: str
+		:raise: IOError, ValueError (not a board file)
+		"""
+		self.path = path
+		self._index = dict() # id : record number
+		self._open()
+
+	def _open(self):
+		""" maps the board file and indexes its records """
+		self.close()
+		board_file = open(self.path, 'rb')
+		try:
+			board_map = mmap.mmap(board_file.fileno(), 0, access=mmap.ACCESS_READ)
+		except (ValueError, mmap.error): # empty file
+			board_file.close()
+			raise ValueError('%s is not a status board' % self.path)
+		magic, record_size, capacity = _HEADER.unpack_from(board_map, 0)[:3] if len(board_map) >= _HEADER.size \
+			else (None, None, None)
+		if magic != MAGIC or record_size != _RECORD.size or len(board_map) < _offset(capacity):
+			board_map.close()
+			board_file.close()
+			raise ValueError('%s is not a status board, or of another version' % self.path)
+		self._file, self._map, self._count = board_file, board_map, 0
+		self._index = dict()
+
+	def _refresh(self):
+		""" follows the board to its new file if it moved, and indexes the records added since last read """
+		if self._map[_MOVED_OFFSET] != '\0':
+			self._open()
+		count = _COUNT.unpack_from(self._map, _COUNT_OFFSET)[0]
+		for number in range(self._count, count):
+			key = self._map[_offset(number) + _SEQUENCE.size:_offset(number) + _SEQUENCE.size + KEY_SIZE]
+			self._index[key.rstrip('\0')] = number
+		self._count = count
+
+	def _read(self, number):
+		""" :return: a consistent copy of record number, None if it was being written for too long
+		:rtype: BoardEntry | None
+		"""
+		offset = _offset(number)
+		for _ in xrange(self.SPINS):
+			record = _RECORD.unpack_from(self._map, offset)
+			if record[0] & 1 or _SEQUENCE.unpack_from(self._map, offset)[0] != record[0]:
+				continue
+			_, key, name, status, change, latency, updated = record
+			return BoardEntry(key.rstrip('\0'), name.rstrip('\0'), _STATUS_REVERSE.get(status),
+				change if change == change else None, latency if latency == latency else None,
+				updated if updated == updated else None)
+		return None
+
+	def get(self, check_id):
+		""" :return: the current record of check_id, None if it is not on the board
+		:rtype: BoardEntry | None
+		"""
+		self._refresh()
+		number = self._index.get(board_key(check_id))
+		return self._read(number) if number is not None else None
+
+	def snapshot(self):
+		""" :return: the current record of every check
+		:rtype: list[BoardEntry]
+		"""
+		self._refresh()
+		return [entry for entry in (self._read(number) for number in xrange(self._count)) if entry is not None]
+
+	def __len__(self):
+		self._refresh()
+		return self._count
+
+	def close(self):
+		if self._map:
+			self._map.close()
+			self._file.close()
+		self._map, self._file = None, None
+
+
+if __name__ == '__main__':
+	import sys
+	for entry in BoardReader(sys.argv[1] if len(sys.argv) > 1 else 'status.board').snapshot():
+		print '%-20s %-30s %-8s %s' % (entry.id, entry.name, {None: 'UNKNOWN', False: 'OFFLINE', True: 'ONLINE'}[
+			entry.status], '%.3f sec' % entry.latency if entry.latency is not None else '')
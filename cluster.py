@@ -0,0 +1,368 @@
+from threading import Thread, Lock, Event
+from logging import getLogger
+from bisect import bisect
+from hashlib import md5, sha1
+from time import time
+from shards import dependency_groups
+from utilz import TermColoring
+import socket
+import hmac
+import json
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+# clem 18/10/2026
+def parse_address(node):
+	""" :param node: host:port
+	:type node: str
+	:rtype: (str, int)
+	:raise: ValueError
+	"""
+	host, _, port = node.strip().rpartition(':')
+	if not host or not port.isdigit():
+		raise ValueError('invalid node address "%s", expected host:port' % node)
+	return host.strip('[]'), int(port)
+
+
+# clem 18/10/2026
+class HashRing(object):
+	""" A consistent hashing ring of nodes : each node is placed at REPLICAS points, a key belonging to the node of the
+	first point after its hash. When a node leaves or joins, only the keys of its points move. """
+	REPLICAS = 64
+
+	nodes = tuple()
+
+	def __init__(self, nodes, replicas=REPLICAS):
+		"""
+
+		:type nodes: list[str]
+		:type replicas: int
+		"""
+		assert nodes
+		self.nodes = tuple(sorted(nodes))
+		points = sorted((self._hash('%s#%s' % (node, number)), node) for node in self.nodes for number in range(replicas))
+		self._hashes = [each for each, _ in points]
+		self._owners = [node for _, node in points]
+
+	@staticmethod
+	def _hash(key):
+		return int(md5(key).hexdigest()[:8], 16)
+
+	def node_of(self, key):
+		""" :return: the node key belongs to
+		:type key: str
+		:rtype: str
+		"""
+		return self._owners[bisect(self._hashes, self._hash(key)) % len(self._hashes)]
+
+
+# clem 18/10/2026
+class ClusterNode(object):
+	""" One of several monitors sharing the checks, each probing only its part of them
+
+	Nodes know each other from a static list of peers, and send each other UDP heart-beats : a peer not heard of for
+	timeout seconds is considered down (or right away when it leaves). The checks are partitioned among the live nodes
+	by a HashRing of their dependency group (checks linked by depends_on staying together), so when a node goes down
+	only its checks move to the others, and back when it returns.
+
+	Each node sends the results of its checks to all the others, so that all the nodes know the status of all the
+	checks. Only one of them, the writer (the live node of the smallest address), reports them to the status page
+	service : the others only print their changes. A node becoming the writer reports again the checks that changed
+	in the last 2 * timeout seconds, which the previous writer may not have sent.
+
+	Messages are JSON, signed with HMAC-SHA1 if a secret is given. Without one the peers must be on a trusted network.
+	Each message carries its send time and the start time and sequence number of its sender : the ones sent more than
+	MAX_SKEW seconds ago (the clocks of the nodes have to agree within that), or not newer than the last one of their
+	sender, are rejected, so that captured messages cannot be replayed.
+	"""
+	HEARTBEAT = 2. # seconds
+	RESULTS_CHUNK = 200 # results per datagram
+	MAX_DATAGRAM = 65507
+	MAX_SKEW = 30. # seconds
+
+	node = ''
+	heartbeat = HEARTBEAT
+	timeout = 0.
+	received = 0
+	rejected = 0
+	_socket = None
+	_ring = None
+	_writer = None
+
+	def __init__(self, interface, node, peers, heartbeat=HEARTBEAT, timeout=None, secret=''):
+		"""
+
+		:type interface: ServiceInterfaceAbstract
+		:param node: the host:port this node listens to, and is known as by its peers
+		:type node: str
+		:param peers: the host:port of the other nodes (node itself may be listed)
+		:type peers: list[str]
+		:param heartbeat: interval of the heart-beats in seconds
+		:type heartbeat: float
+		:param timeout: seconds without heart-beat after which a peer is down, defaults to 3 heart-beats
+		:type timeout: float | None
+		:param secret: shared secret signing the messages
+		:type secret: str
+		:raise: ValueError
+		"""
+		self._interface = interface
+		self.node = node
+		self.address = parse_address(node)
+		self.peers = dict((peer, parse_address(peer)) for peer in peers if peer != node)
+		self.heartbeat = heartbeat
+		self.timeout = timeout or 3 * heartbeat
+		self._secret = secret
+		started = time()
+		self._last_seen = dict((peer, started) for peer in self.peers) # all alive until proven otherwise
+		self._groups = None
+		self._buffer = list()
+		self._lock = Lock()
+		self._send_lock = Lock() # so that messages are sent in the order of their sequence numbers
+		self._run = time() # a restarted node numbers its messages after the ones of its previous run
+		self._sequence = 0
+		self._last_received = dict() # peer : (run, sequence) of its last message
+		self._stop = Event()
+		self._threads = list()
+
+	def start(self):
+		""" binds the node address, and starts receiving and sending heart-beats """
+		family = socket.getaddrinfo(self.address[0], self.address[1], 0, socket.SOCK_DGRAM)[0][0]
+		self._socket = socket.socket(family, socket.SOCK_DGRAM)
+		self._socket.bind(self.address)
+		self._socket.settimeout(self.heartbeat)
+		for target, name in ((self._receive_loop, 'cluster-receive'), (self._heartbeat_loop, 'cluster-heartbeat')):
+			thread = Thread(target=target, name=name)
+			thread.daemon = True
+			thread.start()
+			self._threads.append(thread)
+		self._refresh()
+
+	def close(self):
+		""" leaves the cluster, so that the peers take over the checks of this node right away """
+		self._stop.set()
+		if self._socket:
+			self._broadcast({'type': 'bye'})
+			for thread in self._threads: # at most a heart-beat, the socket timeout
+				thread.join(2 * self.heartbeat)
+			self._socket.close()
+
+	def reload(self):
+		""" to be called once the config was reloaded, as dependencies may have changed """
+		self._groups = None
+
+	##############
+	# MEMBERSHIP #
+	##############
+
+	@property
+	def live_nodes(self):
+		""" :return: this node and the peers heard of in the last timeout seconds
+		:rtype: list[str]
+		"""
+		limit = time() - self.timeout
+		return sorted([self.node] + [peer for peer, seen in self._last_seen.items() if seen >= limit])
+
+	@property
+	def ring(self):
+		""" the HashRing of the live nodes
+		:rtype: HashRing
+		"""
+		return self._refresh()
+
+	@property
+	def writer(self):
+		""" the node reporting to the status page service """
+		return self.ring.nodes[0]
+
+	@property
+	def is_writer(self):
+		return self.writer == self.node
+
+	def _refresh(self):
+		""" rebuilds the ring if nodes joined or left, taking over the writes if this node became the writer
+
+		:rtype: HashRing
+		"""
+		nodes = tuple(self.live_nodes)
+		with self._lock:
+			ring = self._ring
+			if ring is None or ring.nodes != nodes:
+				ring = self._ring = HashRing(nodes)
+				promoted = nodes[0] == self.node and self._writer != self.node
+				self._writer = nodes[0]
+			else:
+				return ring
+		print 'Cluster : %s node(s) up (%s), writer is %s' % (len(nodes), ', '.join(nodes), nodes[0])
+		if promoted:
+			self._take_over_writes()
+		return ring
+
+	def _take_over_writes(self):
+		""" reports the recent changes again, the previous writer having maybe not sent them """
+		since = time() - 2 * self.timeout
+		for check_instance in self._interface.checks_dict.values():
+			if check_instance.last_status is not None and (check_instance.last_change or 0) >= since:
+				self._interface.update_queue.put(check_instance, None, check_instance.last_status)
+
+	@property
+	def groups(self):
+		""" check id : id of its dependency group """
+		if self._groups is None:
+			self._groups = dependency_groups(self._interface.dependencies, self._interface.checks_dict.keys())
+		return self._groups
+
+	def owned(self, keys):
+		""" :return: the keys of the checks that this node runs
+		:type keys: list
+		:rtype: list
+		"""
+		ring, groups = self.ring, self.groups
+		return [key for key in keys if ring.node_of(groups.get(key, key)) == self.node]
+
+	##########
+	# ROUNDS #
+	##########
+
+	def run_round(self, keys, deadline=None):
+		""" runs the checks keys, reports them if this node is the writer, and sends their results to the peers
+
+		:type keys: list
+		:type deadline: float | None
+		:rtype: RoundStats | None
+		"""
+		stats = self._interface.check_all(False, True, deadline, keys, self._report)
+		with self._lock:
+			self._flush()
+		if stats:
+			print TermColoring.bold(stats)
+		return stats
+
+	def _report(self, check_instance, old_status, new_status):
+		self._show(check_instance, old_status, new_status)
+		details = check_instance.last_probe
+		with self._lock:
+			self._buffer.append((check_instance.id, new_status, check_instance.last_latency,
+				str(details) if details is not None else None))
+			if len(self._buffer) >= self.RESULTS_CHUNK:
+				self._flush()
+
+	def _show(self, check_instance, old_status, new_status):
+		""" reports the new status of a check if this node is the writer, prints it if it changed otherwise """
+		if self.is_writer:
+			self._interface.report_check(check_instance, old_status, new_status, True)
+		elif new_status != old_status:
+			self._interface.report_check(check_instance, old_status, new_status)
+
+	def _flush(self):
+		""" sends the buffered results to the peers (to call locked) """
+		if self._buffer:
+			self._send_results(self._buffer)
+			self._buffer = list()
+
+	def _send_results(self, results):
+		""" sends results to the peers, in as many datagrams as needed """
+		if not self._broadcast({'type': 'results', 'results': results}):
+			if len(results) > 1:
+				middle = len(results) // 2
+				self._send_results(results[:middle])
+				self._send_results(results[middle:])
+			else:
+				logger.error('cluster result of %s not sent, too large for a datagram' % results[0][0])
+
+	def _apply(self, node, results):
+		""" sets the statuses found by node on the checks of this node """
+		checks = self._interface.checks_dict
+		for check_id, status, latency, details in results:
+			check_instance = checks.get(check_id)
+			if check_instance is None: # not in the config of this node (yet)
+				continue
+			old_status = check_instance.last_status
+			self._show(check_instance, old_status, check_instance.set_result(status, latency, details))
+
+	#############
+	# MESSAGING #
+	#############
+
+	def _sign(self, payload):
+		return hmac.new(self._secret, payload, sha1).hexdigest() if self._secret else ''
+
+	def _encode(self, message):
+		""" numbers, dates and signs message (to call with _send_lock) """
+		self._sequence += 1
+		message.update(node=self.node, run=self._run, seq=self._sequence, time=time())
+		payload = json.dumps(message, separators=(',', ':'))
+		return '%s %s' % (self._sign(payload), payload)
+
+	def _broadcast(self, message):
+		""" :return: False if message was not sent, being too large for a datagram
+		:rtype: bool
+		"""
+		with self._send_lock:
+			data = self._encode(message)
+			if len(data) > self.MAX_DATAGRAM:
+				return False
+			self._send(data)
+			return True
+
+	def _send(self, data):
+		for peer, address in self.peers.items():
+			try:
+				self._socket.sendto(data, address)
+			except socket.error as e:
+				logger.debug('cannot send to %s : %s' % (peer, e))
+
+	def _heartbeat_loop(self):
+		while not self._stop.is_set():
+			self._broadcast({'type': 'heartbeat'})
+			self._refresh()
+			self._stop.wait(self.heartbeat)
+
+	def _receive_loop(self):
+		while not self._stop.is_set():
+			try:
+				data = self._socket.recv(self.MAX_DATAGRAM)
+			except socket.timeout:
+				continue
+			except socket.error:
+				if self._stop.is_set():
+					break
+				continue
+			try:
+				self._handle(data)
+			except Exception as e:
+				logger.exception('cannot handle cluster message : %s' % e)
+
+	def _handle(self, data):
+		signature, _, payload = data.partition(' ')
+		if not hmac.compare_digest(signature, self._sign(payload)):
+			self.rejected += 1
+			return
+		message = json.loads(payload)
+		node, sent = message.get('node'), message.get('time')
+		number = (message.get('run'), message.get('seq'))
+		if node not in self.peers or not isinstance(sent, (int, float)) or abs(time() - sent) > self.MAX_SKEW or \
+			number <= self._last_received.get(node, (0, 0)): # unknown, stale or replayed
+			self.rejected += 1
+			return
+		self._last_received[node] = number
+		self.received += 1
+		if message['type'] == 'bye':
+			self._last_seen[node] = 0.
+			self._refresh()
+			return
+		self._last_seen[node] = time()
+		if message['type'] == 'results':
+			if node not in self.ring.nodes:
+				self._refresh()
+			self._apply(node, message['results'])
+		elif message['type'] == 'heartbeat' and node not in self.ring.nodes:
+			self._refresh()
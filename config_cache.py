@@ -0,0 +1,129 @@
+from ConfigParser import NoSectionError, NoOptionError, DEFAULTSECT, Error as ConfigError
+from logging import getLogger
+from hashlib import sha1
+import marshal
+import os
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+# clem 18/10/2026
+class CompiledConfig(object):
+	""" The resolved items (DEFAULT ones merged, %(...)s interpolated) of every section of a config file, saved in a
+	marshal file so that large configs are loaded with a single read instead of being parsed again
+
+	A compiled config is only valid for the config file it was compiled from, identified by the SHA-1 of its content.
+	"""
+	MAGIC = 'IMCC1'
+
+	digest = ''
+
+	def __init__(self, digest, sections):
+		"""
+
+		:param digest: SHA-1 of the content of the config file
+		:type digest: str
+		:param sections: list of (section name, list of (option, value)), DEFAULT first
+		:type sections: list
+		"""
+		self.digest = digest
+		self._order = [name for name, _ in sections if name != DEFAULTSECT]
+		self._items = dict(sections)
+		self._values = dict() # section : {option : value}, built on first get() of the section
+
+	@staticmethod
+	def digest_of(data):
+		""" :type data: str
+		:rtype: str
+		"""
+		return sha1(data).hexdigest()
+
+	@classmethod
+	def compile(cls, parser, digest):
+		""" :param parser: the parsed config file
+		:type parser: ConfigParser.RawConfigParser
+		:type digest: str
+		:return: the compiled config, None if a value cannot be interpolated (the error being raised again when read)
+		:rtype: CompiledConfig | None
+		"""
+		try:
+			sections = [(DEFAULTSECT, parser.items(DEFAULTSECT))]
+			sections.extend((name, parser.items(name)) for name in parser.sections())
+		except ConfigError as e:
+			logger.info('config not compiled : %s' % e)
+			return None
+		return cls(digest, sections)
+
+	@classmethod
+	def load(cls, path, digest):
+		""" :param path: the compiled config file
+		:type path: str
+		:param digest: SHA-1 of the current content of the config file
+		:type digest: str
+		:return: the compiled config, None if there is none or it is stale or unreadable
+		:rtype: CompiledConfig | None
+		"""
+		try:
+			with open(path, 'rb') as compiled_file:
+				magic, compiled_digest, sections = marshal.loads(compiled_file.read())
+		except IOError:
+			return None
+		except (EOFError, ValueError, TypeError) as e:
+			logger.warning('ignoring invalid compiled config %s : %s' % (path, e))
+			return None
+		if magic != cls.MAGIC or compiled_digest != digest or not isinstance(sections, list):
+			return None
+		return cls(digest, sections)
+
+	def save(self, path):
+		""" writes the compiled config to path (atomically), logging rather than raising if it cannot """
+		temp_path = '%s.%s.tmp' % (path, os.getpid())
+		sections = [(DEFAULTSECT, self._items[DEFAULTSECT])] + [(name, self._items[name]) for name in self._order]
+		try:
+			with open(temp_path, 'wb') as compiled_file:
+				compiled_file.write(marshal.dumps((self.MAGIC, self.digest, sections)))
+			os.rename(temp_path, path)
+		except (IOError, OSError) as e:
+			logger.info('cannot save the compiled config to %s : %s' % (path, e))
+			try:
+				os.remove(temp_path)
+			except OSError:
+				pass
+
+	def sections(self):
+		""" :return: the names of the sections, DEFAULT excluded, like ConfigParser.sections()
+		:rtype: list
+		"""
+		return list(self._order)
+
+	def items(self, section):
+		""" :return: the (option, value) of section, like ConfigParser.items()
+		:rtype: list
+		:raise: NoSectionError
+		"""
+		if section not in self._items:
+			raise NoSectionError(section)
+		return list(self._items[section])
+
+	def get(self, section, option):
+		""" :return: the value of option in section, like ConfigParser.get()
+		:rtype: str
+		:raise: NoSectionError, NoOptionError
+		"""
+		values = self._values.get(section)
+		if values is None:
+			if section not in self._items:
+				raise NoSectionError(section)
+			values = self._values[section] = dict(self._items[section])
+		try:
+			return values[option.lower()]
+		except KeyError:
+			raise NoOptionError(option, section)
@@ -0,0 +1,141 @@
+from logging import getLogger
+from os.path import abspath, basename, dirname
+from time import time, sleep
+import os
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+# clem 18/10/2026
+class ConfigWatcher(object):
+	""" Watches a file for changes, through inotify (via ctypes) where available, by polling its mtime otherwise
+
+	The directory of the file is watched rather than the file itself, so that files replaced by a rename (as most
+	editors and deployment tools do) are still seen.
+	"""
+	POLL_INTERVAL = 1. # seconds, mtime fallback only
+	IN_CLOSE_WRITE = 0x8
+	IN_MOVED_TO = 0x80
+	IN_CREATE = 0x100
+	IN_NONBLOCK = 0x800
+	IN_CLOEXEC = 0x80000
+	_EVENT_HEADER = 16 # int wd, uint32 mask, cookie, len
+
+	path = ''
+	_fd = None
+	_signature = None
+
+	def __init__(self, path, use_inotify=True):
+		"""
+
+		:param path: the file to watch
+		:type path: str
+		:param use_inotify: False to always poll its mtime
+		:type use_inotify: bool
+		"""
+		self.path = abspath(path)
+		self._signature = self._stat()
+		if use_inotify:
+			self._fd = self._inotify_init()
+
+	@property
+	def uses_inotify(self):
+		return self._fd is not None
+
+	def _inotify_init(self):
+		""" :return: an inotify file descriptor watching the directory of the file, None if inotify is not available
+		:rtype: int | None
+		"""
+		try:
+			import ctypes
+			import ctypes.util
+			libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+			fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+			if fd < 0:
+				raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+			if libc.inotify_add_watch(fd, dirname(self.path), self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE) < 0:
+				os.close(fd)
+				raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+			return fd
+		except (OSError, AttributeError) as e: # AttributeError : no inotify in this libc
+			logger.info('inotify not available (%s), polling %s every %s sec' % (e, self.path, self.POLL_INTERVAL))
+			return None
+
+	def _stat(self):
+		""" :return: what identifies a version of the file : (inode, size, mtime), None if it does not exist """
+		try:
+			stat = os.stat(self.path)
+			return stat.st_ino, stat.st_size, stat.st_mtime
+		except OSError:
+			return None
+
+	def _read_events(self):
+		""" :return: whether any of the pending inotify events is about the file
+		:rtype: bool
+		"""
+		import struct
+		name, seen = basename(self.path), False
+		while True:
+			try:
+				data = os.read(self._fd, 4096)
+			except OSError: # EAGAIN, no more events
+				return seen
+			offset = 0
+			while offset + self._EVENT_HEADER <= len(data):
+				_, _, _, length = struct.unpack_from('iIII', data, offset)
+				offset += self._EVENT_HEADER
+				seen = seen or data[offset:offset + length].rstrip('\0') == name
+				offset += length
+
+	def _changed(self):
+		""" :return: whether the file is not the one last seen anymore, remembering the new one """
+		signature = self._stat()
+		if signature == self._signature:
+			return False
+		self._signature = signature
+		return signature is not None # a file being replaced may be missing for an instant
+
+	def wait(self, timeout):
+		""" sleeps until the file changes, or up to timeout seconds
+
+		:type timeout: float
+		:return: whether the file changed
+		:rtype: bool
+		"""
+		import select
+		end = time() + max(0., timeout)
+		while True:
+			remaining = end - time()
+			if self._fd is not None:
+				try:
+					readable = select.select([self._fd], [], [], max(0., remaining))[0]
+				except select.error: # interrupted
+					readable = list()
+				if readable and self._read_events() and self._changed():
+					return True
+			else:
+				if self._changed():
+					return True
+				if remaining > 0:
+					sleep(min(self.POLL_INTERVAL, remaining))
+			if end - time() <= 0:
+				return self._changed()
+
+	def changed(self):
+		""" :return: whether the file changed since last checked, without waiting
+		:rtype: bool
+		"""
+		return self.wait(0)
+
+	def close(self):
+		if self._fd is not None:
+			os.close(self._fd)
+			self._fd = None
@@ -0,0 +1,155 @@
+from networking import HTTPConnectionPool
+from threading import Lock
+from logging import getLogger
+from time import time
+import httplib
+import socket
+import json
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+# clem 18/10/2026
+class DockerError(IOError):
+	""" the Docker API could not be reached or answered an error """
+	pass
+
+
+# clem 18/10/2026
+class UnixHTTPConnection(httplib.HTTPConnection):
+	""" HTTP connection over a unix socket """
+	def __init__(self, socket_path, timeout=None):
+		httplib.HTTPConnection.__init__(self, 'localhost', timeout=timeout)
+		self.socket_path = socket_path
+
+	def connect(self):
+		sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		sock.settimeout(self.timeout)
+		try:
+			sock.connect(self.socket_path)
+		except socket.error:
+			sock.close()
+			raise
+		self.sock = sock
+
+
+# clem 18/10/2026
+class DockerClient(HTTPConnectionPool):
+	""" Minimal Docker Engine API client, over a kept-alive connection to the unix socket of the daemon
+
+	All the containers are listed with a single GET /containers/json?all=1, indexed by name, id and short id, and the
+	index is kept max_age seconds : every docker check of a round reads it instead of querying the daemon. Concurrent
+	callers wait for the listing in progress instead of sending their own.
+	"""
+	DEFAULT_SOCKET = '/var/run/docker.sock'
+	DEFAULT_MAX_AGE = 1.
+	SHORT_ID_LENGTH = 12
+
+	socket_path = DEFAULT_SOCKET
+	max_age = DEFAULT_MAX_AGE
+	listings = 0
+	_index = None
+	_indexed_at = 0.
+
+	def __init__(self, socket_path=DEFAULT_SOCKET, timeout=5, max_age=DEFAULT_MAX_AGE):
+		"""
+
+		:param socket_path: path of the unix socket of the Docker daemon
+		:type socket_path: str
+		:param timeout: socket timeout in seconds
+		:type timeout: int | float
+		:param max_age: how long the containers index is used before listing them again, in seconds
+		:type max_age: float
+		"""
+		super(DockerClient, self).__init__(1, timeout)
+		self.socket_path = socket_path
+		self.max_age = max_age
+		self._index_lock = Lock()
+
+	def _new_connection(self, host, https):
+		return UnixHTTPConnection(self.socket_path, self.timeout)
+
+	def get(self, url):
+		""" :return: the decoded JSON answer of the API to GET url
+		:raises: DockerError
+		"""
+		try:
+			response = self.request('localhost', 'GET', url, https=False)
+		except (httplib.HTTPException, socket.error) as e:
+			raise DockerError('Docker API %s : %s' % (self.socket_path, e))
+		if response.status != 200:
+			raise DockerError('Docker API GET %s : HTTP %s %s' % (url, response.status, response.body[:200]))
+		try:
+			return json.loads(response.body)
+		except ValueError as e:
+			raise DockerError('Docker API GET %s : %s' % (url, e))
+
+	def containers(self):
+		""" :return: all the containers, running or not, as listed by the API
+		:rtype: list[dict]
+		:raises: DockerError
+		"""
+		self.listings += 1
+		return self.get('/containers/json?all=1')
+
+	def index(self):
+		""" :return: the containers by name, id and short id, listing them again if the index is older than max_age
+		:rtype: dict
+		:raises: DockerError
+		"""
+		with self._index_lock:
+			if self._index is None or time() - self._indexed_at > self.max_age:
+				index = dict()
+				for container in self.containers():
+					index[container['Id']] = container
+					index[container['Id'][:self.SHORT_ID_LENGTH]] = container
+					for name in container.get('Names') or list():
+						index[name.lstrip('/')] = container
+				self._index, self._indexed_at = index, time()
+			return self._index
+
+	def find(self, name_or_id):
+		""" :param name_or_id: container name, or id (or any unambiguous prefix of it)
+		:type name_or_id: str
+		:return: the container, None if there is none
+		:rtype: dict | None
+		:raises: DockerError
+		"""
+		index = self.index()
+		key = name_or_id.strip().lstrip('/')
+		if key in index:
+			return index[key]
+		matches = set(each['Id'] for each in index.itervalues() if each['Id'].startswith(key))
+		return index[matches.pop()] if key and len(matches) == 1 else None
+
+	@staticmethod
+	def is_up(container):
+		""" :return: whether the container is running and not reported unhealthy by its health check
+		:type container: dict | None
+		:rtype: bool
+		"""
+		return bool(container) and container.get('State') == 'running' and \
+			'(unhealthy)' not in (container.get('Status') or '')
+
+
+__clients = dict()
+__clients_lock = Lock()
+
+
+# clem 18/10/2026
+def get_docker_client(socket_path=DockerClient.DEFAULT_SOCKET):
+	""" :return: the shared DockerClient of socket_path
+	:rtype: DockerClient
+	"""
+	with __clients_lock:
+		if socket_path not in __clients:
+			__clients[socket_path] = DockerClient(socket_path)
+	return __clients[socket_path]
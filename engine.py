@@ -0,0 +1,527 @@
+from threading import Thread, Lock, Condition, Event
+from Queue import Queue
+from logging import getLogger
+from heapq import heappush, heappop
+from binascii import crc32
+from time import time
+from utilz import SpecialEnum
+import sys
+
+__version__ = '0.5'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+# clem 18/10/2026
+class OverlapPolicy(SpecialEnum):
+	""" what to do when a round is due while the previous one is still running """
+	SKIP = 'skip' # drop the new round, or only its part still running (see RoundRunner)
+	QUEUE = 'queue' # run every round, one after the other
+	COALESCE = 'coalesce' # run at most one more round, merging all the ones asked meanwhile
+
+
+# clem 18/10/2026
+class RoundStats(object):
+	""" statistics of one checking round """
+	round_id = 0
+	total = 0
+	done = 0
+	errors = 0
+	missed = 0
+	started = 0.
+	ended = 0.
+	deadline = None
+	cancelled = False
+	flight = None # SingleFlight of the probes of the round, if any
+	skipped = 0 # checks not probed as a check they depend on is down
+	tripped = 0 # checks not probed as their circuit breaker is open
+
+	def __init__(self, round_id, total, deadline=None):
+		"""
+
+		:type round_id: int
+		:type total: int
+		:param deadline: maximum duration of the round in seconds, None for no limit
+		:type deadline: float | None
+		"""
+		self.round_id = round_id
+		self.total = total
+		self.deadline = deadline
+		self._cond = Condition(Lock())
+
+	def _start(self):
+		self.started = time()
+
+	def _end(self):
+		self.ended = time()
+
+	def _inc(self, failed=False, count=1):
+		with self._cond:
+			self.done += count
+			if failed:
+				self.errors += count
+			self._cond.notify_all()
+
+	def _wait(self):
+		""" blocks until all the checks are done or the deadline is reached, cancelling the remaining ones """
+		with self._cond:
+			while self.done < self.total:
+				if self.deadline is None:
+					self._cond.wait()
+				else:
+					remaining = self.started + self.deadline - time()
+					if remaining <= 0:
+						self.cancelled = True
+						self.missed = self.total - self.done
+						break
+					self._cond.wait(remaining)
+
+	@property
+	def wall_time(self):
+		""" duration of the round in seconds """
+		return (self.ended or time()) - self.started
+
+	def __str__(self):
+		text = 'round %s : %s/%s checks in %.3f sec (%s errors)' % \
+			(self.round_id, self.done, self.total, self.wall_time, self.errors)
+		if self.missed:
+			text += ', %s missed the %s sec deadline' % (self.missed, self.deadline)
+		if self.skipped:
+			text += ', %s skipped behind a down dependency' % self.skipped
+		if self.tripped:
+			text += ', %s skipped with an open circuit' % self.tripped
+		if self.flight and self.flight.requests:
+			text += ', %s' % self.flight
+		return text
+
+
+# clem 18/10/2026
+class _Call(object):
+	""" one in-flight (or done) call of a SingleFlight """
+	def __init__(self):
+		self._done = Event()
+		self._result = None
+		self._exc_info = None
+
+	def _set(self, result=None, exc_info=None):
+		self._result, self._exc_info = result, exc_info
+		self._done.set()
+
+	def result(self):
+		""" blocks until the call is done, and returns its result or raises its exception """
+		self._done.wait()
+		if self._exc_info:
+			raise self._exc_info[0], self._exc_info[1], self._exc_info[2]
+		return self._result
+
+
+# clem 18/10/2026
+class SingleFlight(object):
+	""" Deduplicates identical calls over a round : the first call of a key runs, concurrent and later calls of the same
+	key wait for it and get the same result (or exception). Meant to be created for one round and discarded after.
+	"""
+	requests = 0
+	executions = 0
+
+	def __init__(self):
+		self._lock = Lock()
+		self._calls = dict() # key : _Call
+
+	def _claim(self, keys):
+		""" :return: the _Call of each key, and the keys this caller has to run
+		:rtype: (dict, list)
+		"""
+		calls, claimed = dict(), list()
+		with self._lock:
+			self.requests += len(keys)
+			for key in keys:
+				if key not in self._calls:
+					self._calls[key] = _Call()
+					claimed.append(key)
+			self.executions += len(claimed)
+			for key in keys:
+				calls[key] = self._calls[key]
+		return calls, claimed
+
+	def do(self, key, function, *args):
+		""" returns function(*args), only calling it if no call of key is running or done in this SingleFlight
+
+		:type key: collections.Hashable
+		:type function: callable
+		"""
+		calls, claimed = self._claim([key])
+		if claimed:
+			try:
+				calls[key]._set(function(*args))
+			except Exception:
+				calls[key]._set(exc_info=sys.exc_info())
+		return calls[key].result()
+
+	def do_many(self, keys, function):
+		""" same as do() for a list of keys resolved at once, function being called with the list of the keys not
+		running or done yet, and returning a dict of key : result
+
+		:type keys: list
+		:type function: callable
+		:rtype: dict
+		"""
+		calls, claimed = self._claim(keys)
+		if claimed:
+			try:
+				results = function(claimed)
+				for key in claimed:
+					calls[key]._set(results.get(key))
+			except Exception:
+				exc_info = sys.exc_info()
+				for key in claimed:
+					calls[key]._set(exc_info=exc_info)
+		return dict((key, call.result()) for key, call in calls.iteritems())
+
+	@property
+	def deduplicated(self):
+		""" number of calls that did not run """
+		return self.requests - self.executions
+
+	@property
+	def dedup_ratio(self):
+		""" share of the calls that did not run, in [0, 1] """
+		return float(self.deduplicated) / self.requests if self.requests else 0.
+
+	def __str__(self):
+		return '%s probes for %s checks (%.0f%% deduplicated)' % (self.executions, self.requests, self.dedup_ratio * 100)
+
+
+# clem 18/10/2026
+class _Plan(object):
+	""" the dependency graph of the items of a round, releasing each item once all the items it depends on are done """
+	def __init__(self, items, depends):
+		"""
+
+		:type items: list
+		:param depends: function returning the items an item depends on (items not in the round are ignored)
+		:type depends: callable
+		:raises: ValueError if the dependencies have a cycle
+		"""
+		self._items = items
+		self._lock = Lock()
+		self._waiting = dict() # item : number of the items it depends on not done yet
+		self._children = dict() # item : items depending on it
+		members = set(items)
+		for each in items:
+			parents = set(parent for parent in depends(each) if parent in members and parent != each)
+			self._waiting[each] = len(parents)
+			for parent in parents:
+				self._children.setdefault(parent, list()).append(each)
+		self._check_acyclic()
+
+	def _check_acyclic(self):
+		waiting, ready, released = dict(self._waiting), self.ready(), 0
+		while ready:
+			each = ready.pop()
+			released += 1
+			for child in self._children.get(each, list()):
+				waiting[child] -= 1
+				if not waiting[child]:
+					ready.append(child)
+		if released != len(self._items):
+			raise ValueError('dependency cycle between %s' % [str(each) for each, count in waiting.iteritems() if count])
+
+	def ready(self):
+		""" :return: the items not depending on any other
+		:rtype: list
+		"""
+		return [each for each in self._items if not self._waiting[each]]
+
+	def done(self, item):
+		""" :return: the items released by the end of item
+		:rtype: list
+		"""
+		released = list()
+		with self._lock:
+			for child in self._children.get(item, list()):
+				self._waiting[child] -= 1
+				if not self._waiting[child]:
+					released.append(child)
+		return released
+
+
+# clem 18/10/2026
+class CheckEngine(object):
+	""" runs rounds of checks on a fixed pool of worker threads, instead of one thread per check """
+	DEFAULT_CONCURRENCY = 64
+
+	max_concurrency = DEFAULT_CONCURRENCY
+	missed_total = 0
+	_round_counter = 0
+	_workers = None
+	last_round = None
+
+	def __init__(self, max_concurrency=DEFAULT_CONCURRENCY):
+		"""
+
+		:param max_concurrency: number of workers, i.e. maximum number of checks running at the same time
+		:type max_concurrency: int
+		"""
+		self.max_concurrency = max(1, int(max_concurrency or self.DEFAULT_CONCURRENCY))
+		self._lock = Lock()
+		self._queue = Queue()
+		self._workers = list()
+
+	def _next_round(self, total, deadline):
+		with self._lock:
+			self._round_counter += 1
+			return RoundStats(self._round_counter, total, deadline)
+
+	def _worker(self):
+		while True:
+			stats, item, callback, weight, plan = self._queue.get()
+			if stats.cancelled: # straggler of a round past its deadline, skip it
+				continue
+			failed = False
+			try:
+				callback(item)
+			except Exception as e:
+				logger.exception('check %s failed : %s' % (str(item), e))
+				failed = True
+			if plan: # queues the items that were waiting for this one before counting it, so the round cannot end first
+				for each in plan.done(item):
+					self._queue.put((stats, each, callback, weight, plan))
+			stats._inc(failed, weight(item))
+
+	def _start_workers(self):
+		""" lazily starts the pool, once """
+		with self._lock:
+			while len(self._workers) < self.max_concurrency:
+				a_thread = Thread(target=self._worker, name='check-worker-%s' % len(self._workers))
+				a_thread.daemon = True
+				a_thread.start()
+				self._workers.append(a_thread)
+
+	def run(self, items, callback, deadline=None, weight=None, depends=None):
+		""" calls callback(item) for each item on the worker pool, and blocks until all are done or deadline is reached
+
+		Any exception raised by callback is logged and counted, and does not stop the round.
+		Once the deadline is reached, the items not started yet are skipped and counted as missed, along with the
+		ones still running (that cannot be interrupted).
+		With depends, an item is only started once all the items it depends on are done (failed or not), items
+		independent of each other still running in parallel.
+
+		:type items: list
+		:type callback: callable
+		:param deadline: maximum duration of the round in seconds, None for no limit
+		:type deadline: float | None
+		:param weight: function returning the number of checks of an item, if some items hold several checks
+		:type weight: callable | None
+		:param depends: function returning the list of the items an item depends on (items have to be hashable)
+		:type depends: callable | None
+		:rtype: RoundStats
+		:raises: ValueError if the dependencies have a cycle
+		"""
+		assert callable(callback)
+		weight = weight if callable(weight) else lambda _: 1
+		plan = _Plan(items, depends) if callable(depends) else None
+		self._start_workers()
+		stats = self._next_round(sum(weight(each) for each in items), deadline)
+		stats._start()
+		for each in (plan.ready() if plan else items):
+			self._queue.put((stats, each, callback, weight, plan))
+		stats._wait()
+		stats._end()
+		with self._lock:
+			self.missed_total += stats.missed
+		self.last_round = stats
+		return stats
+
+
+# clem 18/10/2026
+class RoundRunner(object):
+	""" runs rounds one at a time on a dedicated thread, applying an OverlapPolicy when a round is asked for while
+	the previous one is still running
+
+	Given a remaining function, SKIP only drops the part of a new round that is already running or pending (i.e. its
+	checks still in flight), the rest being merged into the pending round, so that a slow round never starves the
+	checks it does not hold.
+	"""
+	policy = OverlapPolicy.SKIP
+	skipped_rounds = 0
+	coalesced_rounds = 0
+	_running = False
+	_current = None
+	_thread = None
+
+	def __init__(self, round_function, policy=OverlapPolicy.SKIP, merge=None, remaining=None):
+		"""
+
+		:param round_function: the function running one round, called with the arguments given to submit()
+		:type round_function: callable
+		:type policy: str
+		:param merge: function merging the arguments lists of two coalesced rounds, defaults to keeping the latest
+		:type merge: callable | None
+		:param remaining: function returning the arguments of a new round without what the arguments lists of the
+			running and pending rounds already hold, None if nothing is left, applied with the SKIP policy
+		:type remaining: callable | None
+		"""
+		assert callable(round_function)
+		assert policy in OverlapPolicy()
+		self._round_function = round_function
+		self.policy = policy
+		self._merge = merge if callable(merge) else lambda _, latest: latest
+		self._remaining = remaining if callable(remaining) else None
+		self._pending = list()
+		self._cond = Condition(Lock())
+
+	@property
+	def busy(self):
+		return self._running or len(self._pending) > 0
+
+	@property
+	def pending(self):
+		return len(self._pending)
+
+	def submit(self, *args):
+		""" asks for a new round
+
+		:return: whether a round was added (False if skipped or merged with an already pending one)
+		:rtype: bool
+		"""
+		with self._cond:
+			if not self._thread:
+				self._thread = Thread(target=self._run, name='round-runner')
+				self._thread.daemon = True
+				self._thread.start()
+			if self.busy:
+				if self.policy == OverlapPolicy.SKIP and self._remaining:
+					args = self._remaining(args, ([self._current] if self._running else []) + self._pending)
+				if self.policy == OverlapPolicy.SKIP and (args is None or not self._remaining):
+					self.skipped_rounds += 1
+					return False
+				if self.policy == OverlapPolicy.SKIP and self._pending:
+					self.coalesced_rounds += 1
+					self._pending[-1] = self._merge(self._pending[-1], args)
+					return False
+				if self.policy == OverlapPolicy.COALESCE and self._pending:
+					self.coalesced_rounds += 1
+					self._pending[-1] = self._merge(self._pending[-1], args)
+					return False
+			self._pending.append(args)
+			self._cond.notify()
+			return True
+
+	def _run(self):
+		while True:
+			with self._cond:
+				while not self._pending:
+					self._cond.wait()
+				args = self._current = self._pending.pop(0)
+				self._running = True
+			try:
+				self._round_function(*args)
+			except Exception as e:
+				logger.exception('round failed : %s' % e)
+			finally:
+				with self._cond:
+					self._running, self._current = False, None
+
+
+# clem 18/10/2026
+class CheckScheduler(object):
+	""" a heap based scheduler of keys, each one due at its own interval
+
+	Each key gets a deterministic start offset in [0, interval[ derived from its hash (jitter), so that keys sharing the
+	same interval are spread over it instead of all being due at the same instant. Offsets are rounded to at most SLOTS
+	slots (TICK seconds apart at least) of a grid aligned on the clock, so that keys of the same slot are due at the
+	very same time and still run together, in a few rounds per interval.
+	"""
+	SLOTS = 10
+	TICK = 1. # seconds
+	_generation = 0
+
+	def __init__(self):
+		self._heap = list()
+		self._entries = dict() # key : (interval, generation)
+		self._lock = Lock()
+
+	@classmethod
+	def jitter(cls, key, interval):
+		""" deterministic offset of key in [0, interval[, one of the slots of interval
+
+		:type key: str
+		:type interval: float
+		:rtype: float
+		"""
+		slots = max(1, min(cls.SLOTS, int(interval / cls.TICK)))
+		return (crc32(str(key)) & 0xffffffff) % slots * interval / slots
+	
+	@classmethod
+	def first_due(cls, key, interval, now=None):
+		""" :return: the first time key is due after now, on the slot grid of interval
+		:rtype: float
+		"""
+		now = now or time()
+		when = now - now % interval + cls.jitter(key, interval)
+		return when if when >= now else when + interval
+
+	def add(self, key, interval):
+		""" schedules key every interval seconds, replacing any previous schedule of key
+
+		:type key: str
+		:type interval: float
+		"""
+		assert interval > 0
+		with self._lock:
+			self._generation += 1
+			self._entries[key] = (interval, self._generation)
+			heappush(self._heap, (self.first_due(key, interval), self._generation, key))
+
+	def remove(self, key):
+		""" un-schedules key (its heap entries are lazily discarded) """
+		with self._lock:
+			self._entries.pop(key, None)
+
+	def __contains__(self, key):
+		return key in self._entries
+
+	def __len__(self):
+		return len(self._entries)
+
+	def _is_stale(self, entry):
+		_, generation, key = entry
+		return key not in self._entries or self._entries[key][1] != generation
+
+	def _clean_top(self):
+		while self._heap and self._is_stale(self._heap[0]):
+			heappop(self._heap)
+
+	def next_due(self):
+		""" :return: the time at which the next key will be due, None if nothing is scheduled
+		:rtype: float | None
+		"""
+		with self._lock:
+			self._clean_top()
+			return self._heap[0][0] if self._heap else None
+
+	def pop_due(self, now=None):
+		""" returns all the keys due at now, and reschedules each of them at its next interval boundary
+
+		:type now: float | None
+		:rtype: list
+		"""
+		now = now or time()
+		due = list()
+		with self._lock:
+			self._clean_top()
+			while self._heap and self._heap[0][0] <= now:
+				when, generation, key = heappop(self._heap)
+				interval = self._entries[key][0]
+				due.append(key)
+				# keeps the phase if late, without running several times to catch up
+				when += interval * (int((now - when) / interval) + 1)
+				heappush(self._heap, (when, generation, key))
+				self._clean_top()
+		return due
@@ -1,6 +1,8 @@
 import socket
 import subprocess as sp
 from logging import getLogger
+from threading import Lock, Condition, Thread
+from resolver import get_resolver
 
 # imported from https://github.com/Fclem/isbio2/blob/master/isbio/utilz/networking.py # commit 6170526
 __version__ = '0.1.1'
@@ -24,8 +26,271 @@ def is_host_online(host, deadline=5):
 	:type deadline: str | int
 	:rtype: bool
 	"""
-	res = sp.call(['ping', '-c', '3', '-i', '0.2', '-w', str(deadline), host], stdout=sp.PIPE)
-	return res == 0
+	return get_pinger().ping_many([host], deadline=float(deadline))[host].online
+
+
+# clem 18/10/2026
+class PingResult(object):
+	""" outcome of the echo requests sent to one host """
+	host = ''
+	sent = 0
+	received = 0
+	
+	def __init__(self, host, sent=0):
+		self.host = host
+		self.sent = sent
+		self.rtt_list = list()
+	
+	@property
+	def online(self):
+		return self.received > 0
+	
+	@property
+	def loss(self):
+		""" ratio of lost echo requests, from 0. to 1. """
+		return 1. - float(self.received) / self.sent if self.sent else 1.
+	
+	@property
+	def rtt(self):
+		""" average round trip time in seconds, None if no reply """
+		return sum(self.rtt_list) / len(self.rtt_list) if self.rtt_list else None
+	
+	def __str__(self):
+		rtt = '%.3f ms' % (self.rtt * 1000) if self.rtt is not None else 'n/a'
+		return '%s : %s/%s received, %d%% loss, rtt %s' % (self.host, self.received, self.sent, self.loss * 100, rtt)
+
+
+# clem 18/10/2026
+class Pinger(object):
+	""" In process ICMP pinger, sending echo requests to many hosts in one sweep over a single socket
+
+	Uses an unprivileged datagram ICMP socket where the kernel allows it (net.ipv4.ping_group_range), a raw socket
+	otherwise (root only), and falls back to running the system's ping command in parallel for each host.
+
+	Concurrent sweeps share the socket : they only lock it to allocate sequence numbers and send, while a single
+	receiver thread dispatches each reply, by (ip, sequence), to the sweep waiting for it.
+	"""
+	ICMP_ECHO_REQUEST = 8
+	ICMP_ECHO_REPLY = 0
+	_PAYLOAD = 'infra_monitor'
+	
+	_socket = None
+	_raw = False
+	_ident = 0
+	_seq = 0
+	_receiver = None
+	
+	def __init__(self):
+		import os
+		self._ident = os.getpid() & 0xffff
+		self._lock = Lock() # sending
+		self._cond = Condition(Lock()) # the replies waited for
+		self._waiting = dict() # (ip, seq) : (sent time, the in flight dict of its sweep, its PingResult list)
+		self._socket = self._open_socket()
+	
+	def _open_socket(self):
+		for sock_type in [socket.SOCK_DGRAM, socket.SOCK_RAW]:
+			try:
+				sock = socket.socket(socket.AF_INET, sock_type, socket.IPPROTO_ICMP)
+				sock.setblocking(False)
+				self._raw = sock_type == socket.SOCK_RAW
+				logger.debug('Pinger : using %s ICMP socket' % ('raw' if self._raw else 'datagram'))
+				return sock
+			except socket.error as e:
+				logger.debug('Pinger : cannot open ICMP socket %s : %s' % (sock_type, e))
+		logger.info('Pinger : no ICMP socket available, using ping command')
+		return None
+	
+	@property
+	def native(self):
+		""" whether pings are sent from this process, or through the ping command """
+		return self._socket is not None
+	
+	@staticmethod
+	def _checksum(data):
+		if len(data) % 2:
+			data += '\0'
+		total = 0
+		for i in range(0, len(data), 2):
+			total += ord(data[i]) + (ord(data[i + 1]) << 8)
+		total = (total >> 16) + (total & 0xffff)
+		total += total >> 16
+		return ~total & 0xffff
+	
+	def _packet(self, seq):
+		import struct
+		header = struct.pack('!BBHHH', self.ICMP_ECHO_REQUEST, 0, 0, self._ident, seq)
+		checksum = self._checksum(header + self._PAYLOAD)
+		# checksum is computed in host order on little endian pairs, hence packed as is
+		return struct.pack('!BBHHH', self.ICMP_ECHO_REQUEST, 0, socket.htons(checksum), self._ident, seq) + \
+			self._PAYLOAD
+	
+	def _parse_reply(self, data):
+		""" :return: the sequence number of the echo reply in data, None if not one of ours
+		:rtype: int | None
+		"""
+		import struct
+		if self._raw: # raw sockets get the IP header as well
+			data = data[(ord(data[0]) & 0x0f) * 4:]
+		if len(data) < 8:
+			return None
+		icmp_type, _, _, ident, seq = struct.unpack('!BBHHH', data[:8])
+		# datagram ICMP sockets only get their own replies, with the id rewritten by the kernel
+		if icmp_type != self.ICMP_ECHO_REPLY or (self._raw and ident != self._ident):
+			return None
+		return seq
+	
+	@staticmethod
+	def _resolve(hosts):
+		""" :return: ip : list of hosts
+		:rtype: dict
+		"""
+		by_ip = dict()
+		for host, addresses in get_resolver().resolve_many(hosts).iteritems():
+			ipv4 = [each for each in addresses if ':' not in each]
+			if ipv4:
+				by_ip.setdefault(ipv4[0], list()).append(host)
+			else:
+				logger.warning('ping %s : %s' % (host, 'no IPv4 address' if addresses else 'Name or service not known'))
+		return by_ip
+	
+	def ping_many(self, hosts, count=3, interval=.2, deadline=5.):
+		""" Pings all hosts in one sweep : count echo requests to each, interval seconds apart, and waits for the
+		replies up to deadline seconds overall
+
+		:type hosts: list
+		:type count: int
+		:type interval: float
+		:type deadline: float
+		:return: host : PingResult
+		:rtype: dict
+		"""
+		hosts = list(hosts)
+		if not self.native:
+			return self._ping_many_subprocess(hosts, count, interval, deadline)
+		return self._sweep(hosts, count, interval, deadline)
+	
+	def _sweep(self, hosts, count, interval, deadline):
+		from time import time
+		
+		results = dict((host, PingResult(host)) for host in hosts)
+		by_ip = self._resolve(hosts)
+		in_flight = dict() # (ip, seq) : sent time
+		end = time() + deadline
+		self._start_receiver()
+		
+		def wait(until):
+			with self._cond:
+				while in_flight:
+					timeout = until - time()
+					if timeout <= 0:
+						return
+					self._cond.wait(timeout)
+		
+		try:
+			for i in range(count):
+				with self._lock:
+					for ip, ip_hosts in by_ip.iteritems():
+						self._seq = (self._seq + 1) & 0xffff
+						key = (ip, self._seq)
+						with self._cond:
+							in_flight[key] = time()
+							self._waiting[key] = (in_flight[key], in_flight, [results[host] for host in ip_hosts])
+						try:
+							self._socket.sendto(self._packet(self._seq), (ip, 0))
+						except socket.error as e:
+							logger.debug('ping %s : %s' % (ip, e))
+							with self._cond:
+								del in_flight[key], self._waiting[key]
+						for host in ip_hosts:
+							results[host].sent += 1
+				if i < count - 1:
+					wait(min(time() + interval, end))
+			wait(end)
+		finally:
+			with self._cond: # the replies that did not come
+				for key in in_flight:
+					self._waiting.pop(key, None)
+				in_flight.clear()
+		return results
+	
+	def _start_receiver(self):
+		with self._lock:
+			if not self._receiver:
+				self._receiver = Thread(target=self._receive_loop, name='pinger-receiver')
+				self._receiver.daemon = True
+				self._receiver.start()
+	
+	def _receive_loop(self):
+		""" dispatches the echo replies to the sweeps waiting for them """
+		import select
+		from time import time
+		
+		while True:
+			try:
+				if not select.select([self._socket], [], [], 1.)[0]:
+					continue
+				data, address = self._socket.recvfrom(1024)
+			except (socket.error, select.error):
+				continue
+			received = time()
+			key = (address[0], self._parse_reply(data))
+			with self._cond:
+				entry = self._waiting.pop(key, None)
+				if entry is None:
+					continue
+				sent, in_flight, ip_results = entry
+				in_flight.pop(key, None)
+				for result in ip_results:
+					result.received += 1
+					result.rtt_list.append(received - sent)
+				self._cond.notify_all()
+	
+	@staticmethod
+	def _ping_command(host, count, interval, deadline):
+		""" :return: the arguments of the ping command pinging host
+		:rtype: list[str]
+		"""
+		from math import ceil
+		# -w takes whole seconds, and -w 0 would mean no deadline at all
+		return ['ping', '-n', '-c', str(count), '-i', str(interval), '-w', str(max(1, int(ceil(deadline)))), host]
+	
+	@classmethod
+	def _ping_many_subprocess(cls, hosts, count, interval, deadline):
+		""" fallback running one ping command per host, all at the same time """
+		import re
+		processes = dict()
+		results = dict((host, PingResult(host, count)) for host in hosts)
+		for host in set(hosts):
+			try:
+				processes[host] = sp.Popen(cls._ping_command(host, count, interval, deadline), stdout=sp.PIPE,
+					stderr=sp.PIPE)
+			except OSError as e:
+				logger.warning('ping %s : %s' % (host, e))
+		for host, process in processes.iteritems():
+			output = process.communicate()[0]
+			received = re.search(r'(\d+) (?:packets )?received', output)
+			results[host].received = int(received.group(1)) if received else int(process.returncode == 0)
+			rtt = re.search(r'= [\d.]+/([\d.]+)/', output)
+			if rtt:
+				results[host].rtt_list = [float(rtt.group(1)) / 1000] * results[host].received
+		return results
+
+
+__pinger = None
+__pinger_lock = Lock()
+
+
+# clem 18/10/2026
+def get_pinger():
+	""" :return: the shared Pinger of this process
+	:rtype: Pinger
+	"""
+	global __pinger
+	with __pinger_lock:
+		if not __pinger:
+			__pinger = Pinger()
+	return __pinger
 
 
 # clem 08/09/2016 moved here on 25/05/2016
@@ -57,8 +322,12 @@ def _test_tcp_connect(host, port, timeout=2):
 		if type(port) is not int:
 			port = int(port)
 		try:
+			address = get_resolver().resolve(host)
+			if ':' in address:
+				s.close()
+				s = socket.socket(socket.AF_INET6)
 			s.settimeout(timeout)
-			s.connect((host, port))
+			s.connect((address, port))
 			s.send('PING')
 			get_logger().debug('TCP can connect to %s:%s' % (host, port))
 			return True
@@ -69,6 +338,125 @@ def _test_tcp_connect(host, port, timeout=2):
 		raise
 
 
+# clem 18/10/2026
+class _WritablePoller(object):
+	""" minimal wrapper of epoll, or poll where not available, waiting for sockets to become writable """
+	
+	def __init__(self):
+		import select
+		if hasattr(select, 'epoll'):
+			self._poller = select.epoll()
+			self._mask = select.EPOLLOUT | select.EPOLLERR | select.EPOLLHUP
+			self._ms = False
+		else:
+			self._poller = select.poll()
+			self._mask = select.POLLOUT | select.POLLERR | select.POLLHUP
+			self._ms = True
+	
+	def register(self, fd):
+		self._poller.register(fd, self._mask)
+	
+	def unregister(self, fd):
+		self._poller.unregister(fd)
+	
+	def poll(self, timeout):
+		""" :return: the list of ready file descriptors
+		:rtype: list
+		"""
+		timeout = max(timeout, 0)
+		return [fd for fd, _ in self._poller.poll(timeout * 1000 if self._ms else timeout)]
+	
+	def close(self):
+		if hasattr(self._poller, 'close'):
+			self._poller.close()
+
+
+# clem 18/10/2026
+def tcp_connect_many(targets, timeout=2, max_in_flight=512, timeouts=None):
+	""" Test TCP connection to many targets at once, using non-blocking sockets multiplexed on epoll
+
+	:param targets: list of (host, port)
+	:type targets: list
+	:param timeout: connection timeout of each target in seconds
+	:type timeout: int | float
+	:param max_in_flight: maximum number of connections attempted at the same time (i.e. of open sockets)
+	:type max_in_flight: int
+	:param timeouts: (host, port) : connection timeout, for the targets not using the default one
+	:type timeouts: dict | None
+	:return: (host, port) : connect latency in seconds, None if the connection failed
+	:rtype: dict
+	"""
+	import errno
+	from os import strerror
+	from time import time
+	
+	targets = list(targets)
+	timeouts = timeouts or dict()
+	results = dict((target, None) for target in targets)
+	waiting = list(set(targets))
+	pending = dict() # fd : (socket, target, start time, timeout time)
+	poller = _WritablePoller()
+	addresses = get_resolver().resolve_many([host for host, _ in waiting])
+	
+	def start(target):
+		host, port = target
+		try:
+			if not addresses.get(host):
+				raise socket.gaierror(socket.EAI_NONAME, 'Name or service not known')
+			family, sock_type, proto, _, address = socket.getaddrinfo(addresses[host][0], int(port), 0,
+				socket.SOCK_STREAM, 0, socket.AI_NUMERICHOST)[0]
+			sock = socket.socket(family, sock_type, proto)
+			sock.setblocking(False)
+			started = time()
+			err = sock.connect_ex(address)
+			if err not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+				sock.close()
+				raise socket.error(err, strerror(err))
+			pending[sock.fileno()] = (sock, target, started, started + timeouts.get(target, timeout))
+			poller.register(sock.fileno())
+		except (socket.error, ValueError) as e:
+			logger.warning('connect %s:%s : %s' % (host, port, e))
+	
+	def finish(fd):
+		sock, (host, port), started, _ = pending.pop(fd)
+		poller.unregister(fd)
+		try:
+			err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+			if err:
+				logger.warning('connect %s:%s : %s' % (host, port, strerror(err)))
+				return
+			results[(host, port)] = time() - started
+			get_logger().debug('TCP can connect to %s:%s' % (host, port))
+			try:
+				sock.send('PING')
+			except socket.error:
+				pass
+		finally:
+			sock.close()
+	
+	try:
+		while waiting or pending:
+			while waiting and len(pending) < max_in_flight:
+				start(waiting.pop())
+			if not pending:
+				continue
+			now = time()
+			for fd, (sock, (host, port), _, end) in pending.items():
+				if now >= end:
+					logger.warning('connect %s:%s : Time-out' % (host, port))
+					poller.unregister(fd)
+					del pending[fd]
+					sock.close()
+			if pending:
+				for fd in poller.poll(min(end for _, _, _, end in pending.itervalues()) - now):
+					finish(fd)
+	finally:
+		for sock, _, _, _ in pending.itervalues():
+			sock.close()
+		poller.close()
+	return results
+
+
 # clem 29/04/2016
 def get_free_port():
 	"""
@@ -127,15 +515,408 @@ def get_http_code(target_url, timeout=5):
 
 
 # clem 12/10/2016
-def test_url(target_url, timeout=5):
-	""" Tells whether or not the target_url is properly reachable (HTTP200 or HTTP302)
+def test_url(target_url, timeout=5, validator=None):
+	""" Tells whether or not the target_url is properly reachable (HTTP200 or HTTP302), and its body valid if a
+	validator is given (the body being then read chunk by chunk, only until the validator reached its verdict)
 
 
 	:param target_url: url to reach or request object
 	:type target_url: str | urllib2.Request
 	:param timeout: time out in seconds
 	:type timeout: int
-	:return: does it return a proper HTTP code ?
+	:param validator: to check the response body with
+	:type validator: validation.BodyValidator | None
+	:return: does it return a proper HTTP code (and body) ?
 	:rtype: bool
 	"""
-	return get_http_code(target_url, timeout) in [200, 302]
+	if isinstance(target_url, basestring): # over the shared keep-alive connections
+		return get_probe_client().probe(target_url, timeout, validator=validator).ok
+	if not validator:
+		return get_http_code(target_url, timeout) in [200, 302]
+	from urllib2 import URLError, HTTPError
+	try:
+		response = get_http_response(target_url, timeout)
+		try:
+			return getattr(response, 'code', 520) in [200, 302] and validator.validate(response.read)
+		finally:
+			response.close()
+	except (URLError, HTTPError, socket.error) as e:
+		get_logger().warning('%s : %s' % (e, target_url))
+	return False
+
+
+# clem 18/10/2026
+class PooledResponse(object):
+	""" a fully read httplib.HTTPResponse, detached from its connection, whose body remains available through read() """
+	status = 0
+	reason = ''
+	version = 11
+	length = 0
+	body = ''
+	
+	def __init__(self, response, body):
+		"""
+		
+		:type response: httplib.HTTPResponse
+		:type body: str
+		"""
+		from StringIO import StringIO
+		self.status = response.status
+		self.reason = response.reason
+		self.version = response.version
+		self.msg = response.msg
+		self.body = body
+		self.length = len(body)
+		self._fp = StringIO(body)
+	
+	def getheader(self, name, default=None):
+		return self.msg.getheader(name, default)
+	
+	def getheaders(self):
+		return self.msg.items()
+	
+	def read(self, amt=None):
+		return self._fp.read() if amt is None else self._fp.read(amt)
+
+
+# clem 18/10/2026
+class HTTPConnectionPool(object):
+	""" Thread safe pool of persistent (keep-alive) HTTP and HTTPS connections, per host
+
+	Each request borrows an idle connection to its host (a hit) or opens a new one (a miss), fully reads the
+	response and gives the connection back, unless the server closes it. Up to pool_size idle connections are kept
+	per host. A request failing on a reused connection (closed by the server meanwhile) is retried once on a new one.
+	"""
+	DEFAULT_POOL_SIZE = 4
+	
+	pool_size = DEFAULT_POOL_SIZE
+	timeout = None
+	hits = 0
+	misses = 0
+	reconnects = 0
+	
+	def __init__(self, pool_size=DEFAULT_POOL_SIZE, timeout=None):
+		"""
+		
+		:param pool_size: maximum number of idle connections kept per host
+		:type pool_size: int
+		:param timeout: socket timeout of the connections in seconds, None for blocking
+		:type timeout: int | float | None
+		"""
+		self.pool_size = max(0, int(pool_size))
+		self.timeout = timeout
+		self._idle = dict() # (https, host) : list of connections
+		self._lock = Lock()
+	
+	def _new_connection(self, host, https):
+		import httplib
+		connector = httplib.HTTPSConnection if https else httplib.HTTPConnection
+		return connector(host, timeout=self.timeout)
+	
+	def _get(self, host, https, fresh=False):
+		""" :return: a connection and whether it is a reused one
+		:rtype: (httplib.HTTPConnection, bool)
+		"""
+		with self._lock:
+			idle = self._idle.get((https, host))
+			if idle and not fresh:
+				self.hits += 1
+				return idle.pop(), True
+			self.misses += 1
+		return self._new_connection(host, https), False
+	
+	def _put(self, host, https, conn):
+		with self._lock:
+			idle = self._idle.setdefault((https, host), list())
+			if len(idle) < self.pool_size:
+				idle.append(conn)
+				return
+		conn.close()
+	
+	def request(self, host, method, url, body=None, headers=None, https=True):
+		""" sends a request on a pooled connection to host
+
+		:type host: str
+		:type method: str
+		:type url: str
+		:type body: str | None
+		:type headers: dict | None
+		:type https: bool
+		:return: the fully read response
+		:rtype: PooledResponse
+		:raises: httplib.HTTPException, socket.error
+		"""
+		import httplib
+		fresh = False
+		while True:
+			conn, reused = self._get(host, https, fresh)
+			try:
+				conn.request(method, url, body, headers or dict())
+				response = conn.getresponse()
+				pooled_response = PooledResponse(response, response.read()) # drains the body
+			except (httplib.HTTPException, socket.error):
+				conn.close()
+				if reused: # stale keep-alive connection
+					with self._lock:
+						self.reconnects += 1
+					fresh = True
+					continue
+				raise
+			if response.will_close:
+				conn.close()
+			else:
+				self._put(host, https, conn)
+			return pooled_response
+	
+	@property
+	def idle_count(self):
+		with self._lock:
+			return sum(len(each) for each in self._idle.itervalues())
+	
+	def close(self):
+		""" closes all the idle connections """
+		with self._lock:
+			idle, self._idle = self._idle, dict()
+		for conn_list in idle.itervalues():
+			for conn in conn_list:
+				conn.close()
+	
+	def __str__(self):
+		return 'HTTP pool : %s hits, %s misses, %s reconnects, %s idle' % \
+			(self.hits, self.misses, self.reconnects, self.idle_count)
+
+
+# clem 18/10/2026
+class HTTPTimings(object):
+	""" durations of the phases of an HTTP probe in seconds, None for the phases that did not happen (i.e. connect and
+	tls on a reused keep-alive connection, or tls over plain HTTP) """
+	connect = None
+	tls = None
+	ttfb = None # time to first byte : from sending the request to having read the response headers
+	total = None
+	
+	def __str__(self):
+		def ms(value):
+			return '%.1f ms' % (value * 1000) if value is not None else '-'
+		return 'connect %s, tls %s, ttfb %s, total %s' % (ms(self.connect), ms(self.tls), ms(self.ttfb), ms(self.total))
+
+
+# clem 18/10/2026
+class HTTPProbeResult(object):
+	""" outcome of an HTTP probe, true if the target answered with one of OK_CODES (and its body was valid) """
+	OK_CODES = [200, 206, 302, 304]
+	
+	url = ''
+	status = None # HTTP code of the last response, None if none
+	reused = False # sent on a kept-alive connection
+	not_modified = False # HTTP 304 to a conditional request
+	valid = None # verdict of the body validator, None if not validated
+	etag = None
+	error = None
+	
+	def __init__(self, url):
+		self.url = url
+		self.timings = HTTPTimings()
+	
+	@property
+	def ok(self):
+		return self.error is None and self.status in self.OK_CODES and self.valid is not False
+	
+	def __nonzero__(self):
+		return self.ok
+	
+	def __str__(self):
+		status = 'HTTP %s' % self.status if self.status else self.error
+		return '%s%s, %s' % (status, ' (not modified)' if self.not_modified else '', self.timings)
+
+
+# clem 18/10/2026
+class HTTPProbeClient(HTTPConnectionPool):
+	""" Thread safe HTTP(S) client for url checks, over pooled keep-alive connections per host
+	
+	Each probe measures its connect, TLS, time to first byte and total durations separately. Responses with an ETag are
+	remembered, and the next probe of the same url asks for it with If-None-Match, a 304 reply meaning the body (and
+	the verdict of its validator) did not change. Redirections are followed, bodies are never buffered : they are
+	either validated while being read, or drained up to DRAIN_LIMIT bytes to keep the connection alive, or the
+	connection is closed. A probe still redirected after MAX_REDIRECTS redirections fails.
+	"""
+	DRAIN_LIMIT = 64 * 1024
+	MAX_REDIRECTS = 5
+	_ssl_context = None
+	
+	def __init__(self, pool_size=HTTPConnectionPool.DEFAULT_POOL_SIZE):
+		super(HTTPProbeClient, self).__init__(pool_size)
+		self._etags = dict() # cache key : (etag, verdict of the validator, url that gave it)
+	
+	def _new_connection(self, host, https):
+		""" an unconnected connection, to be connected by _connect """
+		import httplib
+		return (httplib.HTTPSConnection if https else httplib.HTTPConnection)(host)
+	
+	def _connect(self, conn, https, timeout, timings):
+		""" connects conn, timing the TCP connection and the TLS handshake separately """
+		from time import time
+		started = time()
+		sock = socket.create_connection((get_resolver().resolve(conn.host), conn.port), timeout)
+		timings.connect = time() - started
+		sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+		if https:
+			import ssl
+			if not self._ssl_context:
+				self._ssl_context = ssl.create_default_context()
+			started = time()
+			sock = self._ssl_context.wrap_socket(sock, server_hostname=conn.host)
+			timings.tls = time() - started
+		conn.sock = sock
+	
+	def _send(self, host, https, method, path, headers, timeout, result):
+		""" sends a request and reads the response headers, retrying once on a new connection if a kept-alive one was
+		closed by the server meanwhile
+
+		:return: the connection and its response
+		:rtype: (httplib.HTTPConnection, httplib.HTTPResponse)
+		"""
+		import httplib
+		from time import time
+		fresh = False
+		while True:
+			conn, result.reused = self._get(host, https, fresh)
+			try:
+				if result.reused:
+					conn.sock.settimeout(timeout)
+				else:
+					self._connect(conn, https, timeout, result.timings)
+				started = time()
+				conn.request(method, path, None, headers)
+				response = conn.getresponse()
+				result.timings.ttfb = time() - started
+				return conn, response
+			except (httplib.HTTPException, socket.error):
+				conn.close()
+				if result.reused:
+					with self._lock:
+						self.reconnects += 1
+					fresh = True
+					continue
+				raise
+	
+	def _release(self, host, https, conn, response):
+		""" puts conn back in the pool if the response can be entirely read cheaply, closes it otherwise """
+		if not response.isclosed() and response.length is not None and response.length <= self.DRAIN_LIMIT:
+			response.read()
+		if response.isclosed() and not response.will_close:
+			self._put(host, https, conn)
+		else:
+			conn.close()
+	
+	@staticmethod
+	def _address(parts):
+		""" :return: the host[:port] of the url parts, without the credentials, and the Authorization header of the
+		credentials, None if there are none
+		:type parts: urlparse.SplitResult
+		:rtype: (str, str | None)
+		:raises: httplib.InvalidURL
+		"""
+		import httplib
+		from urllib import unquote
+		from base64 import b64encode
+		try:
+			host, port = parts.hostname, parts.port
+		except ValueError as e: # invalid port
+			raise httplib.InvalidURL(str(e))
+		if not host:
+			raise httplib.InvalidURL('no host in url')
+		address = ('[%s]' % host if ':' in host else host) + (':%s' % port if port else '')
+		if parts.username is None:
+			return address, None
+		credentials = '%s:%s' % (unquote(parts.username), unquote(parts.password or ''))
+		return address, 'Basic %s' % b64encode(credentials)
+	
+	@staticmethod
+	def _without_password(url):
+		""" url, its password masked, for the logs """
+		from urlparse import urlsplit, urlunsplit
+		parts = urlsplit(url)
+		if parts.password is None:
+			return url
+		return urlunsplit(parts._replace(netloc=parts.netloc.replace(':%s@' % parts.password, ':***@', 1)))
+	
+	def probe(self, url, timeout=5, method='GET', headers=None, validator=None, cache_key=None):
+		""" probes url, sending the credentials it may have (user:password@host) with Basic authentication
+
+		:type url: str
+		:param timeout: socket timeout in seconds
+		:type timeout: int | float
+		:param method: GET or HEAD
+		:type method: str
+		:param headers: additional request headers, i.e. {'Range': 'bytes=0-0'}
+		:type headers: dict | None
+		:param validator: to check the response body with, while reading it
+		:type validator: validation.BodyValidator | None
+		:param cache_key: key of the ETag cache, defaults to url (should differ for different validations of url)
+		:type cache_key: collections.Hashable
+		:rtype: HTTPProbeResult
+		"""
+		import httplib
+		from urlparse import urlsplit, urlunsplit, urljoin
+		from time import time
+		
+		result = HTTPProbeResult(url)
+		cache_key = cache_key or url
+		started = time()
+		conn = None
+		try:
+			for _ in range(self.MAX_REDIRECTS + 1):
+				parts = urlsplit(url)
+				https = parts.scheme == 'https'
+				path = urlunsplit(('', '', parts.path or '/', parts.query, ''))
+				host, authorization = self._address(parts)
+				request_headers = dict(headers or dict())
+				if authorization and not any(key.lower() == 'authorization' for key in request_headers):
+					request_headers['Authorization'] = authorization
+				cached = self._etags.get(cache_key)
+				if cached and cached[2] == url:
+					request_headers['If-None-Match'] = cached[0]
+				conn, response = self._send(host, https, method, path, request_headers, timeout, result)
+				result.status = response.status
+				location = response.getheader('Location')
+				if response.status in [301, 302, 303, 307, 308] and location:
+					self._release(host, https, conn, response)
+					conn, url = None, urljoin(url, location)
+					continue
+				if response.status == 304 and cached:
+					result.not_modified, result.valid = True, cached[1]
+				elif validator and method != 'HEAD' and response.status in HTTPProbeResult.OK_CODES:
+					result.valid = validator.validate(response.read)
+				result.etag = response.getheader('ETag')
+				self._release(host, https, conn, response)
+				conn = None
+				break
+			else: # still redirected, the status (302 is OK) is not the one of the target
+				result.error = 'more than %s redirections' % self.MAX_REDIRECTS
+				logger.warning('%s : %s' % (result.error, self._without_password(result.url)))
+			if result.etag and result.ok and not result.not_modified:
+				self._etags[cache_key] = (result.etag, result.valid, url)
+		except (httplib.HTTPException, socket.error) as e:
+			if conn: # failed while reading the body
+				conn.close()
+			result.error = str(e) or e.__class__.__name__
+			logger.warning('%s : %s' % (result.error, self._without_password(url)))
+		result.timings.total = time() - started
+		return result
+
+
+__probe_client = None
+__probe_client_lock = Lock()
+
+
+# clem 18/10/2026
+def get_probe_client():
+	""" :return: the shared HTTPProbeClient of this process
+	:rtype: HTTPProbeClient
+	"""
+	global __probe_client
+	with __probe_client_lock:
+		if not __probe_client:
+			__probe_client = HTTPProbeClient()
+	return __probe_client
@@ -0,0 +1,220 @@
+from threading import Lock
+from logging import getLogger
+from os.path import isfile
+import json
+import os
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+# clem 18/10/2026
+class Outbox(object):
+	""" Durable append-only log (write-ahead log) of the check status updates not yet acknowledged by the remote service
+
+	Each update is appended as a JSON line {"seq": n, "id": check_id, "old": status, "new": status}, and acknowledged
+	by an {"ack": [n, ...]} line once sent. Writes are flushed right away but only fsync-ed every sync_batch records
+	(or on sync()), trading the last few records on power loss for throughput. Once more than compact_threshold
+	records are acknowledged, the file is rewritten with the pending ones only.
+
+	On first use, the log left by a previous run is moved aside to path.replay, so that it never delays new records,
+	and replay() later moves its pending records back into the log, merged per check.
+	"""
+	DEFAULT_SYNC_BATCH = 64
+	DEFAULT_COMPACT_THRESHOLD = 1000
+
+	path = ''
+	sync_batch = DEFAULT_SYNC_BATCH
+	compact_threshold = DEFAULT_COMPACT_THRESHOLD
+	_file = None
+	_seq = 0
+	_dirty = 0
+	_acked = 0
+
+	def __init__(self, path, sync_batch=DEFAULT_SYNC_BATCH, compact_threshold=DEFAULT_COMPACT_THRESHOLD):
+		"""
+
+		:param path: path of the log file
+		:type path: str
+		:param sync_batch: number of records written between two fsync
+		:type sync_batch: int
+		:param compact_threshold: number of acknowledged records triggering a compaction
+		:type compact_threshold: int
+		"""
+		self.path = path
+		self.sync_batch = max(1, int(sync_batch))
+		self.compact_threshold = max(1, int(compact_threshold))
+		self._pending = dict() # seq : (check_id, old_status, new_status)
+		self._lock = Lock()
+
+	@staticmethod
+	def _read(path):
+		""" :return: the records not acknowledged in path, as seq : (check_id, old_status, new_status)
+		:rtype: dict
+		"""
+		pending = dict()
+		if not isfile(path):
+			return pending
+		with open(path) as log_file:
+			for line in log_file:
+				try:
+					record = json.loads(line)
+					if 'ack' in record:
+						for seq in record['ack']:
+							pending.pop(seq, None)
+					else:
+						pending[record['seq']] = (record['id'], record['old'], record['new'])
+				except (ValueError, KeyError, TypeError): # torn write of a crash
+					logger.warning('Outbox : skipping invalid record in %s : %r' % (path, line))
+		return pending
+
+	@staticmethod
+	def _last_seq(path):
+		""" :return: the highest sequence number in path, 0 if none
+		:rtype: int
+		"""
+		last = 0
+		if not isfile(path):
+			return last
+		with open(path) as log_file:
+			for line in log_file:
+				try:
+					record = json.loads(line)
+					last = max([last, record.get('seq', 0)] + record.get('ack', []))
+				except (ValueError, AttributeError, TypeError):
+					pass
+		return last
+
+	@property
+	def _replay_path(self):
+		return self.path + '.replay'
+
+	def _open(self):
+		""" moves the previous log aside, appending it to any previous replay file not fully replayed, and starts a new
+		one, numbered after the records of both, so that sequence numbers never collide across runs (to call locked) """
+		self._seq = max(self._seq, self._last_seq(self.path), self._last_seq(self._replay_path))
+		if isfile(self.path):
+			if isfile(self._replay_path):
+				with open(self._replay_path, 'a') as replay_file, open(self.path) as log_file:
+					for line in log_file:
+						replay_file.write(line)
+				os.remove(self.path)
+			else:
+				os.rename(self.path, self._replay_path)
+		self._file = open(self.path, 'a')
+
+	def replay(self):
+		""" reads the log of the previous run, merges its pending records per check (first old status, last new status)
+		and moves them into the current log
+
+		:return: the pending updates of the previous run, as a list of (seq, check_id, old_status, new_status)
+		:rtype: list
+		"""
+		with self._lock:
+			if not self._file:
+				self._open()
+		merged = dict() # check_id : [old_status, new_status]
+		for _, (check_id, old_status, new_status) in sorted(self._read(self._replay_path).iteritems()):
+			merged.setdefault(check_id, [old_status, new_status])[1] = new_status
+		records = list()
+		for check_id, (old_status, new_status) in merged.iteritems():
+			if old_status != new_status:
+				records.append((self.append(check_id, old_status, new_status), check_id, old_status, new_status))
+		self.sync()
+		if isfile(self._replay_path):
+			os.remove(self._replay_path)
+		if records:
+			logger.info('Outbox : %s pending updates from %s' % (len(records), self._replay_path))
+		return records
+
+	def _rewrite(self):
+		""" atomically replaces the log with the pending records only (to call locked) """
+		if self._file:
+			self._file.close()
+		tmp_path = self.path + '.tmp'
+		with open(tmp_path, 'w') as tmp_file:
+			for seq, (check_id, old_status, new_status) in sorted(self._pending.iteritems()):
+				tmp_file.write(self._dump(seq, check_id, old_status, new_status))
+			tmp_file.flush()
+			os.fsync(tmp_file.fileno())
+		os.rename(tmp_path, self.path)
+		self._file = open(self.path, 'a')
+		self._dirty = 0
+		self._acked = 0
+
+	@staticmethod
+	def _dump(seq, check_id, old_status, new_status):
+		return json.dumps({'seq': seq, 'id': check_id, 'old': old_status, 'new': new_status}) + '\n'
+
+	def _write(self, line):
+		""" (to call locked) """
+		if not self._file:
+			self._open()
+		self._file.write(line)
+		self._file.flush()
+		self._dirty += 1
+		if self._dirty >= self.sync_batch:
+			self._sync()
+
+	def _sync(self):
+		""" (to call locked) """
+		if self._file and self._dirty:
+			os.fsync(self._file.fileno())
+			self._dirty = 0
+
+	def sync(self):
+		""" forces the written records to disk """
+		with self._lock:
+			self._sync()
+
+	def append(self, check_id, old_status, new_status):
+		""" logs a pending update
+
+		:type check_id: str
+		:type old_status: bool | None
+		:type new_status: bool | None
+		:return: the sequence number of the record, to acknowledge it with
+		:rtype: int
+		"""
+		with self._lock:
+			if not self._file:
+				self._open()
+			self._seq += 1
+			self._pending[self._seq] = (check_id, old_status, new_status)
+			self._write(self._dump(self._seq, check_id, old_status, new_status))
+			return self._seq
+
+	def ack(self, seqs):
+		""" marks records as done (sent, or merged into an update that does not need to be sent), and compacts the log
+		if enough of them are
+
+		:type seqs: list[int]
+		"""
+		seqs = [seq for seq in seqs if seq in self._pending]
+		if not seqs:
+			return
+		with self._lock:
+			for seq in seqs:
+				self._pending.pop(seq, None)
+			self._write(json.dumps({'ack': seqs}) + '\n')
+			self._acked += len(seqs)
+			if self._acked >= self.compact_threshold:
+				self._rewrite()
+
+	@property
+	def pending_count(self):
+		return len(self._pending)
+
+	def close(self):
+		with self._lock:
+			self._sync()
+			if self._file:
+				self._file.close()
+				self._file = None
@@ -0,0 +1,161 @@
+from threading import Lock
+from logging import getLogger
+import abc
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+# clem 18/10/2026
+class BaseChecker(object):
+	""" Base of the checker of a check type
+
+	check(check) probes a single check. Checkers able to probe a whole round at once (one socket, one API call, ...)
+	also override check_many(checks) : all the enabled checks of their type in a round are then given to it in a
+	single call, instead of being checked one by one on the worker pool.
+	"""
+	__metaclass__ = abc.ABCMeta
+
+	@abc.abstractmethod
+	def check(self, check):
+		""" probes a check
+
+		:type check: CheckObject
+		:return: the status, or any object whose truth value is the status (i.e. with the details of the probe)
+		:rtype: bool | object
+		"""
+
+	def check_many(self, checks):
+		""" probes a list of checks of this type, one by one unless overridden
+
+		:type checks: list[CheckObject]
+		:return: {check: (status, latency in seconds or None)}
+		:rtype: dict
+		"""
+		return dict((each, (bool(self.check(each)), None)) for each in checks)
+
+	@property
+	def batches(self):
+		""" whether check_many is overridden to probe a list of checks at once """
+		return getattr(self.check_many, '__func__', None) is not BaseChecker.check_many.__func__
+
+	def normalize(self, data):
+		""" :return: the canonical form of the data of a check, checks of the same type with the same normalized data
+		sharing a single probe per round
+		:type data: str
+		:rtype: str
+		"""
+		return data.strip()
+
+
+# clem 18/10/2026
+class FunctionChecker(BaseChecker):
+	""" a checker made of functions (i.e. of the Checkers, BatchCheckers and TargetNormalizers enums) """
+	def __init__(self, check_function, batch_function=None, normalize_function=None):
+		"""
+
+		:param check_function: check(check)
+		:type check_function: callable
+		:param batch_function: check_many(checks)
+		:type batch_function: callable | None
+		:param normalize_function: normalize(data)
+		:type normalize_function: callable | None
+		"""
+		assert callable(check_function)
+		self._check = check_function
+		self._check_many = batch_function if callable(batch_function) else None
+		self._normalize = normalize_function if callable(normalize_function) else None
+
+	def check(self, check):
+		return self._check(check)
+
+	def check_many(self, checks):
+		if not self._check_many:
+			return super(FunctionChecker, self).check_many(checks)
+		return self._check_many(checks)
+
+	@property
+	def batches(self):
+		return self._check_many is not None
+
+	def normalize(self, data):
+		return self._normalize(data) if self._normalize else super(FunctionChecker, self).normalize(data)
+
+
+# clem 18/10/2026
+class CheckerRegistry(object):
+	""" Thread safe registry of the checker of each check type
+
+	Besides register(), checkers are discovered from the ENTRY_POINT_GROUP entry points of the installed packages (named
+	by check type, each loading a BaseChecker class or instance), and from modules having a CHECKERS dict of check
+	type : BaseChecker class or instance. A checker registered later replaces the one of the same type.
+	"""
+	ENTRY_POINT_GROUP = 'infra_monitor.checkers'
+	MODULE_ATTRIBUTE = 'CHECKERS'
+
+	def __init__(self):
+		self._checkers = dict() # check type : BaseChecker
+		self._lock = Lock()
+
+	def register(self, check_type, checker):
+		"""
+
+		:type check_type: str
+		:param checker: a BaseChecker, or a BaseChecker class to instantiate
+		:type checker: BaseChecker | type
+		"""
+		if isinstance(checker, type):
+			checker = checker()
+		if not isinstance(checker, BaseChecker):
+			raise TypeError('checker of "%s" is not a BaseChecker : %r' % (check_type, checker))
+		with self._lock:
+			if check_type in self._checkers:
+				logger.info('checker of "%s" replaced by %r' % (check_type, checker))
+			self._checkers[check_type] = checker
+
+	def get(self, check_type):
+		""" :return: the checker of check_type, None if there is none
+		:rtype: BaseChecker | None
+		"""
+		return self._checkers.get(check_type)
+
+	def __contains__(self, check_type):
+		return check_type in self._checkers
+
+	@property
+	def types(self):
+		return sorted(self._checkers)
+
+	def load_entry_points(self, group=ENTRY_POINT_GROUP):
+		""" registers the checkers of the entry points of group, if setuptools is available """
+		try:
+			import pkg_resources
+		except ImportError:
+			return
+		for entry_point in pkg_resources.iter_entry_points(group):
+			try:
+				self.register(entry_point.name, entry_point.load())
+			except Exception as e:
+				logger.exception('cannot load checker entry point %s : %s' % (entry_point, e))
+
+	def load_module(self, module_name):
+		""" imports module_name and registers the checkers of its CHECKERS dict """
+		import importlib
+		try:
+			module = importlib.import_module(module_name)
+			checkers = getattr(module, self.MODULE_ATTRIBUTE)
+		except (ImportError, AttributeError) as e:
+			logger.error('cannot load checkers from module %s : %s' % (module_name, e))
+			return
+		for check_type, checker in checkers.iteritems():
+			try:
+				self.register(check_type, checker)
+			except TypeError as e:
+				logger.error('module %s : %s' % (module_name, e))
@@ -0,0 +1,431 @@
+from threading import Lock, Event
+from logging import getLogger
+from os.path import getmtime
+from time import time
+import socket
+import struct
+import random
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+_random = random.SystemRandom() # query ids must not be predictable, against spoofed answers
+
+
+# clem 18/10/2026
+class RecordTypes(object):
+	""" DNS record types supported by the resolver """
+	A = 1
+	NS = 2
+	CNAME = 5
+	AAAA = 28
+
+	@classmethod
+	def by_name(cls, name):
+		""" :rtype: int
+		:raises: ValueError
+		"""
+		value = getattr(cls, name.upper(), None)
+		if not isinstance(value, int):
+			raise ValueError('unsupported DNS record type "%s"' % name)
+		return value
+
+
+# clem 18/10/2026
+class DNSAnswer(object):
+	""" the answer of a DNS server to a query """
+	NOERROR = 0
+	SERVFAIL = 2
+	NXDOMAIN = 3
+
+	name = ''
+	qtype = RecordTypes.A
+	rcode = None # None if no answer was received
+	elapsed = None # seconds
+	server = None
+
+	def __init__(self, name, qtype):
+		self.name = name
+		self.qtype = qtype
+		self.records = list() # of (type, ttl, value)
+
+	def values(self, qtype=None):
+		""" :return: the values of the records of qtype, defaults to the query type
+		:rtype: list[str]
+		"""
+		qtype = qtype or self.qtype
+		return [value for record_type, _, value in self.records if record_type == qtype]
+
+	@property
+	def ttl(self):
+		""" the smallest TTL of the records, None if there are none """
+		return min(ttl for _, ttl, _ in self.records) if self.records else None
+
+	@property
+	def ok(self):
+		return self.rcode == self.NOERROR and bool(self.values())
+
+	def __str__(self):
+		if self.rcode is None:
+			return '%s : no answer' % self.name
+		return '%s : rcode %s, %s' % (self.name, self.rcode, ', '.join(self.values()) or 'no record')
+
+
+# clem 18/10/2026
+def build_query(query_id, name, qtype):
+	""" :return: the DNS packet of a recursive query
+	:rtype: str
+	"""
+	labels = ''.join(chr(len(label)) + label for label in name.rstrip('.').split('.') if label)
+	return struct.pack('>HHHHHH', query_id, 0x0100, 1, 0, 0, 0) + labels + '\0' + struct.pack('>HH', qtype, 1)
+
+
+def _read_name(data, offset):
+	""" :return: the (possibly compressed) domain name at offset, and the offset following it
+	:rtype: (str, int)
+	"""
+	labels, end, jumps = list(), None, 0
+	while True:
+		length = ord(data[offset])
+		if length & 0xc0 == 0xc0: # pointer
+			if end is None:
+				end = offset + 2
+			offset = struct.unpack('>H', data[offset:offset + 2])[0] & 0x3fff
+			jumps += 1
+			if jumps > 32:
+				raise ValueError('DNS name pointer loop')
+		elif length:
+			labels.append(data[offset + 1:offset + 1 + length])
+			offset += 1 + length
+		else:
+			return '.'.join(labels), end if end is not None else offset + 1
+
+
+# clem 18/10/2026
+def parse_response(data):
+	""" :return: the id, rcode, question name, question type and records (type, ttl, value) of a DNS response
+	:rtype: (int, int, str, int, list)
+	:raises: ValueError on malformed packets
+	"""
+	try:
+		query_id, flags, qd_count, an_count, _, _ = struct.unpack('>HHHHHH', data[:12])
+		if not flags & 0x8000 or qd_count != 1:
+			raise ValueError('not a response to a single question')
+		name, offset = _read_name(data, 12)
+		qtype = struct.unpack('>H', data[offset:offset + 2])[0]
+		offset += 4
+		records = list()
+		for _ in range(an_count):
+			_, offset = _read_name(data, offset)
+			record_type, _, ttl, length = struct.unpack('>HHIH', data[offset:offset + 10])
+			offset += 10
+			raw = data[offset:offset + length]
+			if record_type == RecordTypes.A and length == 4:
+				records.append((record_type, ttl, socket.inet_ntop(socket.AF_INET, raw)))
+			elif record_type == RecordTypes.AAAA and length == 16:
+				records.append((record_type, ttl, socket.inet_ntop(socket.AF_INET6, raw)))
+			elif record_type in (RecordTypes.CNAME, RecordTypes.NS):
+				records.append((record_type, ttl, _read_name(data, offset)[0]))
+			offset += length
+		return query_id, flags & 0xf, name, qtype, records
+	except (struct.error, IndexError) as e:
+		raise ValueError('malformed DNS response : %s' % e)
+
+
+# clem 18/10/2026
+def is_ip_address(host):
+	for family in (socket.AF_INET, socket.AF_INET6):
+		try:
+			socket.inet_pton(family, host)
+			return True
+		except (socket.error, ValueError):
+			pass
+	return False
+
+
+# clem 18/10/2026
+class Resolver(object):
+	""" Thread safe stub resolver, caching the addresses of host names for as long as their TTL allows
+
+	Queries are sent by batches over a single UDP socket, and the answers matched to them by id, question and server, so
+	that resolving many names costs a single round trip. IP addresses and the names of the hosts file are answered
+	right away, and names the servers cannot answer (no answer, single label names relying on the search domains of the
+	system, ...) are resolved by the system resolver and cached for FALLBACK_TTL seconds. Names that do not exist are
+	cached for NEGATIVE_TTL seconds, after giving the system resolver a chance if resolv.conf has search domains.
+	"""
+	DEFAULT_TIMEOUT = 2.
+	RETRIES = 2
+	FALLBACK_TTL = 60
+	NEGATIVE_TTL = 30
+	MAX_TTL = 3600
+	RESOLV_CONF = '/etc/resolv.conf'
+	HOSTS_FILE = '/etc/hosts'
+
+	timeout = DEFAULT_TIMEOUT
+	hits = 0
+	misses = 0
+	queries = 0
+	_servers = None
+	_search = None
+	_hosts = None
+	_hosts_mtime = None
+
+	def __init__(self, servers=None, timeout=DEFAULT_TIMEOUT):
+		"""
+
+		:param servers: list of 'ip' or 'ip:port' of the DNS servers, defaults to the ones of resolv.conf
+		:type servers: list | None
+		:param timeout: of a query, over all its retries, in seconds
+		:type timeout: float
+		"""
+		self.timeout = timeout
+		self._cache = dict() # host : (expiry time, list of addresses)
+		self._in_flight = dict() # host : Event set once resolved
+		self._lock = Lock()
+		if servers:
+			self.set_servers(servers)
+
+	def set_servers(self, servers):
+		""" :param servers: list of 'ip', 'ip:port' or '[ipv6]:port'
+		:type servers: list
+		"""
+		parsed = list()
+		for each in servers:
+			each = each.strip()
+			if each.startswith('[') and ']' in each: # [ipv6] or [ipv6]:port
+				host, _, port = each[1:].partition(']')
+				port = port.lstrip(':')
+			elif each.count(':') == 1:
+				host, _, port = each.partition(':')
+			else: # ip, or bare ipv6
+				host, port = each, ''
+			parsed.append((host, int(port or 53)))
+		self._servers = parsed
+
+	@property
+	def servers(self):
+		""" the DNS servers, as (ip, port) """
+		if self._servers is None:
+			servers = list()
+			try:
+				with open(self.RESOLV_CONF) as conf_file:
+					for line in conf_file:
+						fields = line.split()
+						if len(fields) >= 2 and fields[0] == 'nameserver':
+							servers.append(fields[1])
+			except IOError as e:
+				logger.warning('cannot read %s : %s' % (self.RESOLV_CONF, e))
+			self.set_servers(servers or ['127.0.0.1'])
+		return self._servers
+
+	@property
+	def search(self):
+		""" the search domains of resolv.conf, that the system resolver may append to names """
+		if self._search is None:
+			search = list()
+			try:
+				with open(self.RESOLV_CONF) as conf_file:
+					for line in conf_file:
+						fields = line.split()
+						if len(fields) >= 2 and fields[0] in ('search', 'domain'):
+							search = fields[1:] # the last one wins
+			except IOError as e:
+				logger.debug('cannot read %s : %s' % (self.RESOLV_CONF, e))
+			self._search = search
+		return self._search
+
+	def _hosts_file(self):
+		""" :return: the addresses of the names of the hosts file, reloaded when it changes
+		:rtype: dict
+		"""
+		try:
+			mtime = getmtime(self.HOSTS_FILE)
+		except OSError:
+			return dict()
+		if mtime != self._hosts_mtime:
+			hosts = dict()
+			with open(self.HOSTS_FILE) as hosts_file:
+				for line in hosts_file:
+					fields = line.split('#', 1)[0].split()
+					for name in fields[1:]:
+						hosts.setdefault(name.lower(), list()).append(fields[0])
+			self._hosts, self._hosts_mtime = hosts, mtime
+		return self._hosts
+
+	def query_many(self, questions, timeout=None):
+		""" sends all the questions at once over one UDP socket (to the next server, for the unanswered ones, after each
+		timeout / RETRIES seconds), bypassing the cache
+
+		:param questions: list of (name, record type)
+		:type questions: list
+		:type timeout: float | None
+		:return: (name, record type) : DNSAnswer
+		:rtype: dict
+		"""
+		import select
+		timeout = timeout or self.timeout
+		answers = dict((question, DNSAnswer(*question)) for question in questions)
+		ids = _random.sample(xrange(0x10000), len(answers)) if len(answers) <= 0x10000 else None
+		if not answers or not ids:
+			return answers
+		pending = dict((query_id, question) for query_id, question in zip(ids, answers)) # id : question
+		servers = self.servers
+		sockets = dict() # family : socket
+		sent = dict() # id : (server, sent time)
+
+		def family(server):
+			return socket.AF_INET6 if ':' in server[0] else socket.AF_INET
+
+		try:
+			started, attempts = time(), self.RETRIES * len(servers)
+			for attempt in range(attempts):
+				server = servers[attempt % len(servers)]
+				sock = sockets.get(family(server))
+				if not sock:
+					sock = sockets[family(server)] = socket.socket(family(server), socket.SOCK_DGRAM)
+				for query_id, (name, qtype) in pending.iteritems():
+					try:
+						sock.sendto(build_query(query_id, name, qtype), server)
+						sent[query_id] = (server, time())
+						self.queries += 1
+					except (socket.error, UnicodeError) as e:
+						logger.debug('DNS query of %s to %s : %s' % (name, server[0], e))
+				end = started + timeout * (attempt + 1) / attempts
+				while pending:
+					remaining = end - time()
+					readable = select.select(sockets.values(), [], [], remaining)[0] if remaining > 0 else None
+					if not readable:
+						break
+					for each in readable:
+						try:
+							data, address = each.recvfrom(4096)
+							query_id, rcode, name, qtype, records = parse_response(data)
+						except (socket.error, ValueError) as e:
+							logger.debug('DNS : %s' % e)
+							continue
+						question = pending.get(query_id)
+						if not question or (name.lower(), qtype) != (question[0].rstrip('.').lower(), question[1]) or \
+							address[:2] != sent[query_id][0]:
+							continue # late answer to a previous attempt, or spoofed
+						del pending[query_id]
+						answer = answers[question]
+						answer.rcode, answer.records, answer.server = rcode, records, address[0]
+						answer.elapsed = time() - sent[query_id][1]
+				if not pending:
+					break
+		finally:
+			for sock in sockets.values():
+				sock.close()
+		return answers
+
+	def _resolve_misses(self, hosts):
+		""" :return: host : (addresses, ttl) of hosts not in the cache
+		:rtype: dict
+		"""
+		results = dict()
+		answers = self.query_many([(host, RecordTypes.A) for host in hosts])
+		no_a = [host for host in hosts if answers[(host, RecordTypes.A)].rcode == DNSAnswer.NOERROR and
+			not answers[(host, RecordTypes.A)].values()]
+		if no_a: # IPv6 only hosts
+			answers.update(self.query_many([(host, RecordTypes.AAAA) for host in no_a]))
+		for host in hosts:
+			answer = answers[(host, RecordTypes.AAAA if host in no_a else RecordTypes.A)]
+			if answer.ok:
+				results[host] = (answer.values(), min(answer.ttl, self.MAX_TTL))
+			elif answer.rcode == DNSAnswer.NXDOMAIN and (host.endswith('.') or not self.search):
+				results[host] = (list(), self.NEGATIVE_TTL)
+			else: # no answer, or a name the search domains of the system may complete
+				try:
+					infos = socket.getaddrinfo(host, None, 0, socket.SOCK_STREAM)
+					results[host] = (list(set(info[4][0] for info in infos)), self.FALLBACK_TTL)
+				except socket.gaierror:
+					results[host] = (list(), self.NEGATIVE_TTL)
+		return results
+
+	def resolve_many(self, hosts):
+		""" resolves all the names at once, from the cache if their TTL did not expire
+
+		:type hosts: list
+		:return: host : list of addresses (empty if the name does not resolve)
+		:rtype: dict
+		"""
+		results, claimed, waiting = dict(), list(), dict()
+		hosts_file = self._hosts_file()
+		now = time()
+		with self._lock:
+			for host in set(hosts):
+				key = host.rstrip('.').lower()
+				cached = self._cache.get(key)
+				if is_ip_address(host):
+					results[host] = [host]
+				elif key in hosts_file:
+					results[host] = hosts_file[key]
+				elif cached and cached[0] > now:
+					self.hits += 1
+					results[host] = cached[1]
+				elif key in self._in_flight: # being resolved by another thread
+					waiting[host] = self._in_flight[key]
+				else:
+					self.misses += 1
+					self._in_flight[key] = Event()
+					claimed.append(host)
+		if claimed:
+			resolved = dict()
+			try:
+				resolved = self._resolve_misses(claimed)
+			finally:
+				with self._lock:
+					for host in claimed:
+						key = host.rstrip('.').lower()
+						addresses, ttl = resolved.get(host, (list(), 0))
+						if ttl:
+							self._cache[key] = (time() + ttl, addresses)
+						results[host] = addresses
+						self._in_flight.pop(key).set()
+		for host, event in waiting.iteritems():
+			event.wait() # set by the owner in any case, once done with all its queries and fallbacks
+			cached = self._cache.get(host.rstrip('.').lower())
+			results[host] = cached[1] if cached else list()
+		return results
+
+	def resolve(self, host):
+		""" :return: the first address of host
+		:rtype: str
+		:raises: socket.gaierror if it does not resolve
+		"""
+		addresses = self.resolve_many([host])[host]
+		if not addresses:
+			raise socket.gaierror(socket.EAI_NONAME, 'Name or service not known : %s' % host)
+		return addresses[0]
+
+	def flush(self):
+		""" empties the cache """
+		with self._lock:
+			self._cache = dict()
+
+	def __str__(self):
+		return 'resolver : %s hits, %s misses, %s queries, %s cached' % \
+			(self.hits, self.misses, self.queries, len(self._cache))
+
+
+__resolver = None
+__resolver_lock = Lock()
+
+
+# clem 18/10/2026
+def get_resolver():
+	""" :return: the shared Resolver of this process
+	:rtype: Resolver
+	"""
+	global __resolver
+	with __resolver_lock:
+		if not __resolver:
+			__resolver = Resolver()
+	return __resolver
@@ -0,0 +1,334 @@
+from threading import Thread, Lock, Condition
+from logging import getLogger
+from binascii import crc32
+from functools import partial
+from time import time
+import multiprocessing
+import signal
+from engine import RoundRunner, OverlapPolicy
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+# clem 18/10/2026
+def shard_of(key, count):
+	""" stable shard number of key in [0, count[, the same in every process and every run
+
+	:type key: str
+	:type count: int
+	:rtype: int
+	"""
+	return (crc32(str(key)) & 0xffffffff) % count
+
+
+# clem 18/10/2026
+def dependency_groups(dependencies, keys):
+	""" groups the checks linked through depends_on, so that they can be placed together
+
+	:param dependencies: check id : ids of the checks it depends on
+	:type dependencies: dict
+	:param keys: all the check ids
+	:type keys: list
+	:return: check id : the smallest id of its group (itself if it is linked to no other check)
+	:rtype: dict
+	"""
+	parents = dict()
+
+	def find(key):
+		while parents.get(key, key) != key:
+			key = parents[key]
+		return key
+
+	for key, depends_on in dependencies.iteritems():
+		for parent in depends_on:
+			first, second = find(key), find(parent)
+			if first != second:
+				parents[max(first, second)] = min(first, second)
+	return dict((key, find(key)) for key in keys)
+
+
+# clem 18/10/2026
+class ShardPool(object):
+	""" Runs the checks of an interface on count forked worker processes, to use more than one core
+
+	Each worker owns a stable partition of the checks : the ones whose group hashes to it, a group being a set of checks
+	linked through depends_on (so that a check and the ones it depends on always run in the same process). Workers
+	probe their checks with their own CheckEngine, and stream the new statuses back over a pipe, in chunks of
+	RESULTS_CHUNK. The statuses are then set on the checks of the coordinator process, which alone prints them, saves
+	them to the state file and reports them to the status page service (set_check is never called by a worker).
+
+	Each worker has a single round in flight at a time, sent by its own RoundRunner, which applies the OverlapPolicy to
+	the rounds submitted while the worker is busy. A worker that died is not restarted, its checks being given back by
+	submit() to be run by the coordinator (or run by its RoundRunner, for the rounds it already held).
+	"""
+	RESULTS_CHUNK = 256
+
+	count = 0
+	policy = OverlapPolicy.QUEUE
+	_closing = False
+
+	def __init__(self, interface, count=None, policy=OverlapPolicy.QUEUE, merge=None, remaining=None):
+		"""
+
+		:type interface: ServiceInterfaceAbstract
+		:param count: number of worker processes, defaults to the number of CPUs
+		:type count: int | None
+		:param policy: what to do with the part of a round that goes to a busy worker
+		:type policy: str
+		:param merge: see RoundRunner, the arguments being (keys, )
+		:type merge: callable | None
+		:param remaining: see RoundRunner, the arguments being (keys, )
+		:type remaining: callable | None
+		"""
+		self._interface = interface
+		self.count = count or multiprocessing.cpu_count()
+		self.policy = policy
+		self._merge = merge
+		self._remaining = remaining
+		self._workers = list() # of (Process, Connection), by shard number
+		self._alive = list()
+		self._send_locks = list()
+		self._runners = list() # RoundRunner sending the rounds of each worker
+		self._groups = None # check id : group id
+		self._queued = list() # rounds given to the RoundRunner of each worker and not done yet
+		self._last_done = list() # id of the last round done by each worker
+		self._cond = Condition(Lock())
+		self._round = 0
+
+	def start(self):
+		""" forks the workers, to be called before the coordinator starts any thread """
+		for check_instance in self._interface.checks_dict.itervalues(): # built once, shared by the workers copy-on-write
+			check_instance.checker # and so is the checker registry
+			break
+		for number in range(self.count):
+			conn, worker_conn = multiprocessing.Pipe()
+			process = multiprocessing.Process(target=self._worker_main, args=(number, worker_conn, conn),
+				name='shard-%s' % number)
+			process.daemon = True
+			process.start()
+			worker_conn.close()
+			self._workers.append((process, conn))
+			self._alive.append(True)
+			self._queued.append(0)
+			self._last_done.append(0)
+			self._send_locks.append(Lock())
+			self._runners.append(RoundRunner(partial(self._run_round, number), self.policy, self._merge,
+				self._remaining))
+		for number, (_, conn) in enumerate(self._workers):
+			reader = Thread(target=self._read, args=(number, conn), name='shard-reader-%s' % number)
+			reader.daemon = True
+			reader.start()
+
+	@property
+	def groups(self):
+		""" check id : the smallest id of the checks it is linked to through depends_on (itself if none)
+		:rtype: dict
+		"""
+		if self._groups is None:
+			self._groups = dependency_groups(self._interface.dependencies, self._interface.checks_dict.keys())
+		return self._groups
+
+	def shard_of(self, key):
+		""" :return: the number of the worker owning the check key
+		:rtype: int
+		"""
+		return shard_of(self.groups.get(key, key), self.count)
+
+	def _send(self, number, message):
+		""" :return: whether message was sent to worker number """
+		if not self._alive[number]:
+			return False
+		try:
+			with self._send_locks[number]:
+				self._workers[number][1].send(message)
+			return True
+		except (IOError, OSError, EOFError) as e:
+			logger.error('worker %s is gone : %s' % (number, e))
+			self._alive[number] = False
+			return False
+
+	def submit(self, keys):
+		""" gives the checks keys to the RoundRunners of the workers owning them, to be run as a round
+
+		:type keys: list
+		:return: the keys of the workers that are gone, to be run by the caller
+		:rtype: list
+		"""
+		shards = dict()
+		for key in keys:
+			shards.setdefault(self.shard_of(key), list()).append(key)
+		orphans = list()
+		for number, shard_keys in shards.iteritems():
+			if not self._alive[number]:
+				orphans.extend(shard_keys)
+				continue
+			with self._cond:
+				self._queued[number] += 1
+			if not self._runners[number].submit(shard_keys): # skipped or merged with its pending round
+				self._done(number)
+		return orphans
+
+	def _run_round(self, number, keys):
+		""" sends a round to worker number and waits until it is done, running it here if the worker is gone """
+		try:
+			with self._cond:
+				self._round += 1
+				round_id = self._round
+			if not self._send(number, ('round', round_id, keys)):
+				self._interface.update_all(None, keys)
+				return
+			with self._cond:
+				while self._last_done[number] < round_id and self._alive[number]:
+					self._cond.wait()
+		finally:
+			self._done(number)
+
+	@property
+	def skipped_rounds(self):
+		""" number of the parts of rounds dropped, for a busy worker """
+		return sum(runner.skipped_rounds for runner in self._runners)
+
+	@property
+	def coalesced_rounds(self):
+		""" number of the parts of rounds merged into the pending round of a busy worker """
+		return sum(runner.coalesced_rounds for runner in self._runners)
+
+	def reload(self):
+		""" makes the workers reload the config file, after the coordinator did """
+		self._groups = None
+		for number in range(self.count):
+			self._send(number, ('reload', ))
+
+	def _done(self, number, count=1):
+		with self._cond:
+			self._queued[number] -= count
+			self._cond.notify_all()
+
+	@property
+	def pending(self):
+		""" number of rounds of the workers still running or pending """
+		return sum(self._queued)
+
+	def join(self, timeout=None):
+		""" waits until the workers are done with all the rounds sent to them, or up to timeout seconds
+
+		:type timeout: float | None
+		:return: whether they are
+		:rtype: bool
+		"""
+		end = time() + timeout if timeout is not None else None
+		with self._cond:
+			while self.pending > 0:
+				remaining = end - time() if end is not None else None
+				if remaining is not None and remaining <= 0:
+					return False
+				self._cond.wait(remaining)
+			return True
+
+	def close(self, timeout=None):
+		""" waits up to timeout seconds for the running rounds, then stops the workers """
+		self.join(timeout)
+		self._closing = True
+		for number in range(self.count):
+			self._send(number, ('stop', ))
+		for process, conn in self._workers:
+			process.join(1.)
+			if process.is_alive():
+				process.terminate()
+			conn.close()
+
+	####################
+	# COORDINATOR SIDE #
+	####################
+
+	def _read(self, number, conn):
+		""" applies the results streamed by worker number, until it exits """
+		while True:
+			try:
+				message = conn.recv()
+			except (EOFError, IOError, OSError):
+				break
+			if message[0] == 'results':
+				self._apply(message[1])
+			elif message[0] == 'done':
+				print 'worker %s : %s' % (number, message[2])
+				with self._cond:
+					self._last_done[number] = message[1]
+					self._cond.notify_all()
+		if self._alive[number] and not self._closing:
+			logger.error('worker %s exited' % number)
+		with self._cond: # the round it had is lost
+			self._alive[number] = False
+			self._cond.notify_all()
+
+	def _apply(self, results):
+		""" sets the statuses a worker found on the checks of this process, and reports them """
+		checks = self._interface.checks_dict
+		for check_id, status, latency, details in results:
+			check_instance = checks.get(check_id)
+			if check_instance is None: # removed by a reload meanwhile
+				continue
+			old_status = check_instance.last_status
+			self._interface.report_check(check_instance, old_status, check_instance.set_result(status, latency, details),
+				True)
+
+	###############
+	# WORKER SIDE #
+	###############
+
+	def _worker_main(self, number, conn, coordinator_conn):
+		""" the main loop of worker number, in the forked process """
+		signal.signal(signal.SIGINT, signal.SIG_IGN) # the coordinator stops the workers
+		coordinator_conn.close() # so that the worker sees the coordinator exit
+		for _, other in self._workers:
+			other.close()
+		interface = self._interface
+		interface._engine = None # the threads of the coordinator engine do not exist in this process
+		interface.status_table.board = None # only the coordinator publishes the statuses
+		buffer, lock = list(), Lock()
+
+		def flush():
+			if buffer:
+				conn.send(('results', list(buffer)))
+				del buffer[:]
+
+		def report(check_instance, _, new_status):
+			details = check_instance.last_probe
+			with lock:
+				buffer.append((check_instance.id, new_status, check_instance.last_latency,
+					str(details) if details is not None else None))
+				if len(buffer) >= self.RESULTS_CHUNK:
+					flush()
+
+		while True:
+			try:
+				message = conn.recv()
+			except (EOFError, IOError, KeyboardInterrupt):
+				break
+			if message[0] == 'round':
+				_, round_id, keys = message
+				checks = interface.checks_dict
+				for key in keys:
+					if key in checks:
+						checks[key].detach_state()
+				try:
+					stats = interface.check_all(False, True, keys=keys, report=report)
+				except Exception as e:
+					logger.exception('worker %s round %s failed : %s' % (number, round_id, e))
+					stats = 'failed : %s' % e
+				with lock:
+					flush()
+					conn.send(('done', round_id, str(stats)))
+			elif message[0] == 'reload':
+				interface.reload_config()
+			elif message[0] == 'stop':
+				break
+		conn.close()
@@ -0,0 +1,233 @@
+from threading import Lock
+from logging import getLogger
+from os.path import isfile
+from hashlib import sha1
+from array import array
+from time import time
+import struct
+import mmap
+import os
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+# clem 18/10/2026
+class StateFile(object):
+	""" Compact memory-mapped file of the last known status, status change time and latency of each check
+
+	The file is a header (magic, number of records) followed by fixed size records (check key, status, last change
+	time, latency), updated in place on each write. It is only mapped, and its index of check keys built, on first
+	access, so that loading it costs nothing until a check actually needs its last status.
+	"""
+	MAGIC = 'IMS1'
+	KEY_SIZE = 64
+	GROWTH = 1024 # records
+	_HEADER = struct.Struct('<4sI') # magic, count
+	_RECORD = struct.Struct('<%ssbdf' % KEY_SIZE) # key, status (-1 unknown, 0 offline, 1 online), change time, latency
+	_STATUS = {None: -1, False: 0, True: 1}
+	_STATUS_REVERSE = {-1: None, 0: False, 1: True}
+
+	path = ''
+	_file = None
+	_map = None
+	_index = None # key : record number
+	_count = 0
+	_capacity = 0
+
+	def __init__(self, path):
+		"""
+
+		:param path: path of the state file, created if it does not exist
+		:type path: str
+		"""
+		self.path = path
+		self._lock = Lock()
+
+	@classmethod
+	def _key(cls, check_id):
+		""" check ids that do not fit in a record are replaced by their hash """
+		key = str(check_id)
+		return key if len(key) <= cls.KEY_SIZE else sha1(key).hexdigest()
+
+	def _offset(self, number):
+		return self._HEADER.size + number * self._RECORD.size
+
+	def _map_file(self, capacity):
+		""" (re)maps the file, grown to hold capacity records (to call locked) """
+		if self._map:
+			self._map.close()
+		size = self._offset(capacity)
+		if os.fstat(self._file.fileno()).st_size < size:
+			self._file.truncate(size)
+		self._map = mmap.mmap(self._file.fileno(), size)
+		self._capacity = capacity
+
+	def _open(self):
+		""" maps the file and indexes its records (to call locked) """
+		if self._index is not None:
+			return
+		self._file = open(self.path, 'r+b' if isfile(self.path) else 'w+b')
+		size = os.fstat(self._file.fileno()).st_size
+		count = 0
+		if size >= self._HEADER.size:
+			magic, count = self._HEADER.unpack(self._file.read(self._HEADER.size))
+			if magic != self.MAGIC or self._offset(count) > size:
+				logger.warning('StateFile : %s is invalid, resetting it' % self.path)
+				count = 0
+		self._map_file(max(count, self.GROWTH))
+		self._map[:self._HEADER.size] = self._HEADER.pack(self.MAGIC, count)
+		self._count = count
+		self._index = dict()
+		for number in range(count):
+			key = self._RECORD.unpack_from(self._map, self._offset(number))[0].rstrip('\0')
+			self._index[key] = number
+
+	def get(self, check_id):
+		""" :return: the last known (status, last change time, latency) of check_id, None if never saved
+		:rtype: (bool | None, float | None, float | None) | None
+		"""
+		key = self._key(check_id)
+		with self._lock:
+			self._open()
+			if key not in self._index:
+				return None
+			_, status, changed, latency = self._RECORD.unpack_from(self._map, self._offset(self._index[key]))
+		return self._STATUS_REVERSE.get(status), changed or None, latency if latency >= 0 else None
+
+	def set(self, check_id, status, latency=None):
+		""" saves the status of check_id, updating its last change time if it differs from the saved one
+
+		:type check_id: str
+		:type status: bool | None
+		:param latency: duration of the check in seconds
+		:type latency: float | None
+		"""
+		key = self._key(check_id)
+		encoded = self._STATUS.get(status, -1)
+		with self._lock:
+			self._open()
+			number = self._index.get(key)
+			changed = time()
+			if number is None:
+				if self._count >= self._capacity:
+					self._map_file(self._capacity + self.GROWTH)
+				number = self._index[key] = self._count
+				self._count += 1
+				self._HEADER.pack_into(self._map, 0, self.MAGIC, self._count)
+			else:
+				_, old_status, old_changed, _ = self._RECORD.unpack_from(self._map, self._offset(number))
+				if old_status == encoded:
+					changed = old_changed
+			self._RECORD.pack_into(self._map, self._offset(number), key, encoded, changed,
+				latency if latency is not None else -1.)
+
+	def flush(self):
+		""" writes the changes to disk """
+		with self._lock:
+			if self._map:
+				self._map.flush()
+
+	def close(self):
+		with self._lock:
+			if self._map:
+				self._map.flush()
+				self._map.close()
+				self._file.close()
+			self._map, self._file, self._index = None, None, None
+
+	def __len__(self):
+		with self._lock:
+			self._open()
+			return self._count
+
+
+# clem 18/10/2026
+class StatusTable(object):
+	""" The last status, status change time and latency of many checks, by check number, in flat arrays (a byte and two
+	doubles per check) instead of attributes of each check
+
+	Rows are added once per check, and start unloaded until set (i.e. restored from a StateFile). The rows freed by
+	removed checks are given to the next added ones. Checks also share a fixed set of LOCK_STRIPES locks, picked by
+	check number, instead of having a lock each.
+	"""
+	board = None # the StatusBoard the checks publish their statuses to, if any
+	UNLOADED = -2
+	LOCK_STRIPES = 64
+	_STATUS = {None: -1, False: 0, True: 1}
+	_STATUS_REVERSE = {-1: None, 0: False, 1: True}
+	_NAN = float('nan')
+	_locks = [Lock() for _ in range(LOCK_STRIPES)]
+
+	def __init__(self):
+		self._status = array('b')
+		self._change = array('d')
+		self._latency = array('d')
+		self._free = list()
+		self._stripe = id(self) >> 4 # so that tables do not all start on the same lock
+		self._lock = Lock()
+
+	def add(self):
+		""" :return: the number of a new unloaded row
+		:rtype: int
+		"""
+		with self._lock:
+			if self._free:
+				number = self._free.pop()
+				self._status[number], self._change[number], self._latency[number] = self.UNLOADED, self._NAN, self._NAN
+				return number
+			self._status.append(self.UNLOADED)
+			self._change.append(self._NAN)
+			self._latency.append(self._NAN)
+			return len(self._status) - 1
+
+	def free(self, numbers):
+		""" gives rows back, to be reused by the next added ones
+
+		:type numbers: list[int]
+		"""
+		with self._lock:
+			self._free.extend(numbers)
+
+	def lock(self, number):
+		""" :return: the lock of row number (shared with other rows)
+		:rtype: Lock
+		"""
+		return self._locks[(self._stripe + number) % self.LOCK_STRIPES]
+
+	def loaded(self, number):
+		return self._status[number] != self.UNLOADED
+
+	def get(self, number):
+		""" :return: the (status, last change time, latency) of row number, all None if unknown or unloaded
+		:rtype: (bool | None, float | None, float | None)
+		"""
+		change, latency = self._change[number], self._latency[number]
+		return self._STATUS_REVERSE.get(self._status[number]), change if change == change else None, \
+			latency if latency == latency else None
+
+	def set(self, number, status, change=None, latency=None):
+		""" :type number: int
+		:type status: bool | None
+		:type change: float | None
+		:type latency: float | None
+		"""
+		self._status[number] = self._STATUS.get(status, -1)
+		self._change[number] = change if change is not None else self._NAN
+		self._latency[number] = latency if latency is not None else self._NAN
+
+	@property
+	def nbytes(self):
+		""" size of the arrays, in bytes """
+		return sum(each.itemsize * len(each) for each in (self._status, self._change, self._latency))
+
+	def __len__(self):
+		""" number of rows in use """
+		return len(self._status) - len(self._free)
@@ -0,0 +1,185 @@
+from logging import getLogger
+from itertools import product
+import socket
+import struct
+import re
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+# clem 18/10/2026
+class TemplateError(ValueError):
+	""" a check template cannot be expanded """
+	pass
+
+
+_NUMBER_RANGE = re.compile(r'^(\d+)-(\d+)$')
+_NAME_RANGE = re.compile(r'^(.*)\[(\d+)-(\d+)\](.*)$')
+
+
+def _ip_to_int(address):
+	""" :return: the family and the integer value of an IP address, (None, None) if it is not one """
+	for family in (socket.AF_INET, socket.AF_INET6):
+		try:
+			packed = socket.inet_pton(family, address)
+		except (socket.error, ValueError):
+			continue
+		value = 0
+		for byte in packed:
+			value = (value << 8) | ord(byte)
+		return family, value
+	return None, None
+
+
+def _int_to_ip(family, value):
+	if family == socket.AF_INET:
+		return socket.inet_ntop(family, struct.pack('!I', value))
+	return socket.inet_ntop(family, struct.pack('!QQ', value >> 64, value & 0xffffffffffffffff))
+
+
+# clem 18/10/2026
+def expand_values(spec, max_count):
+	""" expands the values of a template variable, space or comma separated, each being a literal, a range of numbers
+	(1-500), of IP addresses (10.0.0.1-10.0.0.50), a CIDR block (10.0.0.0/24, without its network and broadcast
+	addresses if larger than a /31), or a name with a range of numbers (node[001-500].example.com, zero padding kept).
+	Tokens with a / are only CIDR blocks if what precedes it is an IP address, so that paths and urls stay literals
+
+	:type spec: str
+	:param max_count: maximum number of values
+	:type max_count: int
+	:rtype: list[str]
+	:raises: TemplateError
+	"""
+	values = list()
+	for token in spec.replace(',', ' ').split():
+		number_range, name_range = _NUMBER_RANGE.match(token), _NAME_RANGE.match(token)
+		if number_range:
+			first, last = int(number_range.group(1)), int(number_range.group(2))
+			new = (str(each) for each in xrange(first, last + 1))
+			count = last - first + 1
+		elif name_range:
+			prefix, first, last, suffix = name_range.groups()
+			width = len(first) if first.startswith('0') else 0
+			new = ('%s%0*d%s' % (prefix, width, each, suffix) for each in xrange(int(first), int(last) + 1))
+			count = int(last) - int(first) + 1
+		elif '/' in token and _ip_to_int(token.partition('/')[0])[0]: # not a path or a url
+			address, _, length = token.partition('/')
+			family, network = _ip_to_int(address)
+			size = 32 if family == socket.AF_INET else 128
+			if not length.isdigit() or int(length) > size:
+				raise TemplateError('invalid CIDR block "%s"' % token)
+			host_bits = size - int(length)
+			network &= ~((1 << host_bits) - 1)
+			first, last = network, network + (1 << host_bits) - 1
+			if family == socket.AF_INET and host_bits > 1: # no network nor broadcast address
+				first, last = first + 1, last - 1
+			count = last - first + 1
+			new = (_int_to_ip(family, each) for each in _long_range(first, last))
+		elif '-' in token and _ip_to_int(token.split('-', 1)[0])[0]:
+			start, _, end = token.partition('-')
+			family, first = _ip_to_int(start)
+			end_family, last = _ip_to_int(end)
+			if end_family != family or last < first:
+				raise TemplateError('invalid address range "%s"' % token)
+			count = last - first + 1
+			new = (_int_to_ip(family, each) for each in _long_range(first, last))
+		else:
+			new, count = [token], 1
+		if count < 1:
+			raise TemplateError('invalid range "%s"' % token)
+		if len(values) + count > max_count:
+			raise TemplateError('"%s" gives more than %s values' % (spec, max_count))
+		values.extend(new)
+	return values
+
+
+def _long_range(first, last):
+	""" xrange of numbers that may not fit in a C long (i.e. IPv6 addresses) """
+	value = first
+	while value <= last:
+		yield value
+		value += 1
+
+
+# clem 18/10/2026
+class CheckTemplate(object):
+	""" A template section, standing for many checks : each for_<variable> item gives the values of a variable, and the
+	other items are the items of the checks, where {variable} is replaced by its value. The checks are made for every
+	combination of the values of the variables, and only when expanded.
+
+	Each check gets a stable id : the optional id item (i.e. "web-{host}-{port}"), or the template id followed by the
+	values of its variables (i.e. "web-10.0.0.1-80"), so that it does not change when values are added or removed.
+	"""
+	VARIABLE_PREFIX = 'for_'
+	KEY_ID = 'id'
+	MAX_CHECKS = 1000000
+
+	template_id = ''
+
+	def __init__(self, template_id, items, max_checks=MAX_CHECKS):
+		"""
+
+		:param template_id: the id of the template section, without its prefix
+		:type template_id: str
+		:param items: the items of the template section
+		:type items: list
+		:param max_checks: maximum number of checks the template may expand to
+		:type max_checks: int
+		:raises: TemplateError
+		"""
+		self.template_id = template_id
+		self.id_format = ''
+		self.variables = list() # of (name, values)
+		self.items = list() # of (option, value) of the checks, with {variable} placeholders
+		count = 1
+		for key, value in items:
+			if key.startswith(self.VARIABLE_PREFIX):
+				values = expand_values(value, max_checks)
+				if not values:
+					raise TemplateError('template %s : no value for %s' % (template_id, key))
+				count *= len(values)
+				if count > max_checks:
+					raise TemplateError('template %s expands to more than %s checks' % (template_id, max_checks))
+				self.variables.append((key[len(self.VARIABLE_PREFIX):], values))
+			elif key == self.KEY_ID:
+				self.id_format = value
+			else:
+				self.items.append((key, value))
+		self.variables.sort()
+
+	def __len__(self):
+		""" the number of checks of the template, without expanding it """
+		count = 1
+		for _, values in self.variables:
+			count *= len(values)
+		return count
+
+	@staticmethod
+	def _fill(text, names, values):
+		for name, value in zip(names, values):
+			text = text.replace('{%s}' % name, value)
+		return text
+
+	def expand(self):
+		""" generates the checks of the template, one at a time
+
+		:return: generator of (check id, list of (option, value))
+		:rtype: generator
+		"""
+		names = [name for name, _ in self.variables]
+		templated = [(key, value) for key, value in self.items if '{' in value]
+		constant = [(key, value) for key, value in self.items if '{' not in value]
+		for values in product(*[each for _, each in self.variables]):
+			if self.id_format:
+				check_id = self._fill(self.id_format, names, values)
+			else:
+				check_id = '-'.join((self.template_id, ) + values)
+			yield check_id, constant + [(key, self._fill(value, names, values)) for key, value in templated]
@@ -0,0 +1,88 @@
+from os.path import dirname, abspath
+import unittest
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from adaptive import LatencyTracker, CircuitBreaker
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+# clem 18/10/2026
+class LatencyTrackerTest(unittest.TestCase):
+	def test_cap_until_enough_samples(self):
+		tracker = LatencyTracker()
+		for _ in range(LatencyTracker.MIN_SAMPLES - 1):
+			tracker.record(True, .1)
+		self.assertEqual(tracker.timeout(5.), 5.)
+		tracker.record(True, .1)
+		self.assertAlmostEqual(tracker.timeout(5., 99., .25), .1 * LatencyTracker.FACTOR + .25)
+
+	def test_percentile_and_cap(self):
+		tracker = LatencyTracker()
+		for each in range(1, 101):
+			tracker.record(True, each / 100.)
+		self.assertEqual(tracker.percentile(50), .5)
+		self.assertEqual(tracker.percentile(99), .99)
+		self.assertEqual(tracker.timeout(1.), 1.) # .99 * 2 + .25 capped
+		self.assertIsNone(LatencyTracker().percentile(99))
+
+	def test_failure_uses_the_cap(self):
+		tracker = LatencyTracker(window=20)
+		for _ in range(20):
+			tracker.record(True, .01)
+		tracker.record(False)
+		self.assertEqual(tracker.timeout(3.), 3.)
+		self.assertEqual(len(tracker), 20) # failures are not samples
+		tracker.record(True, .01)
+		self.assertTrue(tracker.timeout(3.) < 1.)
+
+	def test_empty_tracker_is_falsy(self): # so that its owners test it against None
+		self.assertEqual(len(LatencyTracker()), 0)
+
+
+# clem 18/10/2026
+class CircuitBreakerTest(unittest.TestCase):
+	INTERVAL = 30.
+
+	def test_open_half_open_close(self):
+		breaker = CircuitBreaker('test', self.INTERVAL, threshold=3, max_spacing=100.)
+		start = 1000.
+		for round_number in range(3): # rounds on the grid, each probe failing .2 sec after the round started
+			now = start + round_number * self.INTERVAL
+			self.assertTrue(breaker.allow(now))
+			breaker.record(False, now + .2)
+		self.assertTrue(breaker.is_open)
+		# half-open : the round due one interval later is allowed, though it starts before retry_at
+		next_round = start + 3 * self.INTERVAL
+		self.assertFalse(breaker.allow(next_round - self.INTERVAL / 2))
+		self.assertTrue(next_round < breaker.retry_at)
+		self.assertTrue(breaker.allow(next_round))
+		breaker.record(False, next_round + .2) # still down : twice the spacing
+		self.assertFalse(breaker.allow(next_round + self.INTERVAL))
+		self.assertTrue(breaker.allow(next_round + 2 * self.INTERVAL))
+		breaker.record(False, next_round + 2 * self.INTERVAL)
+		self.assertAlmostEqual(breaker.retry_at - (next_round + 2 * self.INTERVAL), 100.) # max_spacing
+		breaker.record(True) # closed
+		self.assertFalse(breaker.is_open)
+		self.assertEqual((breaker.failures, breaker.opened), (0, 0))
+		self.assertTrue(breaker.allow(0.1))
+
+	def test_short_intervals(self):
+		breaker = CircuitBreaker('test', .5, threshold=1)
+		breaker.record(False, 10.)
+		self.assertFalse(breaker.allow(10.2)) # the tolerance never exceeds half the spacing
+		self.assertTrue(breaker.allow(10.25))
+
+	def test_never_opens(self):
+		breaker = CircuitBreaker('test', self.INTERVAL, threshold=0)
+		for _ in range(10):
+			breaker.record(False, 0.)
+		self.assertFalse(breaker.is_open)
+		self.assertTrue(breaker.allow(0.))
+
+
+if __name__ == '__main__':
+	unittest.main()
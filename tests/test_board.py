@@ -0,0 +1,102 @@
+from os.path import dirname, abspath, join
+from multiprocessing import Process, Event as ProcessEvent
+from threading import Thread, Event
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import time
+import unittest
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from board import StatusBoard, BoardReader
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+DURATION = 2. # seconds of each torture test
+KEYS = 300
+
+
+def write(path, stop, ready):
+	""" publishes records whose fields all derive from a single counter, adding checks (so growing and moving the file)
+	until stop is set """
+	board = StatusBoard(path, 16)
+	board.publish('check0', 'name0', True, 0., 0.)
+	ready.set()
+	counter = 0
+	while not stop.is_set():
+		counter += 1
+		key = counter % min(KEYS, 1 + counter // 50)
+		board.publish('check%s' % key, 'name%s' % (counter % 7), counter % 2 == 0, float(counter), counter / 1000.)
+	board.close()
+
+
+# clem 18/10/2026
+class BoardTortureTest(unittest.TestCase):
+	""" a writer publishes as fast as it can while a reader snapshots the board : every record read is consistent """
+	def setUp(self):
+		self.dir = mkdtemp()
+		self.path = join(self.dir, 'status.board')
+
+	def tearDown(self):
+		rmtree(self.dir)
+
+	def assertNotTorn(self, entry):
+		if entry.change: # published by the loop
+			counter = int(entry.change)
+			self.assertEqual((entry.name, entry.status, entry.latency), ('name%s' % (counter % 7), counter % 2 == 0,
+				counter / 1000.), 'torn record %s' % (entry, ))
+
+	def torture(self, start):
+		""" :param start: function starting write(path, stop, ready) concurrently, returning a join function """
+		stop, ready = self.events()
+		join_writer = start(stop, ready)
+		try:
+			self.assertTrue(ready.wait(5) or ready.is_set())
+			reader = BoardReader(self.path)
+			reads, changes, seen, end = 0, 0, dict(), time() + DURATION
+			while time() < end:
+				for entry in reader.snapshot():
+					self.assertNotTorn(entry)
+					changes += seen.get(entry.id) != entry.change
+					seen[entry.id] = entry.change
+					reads += 1
+				entry = reader.get('check0')
+				self.assertNotTorn(entry)
+		finally:
+			stop.set()
+			join_writer()
+		self.assertEqual(len(reader), KEYS) # it followed the file as it grew
+		self.assertEqual(reader.get('check%s' % (KEYS - 1)).id, 'check%s' % (KEYS - 1))
+		self.assertTrue(changes > 100, '%s changes seen in %s reads' % (changes, reads))
+		reader.close()
+
+	def test_writer_process(self):
+		self.events = lambda: (ProcessEvent(), ProcessEvent())
+
+		def start(stop, ready):
+			process = Process(target=write, args=(self.path, stop, ready))
+			process.daemon = True
+			process.start()
+			return lambda: process.join(5)
+		self.torture(start)
+
+	def test_writer_thread(self):
+		self.events = lambda: (Event(), Event())
+		interval = sys.getcheckinterval()
+		sys.setcheckinterval(1) # switches threads as often as possible
+
+		def start(stop, ready):
+			thread = Thread(target=write, args=(self.path, stop, ready))
+			thread.daemon = True
+			thread.start()
+			return lambda: thread.join(5)
+		try:
+			self.torture(start)
+		finally:
+			sys.setcheckinterval(interval)
+
+
+if __name__ == '__main__':
+	unittest.main()
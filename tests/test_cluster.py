@@ -0,0 +1,270 @@
+from os.path import dirname, abspath
+from threading import Thread, Lock
+from random import Random
+from time import time, sleep
+import unittest
+import socket
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from cluster import ClusterNode, HashRing
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+HEARTBEAT = .1 # seconds
+TIMEOUT = .5
+
+
+def free_udp_port():
+	sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+	sock.bind(('127.0.0.1', 0))
+	port = sock.getsockname()[1]
+	sock.close()
+	return port
+
+
+def wait_for(condition, timeout=5.):
+	""" :return: whether condition() became true within timeout seconds """
+	end = time() + timeout
+	while time() < end:
+		if condition():
+			return True
+		sleep(.02)
+	return condition()
+
+
+# clem 18/10/2026
+class FakeCheck(object):
+	""" the part of CheckObject a ClusterNode uses """
+	last_status = None
+	last_change = None
+	last_latency = None
+	last_probe = None
+
+	def __init__(self, check_id):
+		self.id = check_id
+
+	def set_result(self, status, latency=None, details=None):
+		if status != self.last_status:
+			self.last_change = time()
+		self.last_status, self.last_latency, self.last_probe = status, latency, details
+		return status
+
+
+# clem 18/10/2026
+class FakeUpdateQueue(object):
+	def __init__(self):
+		self.updates = list()
+
+	def put(self, check_instance, old_status, new_status):
+		self.updates.append((check_instance.id, new_status))
+
+
+# clem 18/10/2026
+class FakeInterface(object):
+	""" the part of ServiceInterfaceAbstract a ClusterNode uses : check_all sets every check to the status of the
+	shared truth dict, and report_check records the updates """
+	def __init__(self, keys, truth, dependencies=None):
+		self.checks_dict = dict((key, FakeCheck(key)) for key in keys)
+		self.dependencies = dependencies or dict()
+		self.truth = truth
+		self.update_queue = FakeUpdateQueue()
+		self.reported = list() # (check id, status) sent to the status page
+		self.probed = list()
+		self._lock = Lock()
+
+	def check_all(self, update=False, threading=True, deadline=None, keys=None, report=None):
+		for key in keys:
+			check_instance = self.checks_dict[key]
+			old_status = check_instance.last_status
+			with self._lock:
+				self.probed.append(key)
+			report(check_instance, old_status, check_instance.set_result(self.truth[key], .001))
+		return None
+
+	def report_check(self, check_instance, old_status, new_status, update=False):
+		if update:
+			with self._lock:
+				self.reported.append((check_instance.id, new_status))
+
+
+# clem 18/10/2026
+class ClusterTest(unittest.TestCase):
+	""" three nodes on this host, crashes being simulated by closing the socket of a node without saying bye """
+	CHECKS = 300
+
+	def setUp(self):
+		self.keys = ['check%03d' % number for number in range(self.CHECKS)]
+		self.truth = dict((key, number % 3 != 0) for number, key in enumerate(self.keys))
+		dependencies = dict(('check%03d' % number, ['check%03d' % (number - 1)]) for number in range(1, 30))
+		self.addresses = sorted('127.0.0.1:%s' % free_udp_port() for _ in range(3))
+		self.nodes = list()
+		for address in self.addresses:
+			node = ClusterNode(FakeInterface(self.keys, self.truth, dependencies), address, self.addresses, HEARTBEAT,
+				TIMEOUT, 'secret')
+			node.start()
+			self.nodes.append(node)
+
+	def tearDown(self):
+		for node in self.nodes:
+			node.close()
+
+	@staticmethod
+	def crash(node):
+		node._stop.set()
+		for thread in node._threads:
+			thread.join()
+		node._socket.close()
+
+	def run_rounds(self, nodes):
+		for node in nodes:
+			node.run_round(node.owned(self.keys))
+
+	def assertPartition(self, nodes):
+		owned = [set(node.owned(self.keys)) for node in nodes]
+		self.assertEqual(sum(len(each) for each in owned), len(self.keys)) # disjoint
+		self.assertEqual(set.union(*owned), set(self.keys)) # and complete
+
+	def test_hash_ring(self):
+		ring = HashRing(self.addresses)
+		shares = [sum(1 for key in self.keys if ring.node_of(key) == node) for node in self.addresses]
+		self.assertTrue(min(shares) > len(self.keys) / 10)
+		smaller = HashRing(self.addresses[1:])
+		moved = [key for key in self.keys if ring.node_of(key) != smaller.node_of(key)]
+		self.assertEqual(set(ring.node_of(key) for key in moved), set(self.addresses[:1])) # only the ones of the node gone
+
+	def test_partition_and_single_writer(self):
+		self.assertTrue(wait_for(lambda: all(len(node.live_nodes) == 3 for node in self.nodes)))
+		self.assertPartition(self.nodes)
+		self.assertEqual([node.is_writer for node in self.nodes], [True, False, False])
+		for node in self.nodes: # dependency groups stay on a single node
+			owned = set(node.owned(self.keys))
+			self.assertTrue(len(owned & set(self.keys[:30])) in (0, 30))
+		self.run_rounds(self.nodes)
+		for node in self.nodes: # every node knows every status
+			self.assertTrue(wait_for(lambda: all(check.last_status == self.truth[key] for key, check in
+				node._interface.checks_dict.iteritems())))
+		self.assertEqual(sorted(self.nodes[0]._interface.reported), sorted(self.truth.items()))
+		self.assertEqual(self.nodes[1]._interface.reported + self.nodes[2]._interface.reported, [])
+		self.assertEqual(sorted(sum((node._interface.probed for node in self.nodes), [])), sorted(self.keys))
+
+	def test_writer_failover(self):
+		self.assertTrue(wait_for(lambda: all(len(node.live_nodes) == 3 for node in self.nodes)))
+		self.run_rounds(self.nodes)
+		self.crash(self.nodes[0])
+		survivors = self.nodes[1:]
+		started = time()
+		self.assertTrue(wait_for(lambda: all(node.live_nodes == self.addresses[1:] for node in survivors)))
+		self.assertTrue(time() - started < TIMEOUT + 4 * HEARTBEAT)
+		self.assertTrue(survivors[0].is_writer)
+		self.assertPartition(survivors)
+		# the new writer reports again the recent changes the former one may not have sent
+		self.assertEqual(len(survivors[0]._interface.update_queue.updates), len(self.keys))
+		for key in self.keys[:10]:
+			self.truth[key] = not self.truth[key]
+		self.run_rounds(survivors)
+		self.assertTrue(wait_for(lambda: all(survivors[1]._interface.checks_dict[key].last_status == self.truth[key]
+			for key in self.keys)))
+		self.assertEqual(survivors[1]._interface.reported, [])
+
+	def test_bye(self):
+		self.assertTrue(wait_for(lambda: all(len(node.live_nodes) == 3 for node in self.nodes)))
+		self.nodes[2].close()
+		started = time()
+		self.assertTrue(wait_for(lambda: all(len(node.live_nodes) == 2 for node in self.nodes[:2]), TIMEOUT / 2))
+		self.assertTrue(time() - started < TIMEOUT / 2)
+		self.assertPartition(self.nodes[:2])
+
+	def test_rejects_unsigned(self):
+		intruder = ClusterNode(FakeInterface(self.keys, self.truth), self.addresses[2], self.addresses, HEARTBEAT,
+			TIMEOUT, 'wrong')
+		intruder._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		intruder._send_results([('check001', False, None, None)])
+		intruder._socket.close()
+		self.assertTrue(wait_for(lambda: self.nodes[0].rejected > 0))
+		self.assertNotEqual(self.nodes[0]._interface.checks_dict['check001'].last_status, False)
+
+	def test_rejects_replayed(self):
+		""" a captured bye or results datagram of a live node, sent again later or long after, is rejected """
+		self.assertTrue(wait_for(lambda: all(len(node.live_nodes) == 3 for node in self.nodes)))
+		sender, receiver, address = self.nodes[2], self.nodes[0], self.nodes[0]._socket.getsockname()
+		replayer = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		try:
+			with sender._send_lock: # the first time, before any newer message of the sender
+				bye = sender._encode({'type': 'bye'})
+				results = sender._encode({'type': 'results', 'results': [('check001', False, None, None)]})
+				for data in (bye, results):
+					replayer.sendto(data, address)
+				self.assertTrue(wait_for(lambda: self.addresses[2] not in receiver.live_nodes and
+					receiver._interface.checks_dict['check001'].last_status is False))
+			self.assertTrue(wait_for(lambda: self.addresses[2] in receiver.live_nodes)) # its next heartbeat
+			rejected = receiver.rejected
+			receiver._interface.checks_dict['check001'].last_status = True
+			for data in (bye, results):
+				replayer.sendto(data, address)
+			self.assertTrue(wait_for(lambda: receiver.rejected == rejected + 2))
+			self.assertTrue(self.addresses[2] in receiver.live_nodes)
+			self.assertTrue(receiver._interface.checks_dict['check001'].last_status)
+			# a stale one, even never received before
+			with sender._send_lock:
+				sender._sequence += 1
+				payload = '{"type":"bye","node":"%s","run":%r,"seq":%s,"time":%r}' % (sender.node, sender._run,
+					sender._sequence, time() - 2 * sender.MAX_SKEW)
+			replayer.sendto('%s %s' % (sender._sign(payload), payload), address)
+			self.assertTrue(wait_for(lambda: receiver.rejected == rejected + 3))
+			self.assertTrue(self.addresses[2] in receiver.live_nodes)
+		finally:
+			replayer.close()
+
+	def test_torture(self):
+		""" random crashes and restarts while all the nodes run rounds : once stable, the survivors still split all the
+		checks between them and agree on every status, with a single writer """
+		random = Random(42)
+		stop, errors = [False], list()
+
+		def rounds(index):
+			while not stop[0]:
+				node = self.nodes[index]
+				try:
+					if not node._stop.is_set():
+						node.run_round(node.owned(self.keys))
+				except Exception as e: # the socket of a crashed node
+					if not node._stop.is_set():
+						errors.append(e)
+				sleep(HEARTBEAT / 2)
+
+		threads = [Thread(target=rounds, args=(index, )) for index in range(3)]
+		for thread in threads:
+			thread.daemon = True
+			thread.start()
+		try:
+			for _ in range(6):
+				index = random.randrange(3)
+				self.crash(self.nodes[index])
+				for key in random.sample(self.keys, 20):
+					self.truth[key] = not self.truth[key]
+				sleep(random.uniform(0, 2 * TIMEOUT))
+				node = ClusterNode(FakeInterface(self.keys, self.truth, self.nodes[index]._interface.dependencies),
+					self.addresses[index], self.addresses, HEARTBEAT, TIMEOUT, 'secret')
+				node.start()
+				self.nodes[index] = node
+				sleep(random.uniform(0, TIMEOUT))
+		finally:
+			sleep(2 * TIMEOUT)
+			stop[0] = True
+			for thread in threads:
+				thread.join()
+		self.assertEqual(errors, [])
+		self.assertTrue(wait_for(lambda: all(len(node.live_nodes) == 3 for node in self.nodes)))
+		self.assertEqual([node.writer for node in self.nodes], [self.addresses[0]] * 3)
+		self.assertPartition(self.nodes)
+		self.run_rounds(self.nodes)
+		for node in self.nodes:
+			self.assertTrue(wait_for(lambda: all(check.last_status == self.truth[key] for key, check in
+				node._interface.checks_dict.iteritems())))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,107 @@
+from os.path import dirname, abspath, join, isfile
+from ConfigParser import NoSectionError, NoOptionError, InterpolationError
+from shutil import rmtree
+from tempfile import mkdtemp
+import unittest
+import marshal
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from config_cache import CompiledConfig
+from utilz import ConfigObject
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+CONFIG = """[DEFAULT]
+enabled = 0
+host = example.com
+
+[SYSTEM]
+api_base = %(host)s:443
+api_key = KEY
+
+[CHECK_a]
+enabled = 1
+data = %(host)s 80
+"""
+
+
+# clem 18/10/2026
+class CompiledConfigObject(ConfigObject):
+	COMPILED_SUFFIX = '.compiled'
+
+
+# clem 18/10/2026
+class CompiledConfigTest(unittest.TestCase):
+	def setUp(self):
+		self.dir = mkdtemp()
+		self.path = join(self.dir, 'config.ini')
+		self.compiled_path = join(self.dir, '.config.ini.compiled')
+		self.write(CONFIG)
+
+	def tearDown(self):
+		rmtree(self.dir)
+
+	def write(self, content):
+		with open(self.path, 'w') as config_file:
+			config_file.write(content)
+
+	def load(self):
+		""" :return: whether the config file was parsed, and the values of a fresh config object """
+		config = CompiledConfigObject(self.path)
+		parsed = config._load()[0] is not None
+		return parsed, (config.sections, config.get('api_base', 'SYSTEM'), config.get('data', 'CHECK_a'))
+
+	def test_compiled(self):
+		parsed, values = self.load()
+		self.assertTrue(parsed)
+		self.assertEqual(values, (['SYSTEM', 'CHECK_a'], 'example.com:443', 'example.com 80'))
+		self.assertTrue(isfile(self.compiled_path))
+		compiled = CompiledConfig.load(self.compiled_path, CompiledConfig.digest_of(CONFIG))
+		self.assertEqual(compiled.sections(), ['SYSTEM', 'CHECK_a'])
+		self.assertEqual(dict(compiled.items('CHECK_a')), {'enabled': '1', 'host': 'example.com',
+			'data': 'example.com 80'})
+		self.assertEqual(compiled.get('SYSTEM', 'API_KEY'), 'KEY')
+		self.assertEqual(compiled.get('SYSTEM', 'enabled'), '0') # from DEFAULT
+		self.assertRaises(NoSectionError, compiled.get, 'CHECK_b', 'data')
+		self.assertRaises(NoSectionError, compiled.items, 'CHECK_b')
+		self.assertRaises(NoOptionError, compiled.get, 'SYSTEM', 'page_id')
+
+	def test_cache_hit(self):
+		first = self.load()
+		second = self.load()
+		self.assertEqual((first[0], second[0]), (True, False)) # not parsed again
+		self.assertEqual(first[1], second[1])
+
+	def test_invalidated(self):
+		self.load()
+		self.write(CONFIG.replace('example.com', 'example.org'))
+		parsed, values = self.load()
+		self.assertTrue(parsed)
+		self.assertEqual(values[1:], ('example.org:443', 'example.org 80'))
+		self.assertEqual(self.load(), (False, values)) # compiled again
+		self.assertEqual(CompiledConfig.load(self.compiled_path, CompiledConfig.digest_of(CONFIG)), None)
+
+	def test_corrupt(self):
+		_, values = self.load()
+		for content in ('garbage', marshal.dumps(('IMCC0', CompiledConfig.digest_of(CONFIG), list())),
+			marshal.dumps(('IMCC1', CompiledConfig.digest_of(CONFIG), 'not a list')), ''):
+			with open(self.compiled_path, 'wb') as compiled_file:
+				compiled_file.write(content)
+			self.assertEqual(self.load(), (True, values), repr(content))
+			self.assertEqual(self.load(), (False, values)) # replaced by a valid one
+
+	def test_not_compiled(self):
+		""" a config whose values cannot all be interpolated is still read, and its errors raised when read """
+		self.write(CONFIG.replace('%(host)s 80', '%(port)s 80'))
+		config = CompiledConfigObject(self.path)
+		self.assertEqual(config.compiled, None)
+		self.assertFalse(isfile(self.compiled_path))
+		self.assertEqual(config.get('api_base', 'SYSTEM'), 'example.com:443')
+		self.assertRaises(InterpolationError, config.get, 'data', 'CHECK_a')
+
+
+if __name__ == '__main__':
+	unittest.main()
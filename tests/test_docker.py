@@ -0,0 +1,125 @@
+from BaseHTTPServer import BaseHTTPRequestHandler
+from SocketServer import ThreadingMixIn, UnixStreamServer
+from os.path import dirname, abspath, join
+from threading import Thread
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import sleep
+import unittest
+import json
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from docker_client import DockerClient, DockerError
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+CONTAINERS = [
+	{'Id': 'a1b2c3d4e5f6' + '0' * 52, 'Names': ['/web'], 'State': 'running', 'Status': 'Up 2 hours (healthy)'},
+	{'Id': 'b1b2c3d4e5f6' + '1' * 52, 'Names': ['/db'], 'State': 'running', 'Status': 'Up 5 minutes (unhealthy)'},
+	{'Id': 'c1b2c3d4e5f6' + '2' * 52, 'Names': ['/batch'], 'State': 'exited', 'Status': 'Exited (0) 3 hours ago'},
+	{'Id': 'c2b2c3d4e5f6' + '3' * 52, 'Names': None, 'State': 'running', 'Status': 'Up 1 second'},
+]
+
+
+# clem 18/10/2026
+class FakeDockerDaemon(ThreadingMixIn, UnixStreamServer):
+	""" answers GET /containers/json over a unix socket, with keep-alive, counting the requests and connections """
+	daemon_threads = True
+	requests = 0
+	connections = 0
+	status = 200
+	delay = 0.
+
+	def __init__(self, path):
+		UnixStreamServer.__init__(self, path, FakeDockerHandler)
+		self.thread = Thread(target=self.serve_forever)
+		self.thread.daemon = True
+		self.thread.start()
+
+	def get_request(self): # unix sockets have no client address, which BaseHTTPRequestHandler logs
+		request, _ = UnixStreamServer.get_request(self)
+		self.connections += 1
+		return request, ('local', 0)
+
+
+# clem 18/10/2026
+class FakeDockerHandler(BaseHTTPRequestHandler):
+	protocol_version = 'HTTP/1.1'
+
+	def do_GET(self):
+		self.server.requests += 1
+		sleep(self.server.delay)
+		if self.path == '/containers/json?all=1' and self.server.status == 200:
+			status, body = 200, json.dumps(CONTAINERS)
+		else:
+			status, body = self.server.status if self.server.status != 200 else 404, '{"message": "error"}'
+		self.send_response(status)
+		self.send_header('Content-Type', 'application/json')
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, *_):
+		pass
+
+
+# clem 18/10/2026
+class DockerClientTest(unittest.TestCase):
+	def setUp(self):
+		self.dir = mkdtemp()
+		self.path = join(self.dir, 'docker.sock')
+		self.daemon = FakeDockerDaemon(self.path)
+		self.client = DockerClient(self.path, timeout=2, max_age=60)
+
+	def tearDown(self):
+		self.client.close()
+		self.daemon.shutdown()
+		self.daemon.server_close()
+		rmtree(self.dir)
+
+	def test_find(self):
+		self.assertEqual(self.client.find('web')['Id'], CONTAINERS[0]['Id'])
+		self.assertEqual(self.client.find('/db')['Id'], CONTAINERS[1]['Id'])
+		self.assertEqual(self.client.find(CONTAINERS[2]['Id'])['Id'], CONTAINERS[2]['Id'])
+		self.assertEqual(self.client.find(CONTAINERS[2]['Id'][:12])['Id'], CONTAINERS[2]['Id'])
+		self.assertEqual(self.client.find('c2')['Id'], CONTAINERS[3]['Id']) # unambiguous prefix
+		self.assertIsNone(self.client.find('c')) # ambiguous prefix
+		self.assertIsNone(self.client.find('nothere'))
+		self.assertIsNone(self.client.find(''))
+
+	def test_is_up(self):
+		self.assertEqual([DockerClient.is_up(self.client.find(name)) for name in ('web', 'db', 'batch', 'c2')],
+			[True, False, False, True])
+		self.assertFalse(DockerClient.is_up(None))
+
+	def test_one_listing_per_round(self):
+		for name in ('web', 'db', 'batch', 'nothere') * 50:
+			self.client.find(name)
+		self.assertEqual(self.daemon.requests, 1)
+		self.client.max_age = 0.
+		sleep(.01)
+		self.client.find('web')
+		self.client.find('web')
+		self.assertEqual(self.daemon.requests, 3)
+		self.assertEqual(self.daemon.connections, 1) # kept alive
+
+	def test_concurrent_callers_share_the_listing(self):
+		self.daemon.delay = .2
+		threads = [Thread(target=self.client.find, args=('web', )) for _ in range(20)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		self.assertEqual(self.daemon.requests, 1)
+
+	def test_errors(self):
+		self.daemon.status = 500
+		self.assertRaises(DockerError, self.client.find, 'web')
+		self.assertRaises(DockerError, DockerClient(join(self.dir, 'nothere.sock')).find, 'web')
+
+
+if __name__ == '__main__':
+	unittest.main()
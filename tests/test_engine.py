@@ -0,0 +1,219 @@
+from os.path import dirname, abspath
+from threading import Thread, Event, Semaphore, Lock
+from time import time, sleep
+import unittest
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from engine import RoundRunner, OverlapPolicy, CheckScheduler, SingleFlight
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def wait_for(condition, timeout=5.):
+	""" :return: whether condition() became true within timeout seconds """
+	end = time() + timeout
+	while time() < end:
+		if condition():
+			return True
+		sleep(.01)
+	return condition()
+
+
+def merge_keys(pending_args, new_args): # as the Watcher does
+	keys = list(pending_args[0])
+	keys.extend(key for key in new_args[0] if key not in keys)
+	return keys,
+
+
+def remaining_keys(new_args, busy_args):
+	busy = set(key for args in busy_args for key in args[0])
+	keys = [key for key in new_args[0] if key not in busy]
+	return (keys, ) if keys else None
+
+
+# clem 18/10/2026
+class GatedRounds(object):
+	""" a round function recording the keys of each round, the rounds blocking until the gate is open """
+	def __init__(self):
+		self.rounds = list()
+		self.started = Semaphore(0)
+		self.gate = Event()
+
+	def __call__(self, keys):
+		self.rounds.append(list(keys))
+		self.started.release()
+		self.gate.wait(5)
+		if 'fail' in keys:
+			raise ValueError('failed')
+
+
+# clem 18/10/2026
+class RoundRunnerTest(unittest.TestCase):
+	def start(self, policy, remaining=None):
+		""" :return: a runner of policy, busy with a round of a and b """
+		self.rounds = GatedRounds()
+		runner = RoundRunner(self.rounds, policy, merge_keys, remaining)
+		self.assertTrue(runner.submit(['a', 'b']))
+		self.rounds.started.acquire()
+		self.assertTrue(runner.busy)
+		return runner
+
+	def finish(self, runner):
+		self.rounds.gate.set()
+		self.assertTrue(wait_for(lambda: not runner.busy))
+
+	def test_skip(self):
+		runner = self.start(OverlapPolicy.SKIP)
+		self.assertFalse(runner.submit(['a', 'c']))
+		self.assertFalse(runner.submit(['c']))
+		self.assertEqual((runner.skipped_rounds, runner.coalesced_rounds, runner.pending), (2, 0, 0))
+		self.finish(runner)
+		self.assertEqual(self.rounds.rounds, [['a', 'b']])
+		self.assertTrue(runner.submit(['c'])) # once idle
+		self.assertTrue(wait_for(lambda: self.rounds.rounds[-1] == ['c'] and not runner.busy))
+
+	def test_skip_keys_in_flight(self):
+		""" with a remaining function, only the keys of the running and pending rounds are dropped """
+		runner = self.start(OverlapPolicy.SKIP, remaining_keys)
+		self.assertTrue(runner.submit(['a', 'c'])) # c pending
+		self.assertFalse(runner.submit(['b', 'c'])) # all in flight
+		self.assertFalse(runner.submit(['c', 'd'])) # d merged into the pending round
+		self.assertEqual((runner.skipped_rounds, runner.coalesced_rounds, runner.pending), (1, 1, 1))
+		self.finish(runner)
+		self.assertEqual(self.rounds.rounds, [['a', 'b'], ['c', 'd']])
+
+	def test_coalesce(self):
+		runner = self.start(OverlapPolicy.COALESCE)
+		self.assertTrue(runner.submit(['b']))
+		self.assertFalse(runner.submit(['c']))
+		self.assertFalse(runner.submit(['b', 'd']))
+		self.assertEqual((runner.skipped_rounds, runner.coalesced_rounds, runner.pending), (0, 2, 1))
+		self.finish(runner)
+		self.assertEqual(self.rounds.rounds, [['a', 'b'], ['b', 'c', 'd']]) # a single follow-up round
+
+	def test_queue(self):
+		runner = self.start(OverlapPolicy.QUEUE)
+		self.assertTrue(runner.submit(['a']))
+		self.assertTrue(runner.submit(['a']))
+		self.assertEqual((runner.skipped_rounds, runner.coalesced_rounds, runner.pending), (0, 0, 2))
+		self.finish(runner)
+		self.assertEqual(self.rounds.rounds, [['a', 'b'], ['a'], ['a']])
+
+	def test_failed_round(self):
+		runner = self.start(OverlapPolicy.QUEUE)
+		self.assertTrue(runner.submit(['fail']))
+		self.assertTrue(runner.submit(['c']))
+		self.finish(runner)
+		self.assertEqual(self.rounds.rounds, [['a', 'b'], ['fail'], ['c']])
+
+
+# clem 18/10/2026
+class CheckSchedulerTest(unittest.TestCase):
+	KEYS = ['check%04d' % number for number in range(1000)]
+
+	def test_slots(self):
+		for interval, slots in ((30., CheckScheduler.SLOTS), (3., 3), (.5, 1)):
+			offsets = [CheckScheduler.jitter(key, interval) for key in self.KEYS]
+			self.assertEqual(sorted(set(offsets)), [number * interval / slots for number in range(slots)])
+			for offset in set(offsets): # evenly spread
+				self.assertTrue(offsets.count(offset) > len(self.KEYS) / slots / 2)
+		self.assertEqual(CheckScheduler.jitter('check0001', 30.), CheckScheduler.jitter('check0001', 30.))
+
+	def test_rounds_per_interval(self):
+		""" 1000 checks of the same interval are due in SLOTS rounds per interval, each one once """
+		scheduler = CheckScheduler()
+		for key in self.KEYS:
+			scheduler.add(key, 30.)
+		now = scheduler.next_due()
+		end, rounds = now + 30., list()
+		while now < end:
+			rounds.append(scheduler.pop_due(now))
+			now = scheduler.next_due()
+		self.assertEqual(len(rounds), CheckScheduler.SLOTS)
+		self.assertEqual(sorted(sum(rounds, [])), self.KEYS)
+		self.assertEqual(now, end) # and again
+
+	def test_late_and_removed(self):
+		scheduler = CheckScheduler()
+		scheduler.add('a', 10.)
+		scheduler.add('b', 10.)
+		scheduler.remove('b')
+		first = scheduler.next_due()
+		self.assertEqual(scheduler.pop_due(first + 25.), ['a']) # once, though 3 intervals late
+		self.assertEqual(scheduler.pop_due(first + 25.), [])
+		self.assertEqual(scheduler.next_due(), first + 30.) # in phase
+		self.assertEqual(len(scheduler), 1)
+
+
+# clem 18/10/2026
+class SingleFlightTest(unittest.TestCase):
+	THREADS = 10
+
+	def run_threads(self, target):
+		threads = [Thread(target=target) for _ in range(self.THREADS)]
+		for thread in threads:
+			thread.daemon = True
+			thread.start()
+		for thread in threads:
+			thread.join(5)
+
+	def test_do(self):
+		flight, calls, results, lock = SingleFlight(), list(), list(), Lock()
+
+		def probe(host):
+			calls.append(host)
+			sleep(.1)
+			return 'up %s' % host
+
+		def check():
+			result = flight.do(('ping', 'host'), probe, 'host')
+			with lock:
+				results.append(result)
+
+		self.run_threads(check)
+		self.assertEqual(calls, ['host'])
+		self.assertEqual(results, ['up host'] * self.THREADS)
+		self.assertEqual((flight.requests, flight.executions, flight.deduplicated), (self.THREADS, 1, self.THREADS - 1))
+		self.assertEqual(flight.do(('ping', 'host'), probe, 'host'), 'up host') # later in the round too
+		self.assertEqual(len(calls), 1)
+
+	def test_do_exception(self):
+		flight, errors, lock = SingleFlight(), list(), Lock()
+
+		def probe():
+			sleep(.1)
+			raise IOError('unreachable')
+
+		def check():
+			try:
+				flight.do('host', probe)
+			except IOError as e:
+				with lock:
+					errors.append(str(e))
+
+		self.run_threads(check)
+		self.assertEqual(errors, ['unreachable'] * self.THREADS)
+		self.assertEqual(flight.executions, 1)
+
+	def test_do_many(self):
+		flight, calls = SingleFlight(), list()
+
+		def probe_many(hosts):
+			calls.append(sorted(hosts))
+			sleep(.1)
+			return dict((host, host.upper()) for host in hosts)
+
+		first = Thread(target=flight.do_many, args=(['a', 'b'], probe_many))
+		first.start()
+		self.assertTrue(wait_for(lambda: calls))
+		self.assertEqual(flight.do_many(['b', 'c'], probe_many), {'b': 'B', 'c': 'C'}) # b from the running call
+		first.join()
+		self.assertEqual(calls, [['a', 'b'], ['c']])
+		self.assertEqual(flight.dedup_ratio, .25)
+
+
+if __name__ == '__main__':
+	unittest.main()
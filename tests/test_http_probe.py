@@ -0,0 +1,143 @@
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+from os.path import dirname, abspath
+from threading import Thread
+from time import sleep
+import unittest
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from networking import HTTPProbeClient, HTTPConnectionPool
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+# clem 18/10/2026
+class FakeHTTPServer(ThreadingMixIn, HTTPServer):
+	""" a local keep-alive HTTP server, counting the requests and connections, closing the connections idle for
+	idle_timeout seconds """
+	daemon_threads = True
+	requests = 0
+	connections = 0
+	idle_timeout = None
+	delay = 0.
+
+	def __init__(self):
+		HTTPServer.__init__(self, ('127.0.0.1', 0), FakeHandler)
+		self.url = 'http://127.0.0.1:%s' % self.server_port
+		self.thread = Thread(target=self.serve_forever)
+		self.thread.daemon = True
+		self.thread.start()
+
+
+# clem 18/10/2026
+class FakeHandler(BaseHTTPRequestHandler):
+	""" /loop redirects to itself, /hops/<n> redirects n times before answering 200 """
+	protocol_version = 'HTTP/1.1'
+
+	def setup(self):
+		self.server.connections += 1
+		self.timeout = self.server.idle_timeout
+		BaseHTTPRequestHandler.setup(self)
+
+	def do_GET(self):
+		self.server.requests += 1
+		sleep(self.server.delay)
+		if self.path == '/loop':
+			status, location = 302, '/loop'
+		elif self.path.startswith('/hops/') and int(self.path[6:]) > 0:
+			status, location = 302, '/hops/%s' % (int(self.path[6:]) - 1)
+		else:
+			status, location = 200, None
+		body = 'ok' if status == 200 else ''
+		self.send_response(status)
+		if location:
+			self.send_header('Location', location)
+		self.send_header('Content-Length', str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, *_):
+		pass
+
+
+# clem 18/10/2026
+class RedirectTest(unittest.TestCase):
+	def setUp(self):
+		self.server = FakeHTTPServer()
+		self.client = HTTPProbeClient()
+
+	def tearDown(self):
+		self.client.close()
+		self.server.shutdown()
+		self.server.server_close()
+
+	def test_redirect_loop(self):
+		result = self.client.probe(self.server.url + '/loop', 2)
+		self.assertFalse(result.ok)
+		self.assertEqual(result.status, 302) # which alone is an OK code
+		self.assertTrue('redirections' in result.error)
+		self.assertEqual(self.server.requests, HTTPProbeClient.MAX_REDIRECTS + 1)
+
+	def test_redirects_followed(self):
+		result = self.client.probe(self.server.url + '/hops/%s' % HTTPProbeClient.MAX_REDIRECTS, 2)
+		self.assertTrue(result.ok)
+		self.assertEqual(result.status, 200)
+		self.assertEqual(result.error, None)
+		self.assertFalse(self.client.probe(self.server.url + '/hops/%s' % (HTTPProbeClient.MAX_REDIRECTS + 1), 2).ok)
+
+
+# clem 18/10/2026
+class ConnectionPoolTest(unittest.TestCase):
+	IDLE_TIMEOUT = .2
+
+	def setUp(self):
+		self.server = FakeHTTPServer()
+		self.server.idle_timeout = self.IDLE_TIMEOUT
+		self.host = '127.0.0.1:%s' % self.server.server_port
+		self.pool = HTTPConnectionPool(2, 2)
+
+	def tearDown(self):
+		self.pool.close()
+		self.server.shutdown()
+		self.server.server_close()
+
+	def get(self):
+		response = self.pool.request(self.host, 'GET', '/', https=False)
+		self.assertEqual(response.status, 200)
+
+	def test_keep_alive(self):
+		for _ in range(3):
+			self.get()
+		self.assertEqual((self.pool.misses, self.pool.hits, self.server.connections), (1, 2, 1))
+		self.assertEqual(self.pool.idle_count, 1)
+
+	def test_stale_connection(self):
+		""" a connection closed by the server while idle in the pool is replaced by a new one, once """
+		self.get()
+		sleep(self.IDLE_TIMEOUT * 3)
+		self.get()
+		self.assertEqual((self.pool.reconnects, self.server.connections, self.server.requests), (1, 2, 2))
+		self.get() # on the new connection
+		self.assertEqual((self.pool.reconnects, self.server.connections), (1, 2))
+
+	def test_pool_size(self):
+		""" concurrent requests open as many connections, but only pool_size of them are kept """
+		self.server.delay = .1
+		threads = [Thread(target=self.get) for _ in range(5)]
+		for thread in threads:
+			thread.daemon = True
+			thread.start()
+		for thread in threads:
+			thread.join(5)
+		self.assertEqual((self.pool.misses, self.server.connections, self.pool.idle_count), (5, 5, 2))
+		self.server.delay = 0.
+		self.get()
+		self.get()
+		self.assertEqual((self.pool.hits, self.server.connections), (2, 5))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,57 @@
+from os.path import dirname, abspath, join
+from shutil import rmtree
+from tempfile import mkdtemp
+import unittest
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from outbox import Outbox
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+# clem 18/10/2026
+class OutboxCrashTest(unittest.TestCase):
+	""" runs are simulated by new Outbox instances on the same file, crashes by dropping them without closing """
+	def setUp(self):
+		self.dir = mkdtemp()
+		self.path = join(self.dir, 'outbox.log')
+
+	def tearDown(self):
+		rmtree(self.dir)
+
+	def test_replay_after_crash(self):
+		first = Outbox(self.path)
+		first.append('a', None, True)
+		first.append('b', True, False)
+		del first
+		records = Outbox(self.path).replay()
+		self.assertEqual(sorted(each[1:] for each in records), [('a', None, True), ('b', True, False)])
+
+	def test_two_crashes_in_a_row(self):
+		first = Outbox(self.path)
+		first.append('a', None, True)
+		first.append('b', True, False)
+		del first # crash before replaying anything
+		second = Outbox(self.path)
+		seq = second.append('c', False, True)
+		second.ack([seq]) # sent, which must not acknowledge a record of the first run
+		second.append('d', None, False)
+		del second # crash again, before replay
+		third = Outbox(self.path)
+		records = third.replay()
+		self.assertEqual(sorted(each[1:] for each in records), [('a', None, True), ('b', True, False),
+			('d', None, False)])
+		seqs = [each[0] for each in records]
+		self.assertEqual(len(set(seqs)), len(seqs))
+		self.assertTrue(min(seqs) > seq)
+		self.assertEqual(third.pending_count, 3)
+		third.ack(seqs)
+		third.close()
+		self.assertEqual(Outbox(self.path).replay(), [])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,76 @@
+from os.path import dirname, abspath
+from distutils.spawn import find_executable
+from threading import Thread
+from time import time
+import unittest
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from networking import Pinger, get_pinger
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+UNREACHABLE = '10.255.255.1' # not routed anywhere, so never answers
+
+
+# clem 18/10/2026
+class PingCommandTest(unittest.TestCase):
+	def deadline_of(self, deadline):
+		command = Pinger._ping_command('host', 3, .2, deadline)
+		return int(command[command.index('-w') + 1])
+
+	def test_deadline_rounded_up(self):
+		self.assertEqual([self.deadline_of(each) for each in (.1, .49, .5, 1., 1.2, 4.9, 5.)], [1, 1, 1, 1, 2, 5, 5])
+
+	def test_never_zero(self): # -w 0 means no deadline
+		self.assertEqual(self.deadline_of(0.), 1)
+
+	def test_subprocess_fallback(self):
+		started = time()
+		results = Pinger._ping_many_subprocess(['127.0.0.1'], 1, .2, .3)
+		self.assertTrue(time() - started < 3.)
+		self.assertEqual(results['127.0.0.1'].online, bool(find_executable('ping')))
+
+
+# clem 18/10/2026
+@unittest.skipUnless(get_pinger().native, 'no ICMP socket available to this process')
+class NativePingTest(unittest.TestCase):
+	def test_sweep(self):
+		results = get_pinger().ping_many(['127.0.0.1', UNREACHABLE], count=2, interval=.05, deadline=1.)
+		self.assertEqual((results['127.0.0.1'].received, results['127.0.0.1'].sent), (2, 2))
+		self.assertIsNotNone(results['127.0.0.1'].rtt)
+		self.assertEqual((results[UNREACHABLE].received, results[UNREACHABLE].sent), (0, 2))
+		self.assertEqual(results[UNREACHABLE].loss, 1.)
+
+	def test_deadline(self):
+		for deadline in (.1, .3, .6):
+			started = time()
+			results = get_pinger().ping_many([UNREACHABLE], count=3, interval=.05, deadline=deadline)
+			elapsed = time() - started
+			self.assertFalse(results[UNREACHABLE].online)
+			self.assertTrue(deadline - .02 <= elapsed < deadline + .2, '%.3f sec for a %s sec deadline' %
+				(elapsed, deadline))
+
+	def test_all_answered_before_the_deadline(self):
+		started = time()
+		get_pinger().ping_many(['127.0.0.1'], count=1, deadline=5.)
+		self.assertTrue(time() - started < 1.)
+
+	def test_concurrent_sweeps(self):
+		results = dict()
+		threads = [Thread(target=lambda number=number: results.__setitem__(number, get_pinger().ping_many(
+			['127.0.0.1', UNREACHABLE], count=2, interval=.05, deadline=.5))) for number in range(4)]
+		started = time()
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		self.assertTrue(time() - started < 1., 'sweeps did not run in parallel')
+		for each in results.itervalues(): # every reply reached the sweep that sent its request
+			self.assertEqual(each['127.0.0.1'].received, 2)
+
+
+if __name__ == '__main__':
+	unittest.main()
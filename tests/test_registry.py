@@ -0,0 +1,111 @@
+from os.path import dirname, abspath, join
+from shutil import rmtree
+from tempfile import mkdtemp
+import unittest
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from registry import CheckerRegistry, BaseChecker, FunctionChecker
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+CHECKER_MODULE = """
+import registry
+
+
+class EchoChecker(registry.BaseChecker):
+	def check(self, check):
+		return check == 'up'
+
+
+CHECKERS = {'echo': EchoChecker, 'echo_instance': EchoChecker(), 'broken': object}
+"""
+
+
+# clem 18/10/2026
+class UpChecker(BaseChecker):
+	def check(self, check):
+		return True
+
+
+# clem 18/10/2026
+class BatchChecker(UpChecker):
+	def check_many(self, checks):
+		return dict((each, (True, .1)) for each in checks)
+
+	def normalize(self, data):
+		return data.strip().lower()
+
+
+# clem 18/10/2026
+class CheckerRegistryTest(unittest.TestCase):
+	def setUp(self):
+		self.registry = CheckerRegistry()
+
+	def test_register(self):
+		self.registry.register('up', UpChecker) # a class
+		batch = BatchChecker()
+		self.registry.register('batch', batch) # or an instance
+		self.assertEqual(self.registry.types, ['batch', 'up'])
+		self.assertTrue(isinstance(self.registry.get('up'), UpChecker))
+		self.assertTrue(self.registry.get('batch') is batch)
+		self.assertTrue('up' in self.registry)
+		self.assertFalse(self.registry.get('up').batches)
+		self.assertTrue(batch.batches)
+		self.assertEqual(self.registry.get('up').check_many(['a']), {'a': (True, None)})
+		self.assertEqual(batch.normalize(' Host '), 'host')
+		self.registry.register('up', batch) # replaces the previous one
+		self.assertTrue(self.registry.get('up') is batch)
+
+	def test_unknown_types(self):
+		self.assertEqual(self.registry.get('nope'), None)
+		self.assertFalse('nope' in self.registry)
+		for checker in (object, object(), lambda check: True, 'UpChecker', None):
+			self.assertRaises(TypeError, self.registry.register, 'bad', checker)
+		self.assertEqual(self.registry.types, [])
+
+	def test_function_checker(self):
+		single = FunctionChecker(lambda check: check > 0)
+		self.assertFalse(single.batches)
+		self.assertEqual(single.check_many([1, 0]), {1: (True, None), 0: (False, None)})
+		batch = FunctionChecker(lambda check: True, lambda checks: dict((each, (False, 1.)) for each in checks),
+			lambda data: data.upper())
+		self.assertTrue(batch.batches)
+		self.assertEqual(batch.check_many([1]), {1: (False, 1.)})
+		self.assertEqual((batch.normalize('a'), single.normalize(' a ')), ('A', 'a'))
+
+	def test_load_module(self):
+		directory = mkdtemp()
+		try:
+			with open(join(directory, 'my_checkers.py'), 'w') as module_file:
+				module_file.write(CHECKER_MODULE)
+			with open(join(directory, 'no_checkers.py'), 'w') as module_file:
+				module_file.write('VALUE = 1\n')
+			sys.path.insert(0, directory)
+			for module_name in ('my_checkers', 'no_checkers', 'not_a_module'): # the invalid ones are logged and skipped
+				self.registry.load_module(module_name)
+		finally:
+			sys.path.remove(directory)
+			rmtree(directory)
+		self.assertEqual(self.registry.types, ['echo', 'echo_instance'])
+		self.assertTrue(self.registry.get('echo').check('up'))
+		self.assertFalse(self.registry.get('echo_instance').check('down'))
+
+	def test_load_entry_points(self):
+		import pkg_resources
+		group = 'infra_monitor.test_checkers'
+		distribution = pkg_resources.Distribution(dirname(abspath(__file__)), project_name='fake-checkers', version='1.0')
+		distribution._ep_map = {group: {
+			'up': pkg_resources.EntryPoint.parse('up = test_registry:UpChecker', distribution),
+			'missing': pkg_resources.EntryPoint.parse('missing = test_registry:MissingChecker', distribution),
+		}}
+		pkg_resources.working_set.add(distribution)
+		self.registry.load_entry_points(group)
+		self.assertEqual(self.registry.types, ['up'])
+		self.assertTrue(self.registry.get('up').check(None))
+
+
+if __name__ == '__main__':
+	unittest.main()
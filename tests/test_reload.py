@@ -0,0 +1,185 @@
+from os.path import dirname, abspath, basename, join
+from importlib import import_module
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import time
+import unittest
+import os
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+sys.path.insert(0, dirname(dirname(dirname(abspath(__file__))))) # to import the package itself, whatever its name
+from config_watch import ConfigWatcher
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+monitor = import_module(basename(dirname(dirname(abspath(__file__)))))
+
+SYSTEM = """[DEFAULT]
+enabled = 0
+name =
+type =
+data =
+
+[SYSTEM]
+api_key = KEY
+page_id = PAGE
+api_base = 127.0.0.1:1
+api_url = /v1/pages/%(page_id)s/
+api_data =
+http_mode = http
+conf_items = enabled name type data
+items_prefix = CHECK_
+templates_prefix = TEMPLATE_
+refresh_interval = 30
+"""
+
+
+def check_section(key, data, interval=None):
+	return '\n[CHECK_%s]\nenabled = 1\nname = %s\ntype = tcp\ndata = %s\n%s' % (key, key, data,
+		'interval = %s\n' % interval if interval else '')
+
+
+def template_section(ports):
+	return '\n[TEMPLATE_web]\nenabled = 1\ntype = tcp\nfor_port = %s\nname = web {port}\ndata = 127.0.0.1 {port}\n' % \
+		ports
+
+
+# clem 18/10/2026
+class FakeInterface(monitor.ServiceInterfaceAbstract):
+	""" sends nothing anywhere """
+	def _send(self, *args, **kwargs): pass
+	def _gen_url(self, *args, **kwargs): pass
+	def update_check(self, *args, **kwargs): pass
+	def set_check(self, check_instance, value=False): pass
+	def no_status_change(self, check_instance, old_status, new_status): pass
+
+
+# clem 18/10/2026
+class ReloadConfigTest(unittest.TestCase):
+	def setUp(self):
+		self.dir = mkdtemp()
+		self.path = join(self.dir, 'config.ini')
+		self.write(check_section('a', '127.0.0.1 1') + check_section('b', '127.0.0.1 2') +
+			check_section('c', '127.0.0.1 3') + template_section('80 81'))
+		self.interface = FakeInterface(monitor.MyConfig(self.path))
+
+	def tearDown(self):
+		state = self.interface._state
+		if state is not None:
+			state.close()
+		rmtree(self.dir)
+
+	def write(self, sections):
+		with open(self.path, 'w') as config_file:
+			config_file.write(SYSTEM + sections)
+
+	def test_diff(self):
+		before = dict(self.interface.checks_dict)
+		self.assertEqual(sorted(before), ['a', 'b', 'c', 'web-80', 'web-81'])
+		for number, key in enumerate(sorted(before)):
+			before[key].set_result(number % 2 == 0, number / 10.)
+		scheduler = self.interface.scheduler
+		due_a = [entry[0] for entry in scheduler._heap if entry[2] == 'a']
+		self.write(check_section('a', '127.0.0.1 1') + check_section('c', '127.0.0.1 4') +
+			check_section('d', '127.0.0.1 5') + template_section('80 82'))
+		self.assertEqual(self.interface.reload_config(), (['d', 'web-82'], ['b', 'web-81'], ['c']))
+		checks = self.interface.checks_dict
+		self.assertEqual(sorted(checks), ['a', 'c', 'd', 'web-80', 'web-82'])
+		for key in ('a', 'web-80'): # untouched
+			self.assertTrue(checks[key] is before[key])
+		self.assertTrue(checks['c'] is not before['c'])
+		self.assertEqual(checks['c'].check_data, '127.0.0.1 4')
+		self.assertEqual((checks['c'].last_status, checks['c'].last_latency), (True, .2)) # kept its status
+		self.assertEqual(checks['d'].last_status, None)
+		self.assertEqual(sorted(scheduler._entries), sorted(checks))
+		self.assertEqual([entry[0] for entry in scheduler._heap if entry[2] == 'a'], due_a) # kept its place
+		self.assertEqual(self.interface.reload_config(), ([], [], [])) # nothing changed since
+
+	def test_interval_change(self):
+		self.interface.checks_dict
+		scheduler = self.interface.scheduler
+		self.write(check_section('a', '127.0.0.1 1', 5) + check_section('b', '127.0.0.1 2') +
+			check_section('c', '127.0.0.1 3') + template_section('80 81'))
+		self.assertEqual(self.interface.reload_config(), ([], [], ['a']))
+		self.assertEqual(scheduler._entries['a'][0], 5.)
+		self.assertTrue(scheduler.next_due() <= time() + 5)
+
+	def test_rows_reused(self):
+		table = self.interface.status_table
+		self.interface.checks_dict
+		for ports in ('90 91', '80 81', '90 91', '80 81'):
+			self.write(check_section('a', '127.0.0.1 1') + check_section('b', '127.0.0.1 2') +
+				check_section('c', '127.0.0.1 3') + template_section(ports))
+			self.interface.reload_config()
+		self.assertEqual(len(table._status), 7) # 5 checks and the 2 rows released by the last reload, not freed yet
+
+	def test_invalid_file(self):
+		before = dict(self.interface.checks_dict)
+		with open(self.path, 'w') as config_file:
+			config_file.write('[SYSTEM\nnot a config file')
+		self.assertEqual(self.interface.reload_config(), None)
+		self.assertEqual(self.interface.checks_dict, before)
+
+
+# clem 18/10/2026
+class ConfigWatcherTest(unittest.TestCase):
+	def setUp(self):
+		self.dir = mkdtemp()
+		self.path = join(self.dir, 'config.ini')
+		self.write('first')
+
+	def tearDown(self):
+		rmtree(self.dir)
+
+	def write(self, content, mtime=None):
+		with open(self.path, 'w') as config_file:
+			config_file.write(content)
+		if mtime is not None:
+			os.utime(self.path, (mtime, mtime))
+
+	def replace(self, content):
+		""" writes a new file, then renames it over the config, as editors do """
+		temp_path = join(self.dir, '.config.ini.tmp')
+		with open(temp_path, 'w') as temp_file:
+			temp_file.write(content)
+		os.rename(temp_path, self.path)
+
+	def check(self, watcher):
+		self.assertFalse(watcher.changed())
+		self.write('second')
+		self.assertTrue(watcher.wait(2))
+		self.assertFalse(watcher.changed())
+		self.replace('third')
+		self.assertTrue(watcher.wait(2))
+		started = time()
+		self.assertFalse(watcher.wait(.3))
+		self.assertTrue(time() - started >= .3)
+		watcher.close()
+
+	def test_inotify(self):
+		watcher = ConfigWatcher(self.path)
+		self.assertTrue(watcher.uses_inotify)
+		self.check(watcher)
+
+	def test_mtime_fallback(self):
+		watcher = ConfigWatcher(self.path, use_inotify=False)
+		self.assertFalse(watcher.uses_inotify)
+		self.check(watcher)
+
+	def test_same_mtime(self):
+		""" a change within the same second as the previous one is still seen, through the size or the inode """
+		self.write('first', 1000000000)
+		watcher = ConfigWatcher(self.path, use_inotify=False)
+		self.write('first, changed', 1000000000)
+		self.assertTrue(watcher.changed())
+		os.unlink(self.path)
+		self.assertFalse(watcher.changed()) # missing for an instant, while being replaced
+		self.write('first, changed', 1000000000)
+		self.assertTrue(watcher.changed())
+
+
+if __name__ == '__main__':
+	unittest.main()
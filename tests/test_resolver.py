@@ -0,0 +1,163 @@
+from os.path import dirname, abspath
+from threading import Thread, Lock
+from time import sleep
+import unittest
+import socket
+import struct
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from resolver import Resolver, RecordTypes, DNSAnswer, _read_name
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+ZONE = { # name : list of (type, ttl, value)
+	'a.test': [(RecordTypes.A, 300, '1.2.3.4')],
+	'multi.test': [(RecordTypes.A, 300, '1.2.3.4'), (RecordTypes.A, 300, '1.2.3.5')],
+	'short.test': [(RecordTypes.A, 1, '5.6.7.8')],
+	'v6.test': [(RecordTypes.AAAA, 300, '2001:db8::1')],
+	'slow.test': [(RecordTypes.AAAA, 300, '2001:db8::2')],
+}
+DELAYS = {'slow.test': .3} # seconds before answering
+
+
+# clem 18/10/2026
+class StubDNSServer(object):
+	""" answers A and AAAA queries from ZONE on an ephemeral UDP port, NXDOMAIN for other names, each answer being
+	preceded by a decoy with the wrong id """
+	def __init__(self):
+		self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		self.socket.bind(('127.0.0.1', 0))
+		self.address = '%s:%s' % self.socket.getsockname()
+		self.queries = dict() # (name, type) : count
+		self._lock = Lock()
+		thread = Thread(target=self._serve)
+		thread.daemon = True
+		thread.start()
+
+	def count(self, name, qtype=RecordTypes.A):
+		return self.queries.get((name, qtype), 0)
+
+	def _serve(self):
+		while True:
+			try:
+				data, address = self.socket.recvfrom(512)
+			except socket.error:
+				return
+			name, offset = _read_name(data, 12)
+			qtype = struct.unpack('>H', data[offset:offset + 2])[0]
+			with self._lock:
+				self.queries[(name, qtype)] = self.count(name, qtype) + 1
+			if name in DELAYS:
+				Thread(target=self._answer, args=(data, address, name, qtype, offset, DELAYS[name])).start()
+			else:
+				self._answer(data, address, name, qtype, offset)
+
+	def _answer(self, data, address, name, qtype, offset, delay=0.):
+		sleep(delay)
+		query_id, question = struct.unpack('>H', data[:2])[0], data[12:offset + 4]
+		records = [record for record in ZONE.get(name, list()) if record[0] == qtype]
+		answers = ''
+		for record_type, ttl, value in records:
+			raw = socket.inet_pton(socket.AF_INET6 if record_type == RecordTypes.AAAA else socket.AF_INET, value)
+			answers += '\xc0\x0c' + struct.pack('>HHIH', record_type, 1, ttl, len(raw)) + raw
+		flags = 0x8180 | (DNSAnswer.NOERROR if name in ZONE else DNSAnswer.NXDOMAIN)
+		try:
+			self.socket.sendto(struct.pack('>HHHHHH', query_id ^ 1, 0x8180, 1, 1, 0, 0) + question +
+				'\xc0\x0c' + struct.pack('>HHIH', 1, 1, 300, 4) + socket.inet_aton('6.6.6.6'), address) # decoy
+			self.socket.sendto(struct.pack('>HHHHHH', query_id, flags, 1, len(records), 0, 0) + question + answers,
+				address)
+		except socket.error:
+			pass
+
+	def close(self):
+		self.socket.close()
+
+
+# clem 18/10/2026
+class ResolverTest(unittest.TestCase):
+	def setUp(self):
+		self.server = StubDNSServer()
+		self.resolver = Resolver([self.server.address], timeout=1.)
+		self.resolver._search = list() # so that the search domains of this host do not matter
+
+	def tearDown(self):
+		self.server.close()
+
+	def test_resolve_many(self):
+		results = self.resolver.resolve_many(['a.test', 'multi.test', 'v6.test', 'nx.test', '10.0.0.1', 'localhost'])
+		self.assertEqual(results['a.test'], ['1.2.3.4'])
+		self.assertEqual(sorted(results['multi.test']), ['1.2.3.4', '1.2.3.5'])
+		self.assertEqual(results['v6.test'], ['2001:db8::1'])
+		self.assertEqual(results['nx.test'], [])
+		self.assertEqual(results['10.0.0.1'], ['10.0.0.1'])
+		self.assertTrue(results['localhost'])
+		self.assertEqual(self.server.count('localhost'), 0) # from the hosts file
+
+	def test_cache_and_ttl(self):
+		self.resolver.resolve_many(['a.test', 'short.test', 'nx.test'])
+		self.resolver.resolve_many(['a.test', 'A.TEST.', 'short.test', 'nx.test'])
+		self.assertEqual((self.server.count('a.test'), self.server.count('short.test'), self.server.count('nx.test')),
+			(1, 1, 1))
+		sleep(1.1)
+		self.assertEqual(self.resolver.resolve('short.test'), '5.6.7.8')
+		self.assertEqual((self.server.count('a.test'), self.server.count('short.test')), (1, 2))
+
+	def test_resolve_raises(self):
+		self.assertRaises(socket.gaierror, self.resolver.resolve, 'nx.test')
+
+	def test_concurrent_callers_share_queries(self):
+		results = list()
+		threads = [Thread(target=lambda: results.append(self.resolver.resolve_many(['slow.test', 'a.test'])))
+			for _ in range(10)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
+		# waiters get the owner's result, AAAA fallback included, however long it took
+		self.assertEqual([each['slow.test'] for each in results], [['2001:db8::2']] * 10)
+		self.assertEqual((self.server.count('slow.test'), self.server.count('slow.test', RecordTypes.AAAA)), (1, 1))
+
+	def test_search_domains(self):
+		self.resolver._search = ['corp.example']
+		getaddrinfo = socket.getaddrinfo
+		completed = list()
+
+		def system_resolver(host, *args):
+			completed.append(host)
+			if host == 'nx.test': # as if nx.test.corp.example existed
+				return [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('10.1.1.1', 0))]
+			raise socket.gaierror(socket.EAI_NONAME, 'Name or service not known')
+
+		socket.getaddrinfo = system_resolver
+		try:
+			results = self.resolver.resolve_many(['nx.test', 'nx2.test', 'fqdn.test.'])
+		finally:
+			socket.getaddrinfo = getaddrinfo
+		self.assertEqual(results['nx.test'], ['10.1.1.1'])
+		self.assertEqual(results['nx2.test'], [])
+		self.assertEqual(results['fqdn.test.'], [])
+		self.assertEqual(sorted(completed), ['nx.test', 'nx2.test']) # not the fully qualified name
+
+	def test_query_many(self):
+		answers = self.resolver.query_many([('a.test', RecordTypes.A), ('v6.test', RecordTypes.AAAA),
+			('nx.test', RecordTypes.A)])
+		self.assertTrue(answers[('a.test', RecordTypes.A)].ok)
+		self.assertEqual(answers[('v6.test', RecordTypes.AAAA)].values(), ['2001:db8::1'])
+		self.assertEqual(answers[('nx.test', RecordTypes.A)].rcode, DNSAnswer.NXDOMAIN)
+
+	def test_no_server(self):
+		self.server.close()
+		answer = Resolver([self.server.address], timeout=.2).query_many([('a.test', RecordTypes.A)])
+		self.assertIsNone(answer[('a.test', RecordTypes.A)].rcode)
+
+	def test_set_servers(self):
+		self.resolver.set_servers(['192.0.2.1', '192.0.2.1:5353', '[2001:db8::1]:5353', '[2001:db8::1]', '2001:db8::1'])
+		self.assertEqual(self.resolver.servers, [('192.0.2.1', 53), ('192.0.2.1', 5353), ('2001:db8::1', 5353),
+			('2001:db8::1', 53), ('2001:db8::1', 53)])
+
+
+if __name__ == '__main__':
+	unittest.main()
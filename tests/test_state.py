@@ -0,0 +1,152 @@
+from os.path import dirname, abspath, join, getsize
+from shutil import rmtree
+from tempfile import mkdtemp
+from time import time
+import unittest
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from state import StateFile, StatusTable
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+# clem 18/10/2026
+class StateFileTest(unittest.TestCase):
+	""" runs are simulated by new StateFile instances on the same file """
+	def setUp(self):
+		self.dir = mkdtemp()
+		self.path = join(self.dir, 'state.db')
+
+	def tearDown(self):
+		rmtree(self.dir)
+
+	def reopen(self, state):
+		state.close()
+		return StateFile(self.path)
+
+	def test_round_trip(self):
+		state = StateFile(self.path)
+		self.assertEqual(state.get('a'), None)
+		started = time()
+		state.set('a', True, .25)
+		state.set('b', False)
+		state.set('c', None, 1.5)
+		state = self.reopen(state)
+		status, changed, latency = state.get('a')
+		self.assertEqual((status, latency), (True, .25))
+		self.assertTrue(started <= changed <= time())
+		self.assertEqual(state.get('b')[::2], (False, None))
+		self.assertEqual(state.get('c')[::2], (None, 1.5))
+		self.assertEqual(len(state), 3)
+		state.close()
+
+	def test_change_time(self):
+		""" the change time only moves when the status changes """
+		state = StateFile(self.path)
+		state.set('a', True)
+		changed = state.get('a')[1]
+		state.set('a', True, .5)
+		self.assertEqual(state.get('a')[1], changed)
+		state = self.reopen(state)
+		state.set('a', False)
+		self.assertTrue(state.get('a')[1] > changed)
+		state.close()
+
+	def test_growth(self):
+		state = StateFile(self.path)
+		count = StateFile.GROWTH * 2 + 10
+		for number in range(count):
+			state.set('check%s' % number, number % 2 == 0, number / 1000.)
+		self.assertTrue(getsize(self.path) >= state._offset(count))
+		state = self.reopen(state)
+		self.assertEqual(len(state), count)
+		for number in (0, StateFile.GROWTH - 1, StateFile.GROWTH, count - 1):
+			status, _, latency = state.get('check%s' % number)
+			self.assertEqual(status, number % 2 == 0)
+			self.assertAlmostEqual(latency, number / 1000., 6) # stored as a float
+		state.set('one more', True)
+		self.assertEqual(len(self.reopen(state)), count + 1)
+
+	def test_invalid_file(self):
+		for content in ('not a state file at all', 'IMS1\xff\xff\x00\x00'): # wrong magic, count beyond the file
+			with open(self.path, 'wb') as state_file:
+				state_file.write(content)
+			state = StateFile(self.path)
+			self.assertEqual(len(state), 0)
+			self.assertEqual(state.get('a'), None)
+			state.set('a', True)
+			state = self.reopen(state)
+			self.assertEqual(state.get('a')[0], True)
+			state.close()
+
+	def test_long_keys(self):
+		state = StateFile(self.path)
+		first, second = 'x' * StateFile.KEY_SIZE + '1', 'x' * StateFile.KEY_SIZE + '2' # the same first KEY_SIZE chars
+		exact = 'y' * StateFile.KEY_SIZE
+		state.set(first, True)
+		state.set(second, False)
+		state.set(exact, None, 2.)
+		state = self.reopen(state)
+		self.assertEqual(state.get(first)[0], True)
+		self.assertEqual(state.get(second)[0], False)
+		self.assertEqual(state.get(exact)[::2], (None, 2.))
+		self.assertEqual(state.get('x' * StateFile.KEY_SIZE), None)
+		self.assertEqual(sorted(state._index)[:2], sorted([StateFile._key(first), StateFile._key(second)]))
+		state.close()
+
+
+# clem 18/10/2026
+class StatusTableTest(unittest.TestCase):
+	def test_rows(self):
+		table = StatusTable()
+		rows = [table.add() for _ in range(5)]
+		self.assertEqual(rows, range(5))
+		self.assertFalse(table.loaded(0))
+		self.assertEqual(table.get(0), (None, None, None))
+		table.set(1, True, 12., .5)
+		table.set(2, False)
+		self.assertTrue(table.loaded(1) and table.loaded(2))
+		self.assertEqual(table.get(1), (True, 12., .5))
+		self.assertEqual(table.get(2), (False, None, None))
+		self.assertEqual(table.nbytes, 5 * 17)
+
+	def test_nan_is_none(self):
+		""" unknown times are stored as NaN, and read back as None (not NaN, which is not equal to itself) """
+		table = StatusTable()
+		number = table.add()
+		table.set(number, None, None, float('nan'))
+		self.assertTrue(table.loaded(number))
+		self.assertEqual(table.get(number), (None, None, None))
+		table.set(number, True, float('nan'), 0.)
+		self.assertEqual(table.get(number), (True, None, 0.))
+
+	def test_free_and_reuse(self):
+		table = StatusTable()
+		rows = [table.add() for _ in range(4)]
+		for number in rows:
+			table.set(number, True, 1., 1.)
+		table.free([1, 3])
+		self.assertEqual(len(table), 2)
+		reused = sorted([table.add(), table.add()])
+		self.assertEqual(reused, [1, 3])
+		for number in reused: # unloaded again
+			self.assertFalse(table.loaded(number))
+			self.assertEqual(table.get(number), (None, None, None))
+		self.assertEqual(table.get(0), (True, 1., 1.))
+		self.assertEqual(table.add(), 4) # none left to reuse
+		self.assertEqual(len(table), 5)
+		for _ in range(10): # rows added and freed over and over do not grow the table
+			table.free([table.add()])
+		self.assertEqual(len(table._status), 6)
+
+	def test_lock_stripes(self):
+		table = StatusTable()
+		self.assertTrue(table.lock(0) is table.lock(StatusTable.LOCK_STRIPES))
+		self.assertTrue(table.lock(0) is not table.lock(1))
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,79 @@
+from os.path import dirname, abspath
+import unittest
+import socket
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from networking import tcp_connect_many, get_free_port
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+# clem 18/10/2026
+class TCPConnectManyTest(unittest.TestCase):
+	""" connects to listeners of this host, and to ports nothing listens to """
+	LISTENERS = 20
+
+	def setUp(self):
+		self.listeners = list()
+		for _ in range(self.LISTENERS):
+			listener = socket.socket()
+			listener.bind(('127.0.0.1', 0))
+			listener.listen(128)
+			self.listeners.append(listener)
+		self.open_ports = [listener.getsockname()[1] for listener in self.listeners]
+
+	def tearDown(self):
+		for listener in self.listeners:
+			listener.close()
+
+	def test_open_and_closed(self):
+		closed_port = get_free_port()
+		targets = [('127.0.0.1', port) for port in self.open_ports] + [('127.0.0.1', closed_port)]
+		results = tcp_connect_many(targets, timeout=2)
+		self.assertEqual(set(results), set(targets))
+		for port in self.open_ports:
+			self.assertTrue(results[('127.0.0.1', port)] >= 0)
+		self.assertIsNone(results[('127.0.0.1', closed_port)])
+
+	def test_more_targets_than_in_flight(self):
+		targets = [('127.0.0.1', port) for port in self.open_ports]
+		results = tcp_connect_many(targets, timeout=2, max_in_flight=3)
+		self.assertTrue(all(results[target] is not None for target in targets))
+
+	def test_duplicates_and_names(self):
+		port = self.open_ports[0]
+		targets = [('127.0.0.1', port), ('127.0.0.1', port), ('localhost', port)]
+		results = tcp_connect_many(targets)
+		self.assertEqual(len(results), 2)
+		self.assertIsNotNone(results[('127.0.0.1', port)])
+
+	def test_invalid_port(self):
+		results = tcp_connect_many([('127.0.0.1', 'http80')])
+		self.assertIsNone(results[('127.0.0.1', 'http80')])
+
+	def test_timeout(self):
+		# a listener whose backlog is full does not accept connections anymore, so they time out (or are refused)
+		listener = socket.socket()
+		listener.bind(('127.0.0.1', 0))
+		listener.listen(0)
+		self.listeners.append(listener)
+		address = listener.getsockname()
+		fillers = list()
+		for _ in range(8):
+			filler = socket.socket()
+			filler.setblocking(False)
+			filler.connect_ex(address)
+			fillers.append(filler)
+		try:
+			results = tcp_connect_many([address], timeout=.5, timeouts={address: .3})
+		finally:
+			for filler in fillers:
+				filler.close()
+		self.assertIsNone(results[address])
+
+
+if __name__ == '__main__':
+	unittest.main()
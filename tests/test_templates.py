@@ -0,0 +1,87 @@
+from os.path import dirname, abspath
+import unittest
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from templates import expand_values, CheckTemplate, TemplateError
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+# clem 18/10/2026
+class ExpandValuesTest(unittest.TestCase):
+	def expand(self, spec, max_count=1000):
+		return expand_values(spec, max_count)
+
+	def test_literals(self):
+		self.assertEqual(self.expand('a b,c'), ['a', 'b', 'c'])
+
+	def test_number_range(self):
+		self.assertEqual(self.expand('8-10 80'), ['8', '9', '10', '80'])
+
+	def test_name_range(self):
+		self.assertEqual(self.expand('node[08-10].example.com'),
+			['node08.example.com', 'node09.example.com', 'node10.example.com'])
+		self.assertEqual(self.expand('n[9-10]'), ['n9', 'n10'])
+
+	def test_address_range(self):
+		self.assertEqual(self.expand('10.0.0.254-10.0.1.1'), ['10.0.0.254', '10.0.0.255', '10.0.1.0', '10.0.1.1'])
+		self.assertEqual(self.expand('2001:db8::ff-2001:db8::100'), ['2001:db8::ff', '2001:db8::100'])
+		self.assertRaises(TemplateError, self.expand, '10.0.0.5-10.0.0.1')
+		self.assertRaises(TemplateError, self.expand, '10.0.0.1-2001:db8::1')
+
+	def test_cidr(self):
+		self.assertEqual(self.expand('10.0.0.0/30'), ['10.0.0.1', '10.0.0.2']) # without network and broadcast
+		self.assertEqual(self.expand('10.0.0.7/31'), ['10.0.0.6', '10.0.0.7'])
+		self.assertEqual(self.expand('10.0.0.9/32'), ['10.0.0.9'])
+		self.assertEqual(len(self.expand('10.1.0.0/24')), 254)
+		self.assertEqual(self.expand('2001:db8::/127'), ['2001:db8::', '2001:db8::1'])
+		self.assertRaises(TemplateError, self.expand, '10.0.0.0/33')
+		self.assertRaises(TemplateError, self.expand, '10.0.0.0/x')
+
+	def test_paths_and_urls_are_literals(self):
+		self.assertEqual(self.expand('/health /api/v1/status http://example.com/x a/b'),
+			['/health', '/api/v1/status', 'http://example.com/x', 'a/b'])
+
+	def test_max_count(self):
+		self.assertEqual(len(self.expand('1-10', 10)), 10)
+		self.assertRaises(TemplateError, self.expand, '1-11', 10)
+		self.assertRaises(TemplateError, self.expand, '10.0.0.0/8', 1000)
+
+
+# clem 18/10/2026
+class CheckTemplateTest(unittest.TestCase):
+	def test_expand(self):
+		template = CheckTemplate('web', [('for_host', '10.0.0.1-10.0.0.2'), ('for_path', '/ /health'),
+			('type', 'url'), ('data', 'http://{host}{path}'), ('name', 'web {host}{path}')])
+		self.assertEqual(len(template), 4)
+		checks = dict(template.expand())
+		self.assertEqual(sorted(checks), ['web-10.0.0.1-/', 'web-10.0.0.1-/health', 'web-10.0.0.2-/',
+			'web-10.0.0.2-/health'])
+		self.assertEqual(dict(checks['web-10.0.0.2-/health']), {'type': 'url', 'data': 'http://10.0.0.2/health',
+			'name': 'web 10.0.0.2/health'})
+
+	def test_id_item(self):
+		template = CheckTemplate('tcp', [('for_port', '22 80'), ('for_host', 'db[1-2]'), ('id', '{host}-{port}'),
+			('type', 'tcp'), ('data', '{host} {port}')])
+		self.assertEqual(sorted(check_id for check_id, _ in template.expand()), ['db1-22', 'db1-80', 'db2-22', 'db2-80'])
+
+	def test_ids_are_stable(self):
+		before = dict(CheckTemplate('t', [('for_n', '1-3'), ('data', '{n}')]).expand())
+		after = dict(CheckTemplate('t', [('for_n', '1-4'), ('data', '{n}')]).expand())
+		self.assertTrue(all(after[check_id] == items for check_id, items in before.iteritems()))
+
+	def test_lazy(self):
+		template = CheckTemplate('big', [('for_a', '1-1000'), ('for_b', '1-1000'), ('data', '{a} {b}')])
+		self.assertEqual(len(template), 1000000)
+		self.assertEqual(next(template.expand())[0], 'big-1-1')
+
+	def test_errors(self):
+		self.assertRaises(TemplateError, CheckTemplate, 't', [('for_a', '1-1000'), ('for_b', '1-1000')], 1000)
+		self.assertRaises(TemplateError, CheckTemplate, 't', [('for_a', '')])
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,139 @@
+from os.path import dirname, abspath
+from email.utils import formatdate
+from threading import Event, Lock
+from time import time
+import unittest
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from updates import StatusUpdateQueue, TokenBucket, RateLimited
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+# clem 18/10/2026
+class FakeCheck(object):
+	def __init__(self, check_id):
+		self.id = check_id
+
+
+# clem 18/10/2026
+class FakeSender(object):
+	""" records the batches and heart-beats sent, raising the errors of fail first, and blocking while gate is closed """
+	def __init__(self, *fail):
+		self.batches = list()
+		self.heartbeats = list()
+		self.times = list()
+		self.fail = list(fail)
+		self.gate = Event()
+		self.gate.set()
+		self._lock = Lock()
+
+	def set_many(self, updates):
+		self.gate.wait(5)
+		with self._lock:
+			self.times.append(time())
+			if self.fail:
+				raise self.fail.pop(0)
+			self.batches.append([(check.id, status) for check, status in updates])
+
+	def heartbeat(self, check, old_status, new_status):
+		with self._lock:
+			self.heartbeats.append(check.id)
+
+
+# clem 18/10/2026
+class StatusUpdateQueueTest(unittest.TestCase):
+	def setUp(self):
+		self.checks = dict((key, FakeCheck(key)) for key in 'abcde')
+
+	def queue(self, sender, **kwargs):
+		kwargs.setdefault('flush_delay', .05)
+		return StatusUpdateQueue(sender.set_many, sender.heartbeat, **kwargs)
+
+	def test_coalescing(self):
+		sender = FakeSender()
+		queue = self.queue(sender, flush_delay=.2)
+		a, b, c = self.checks['a'], self.checks['b'], self.checks['c']
+		queue.put(a, True, False)
+		queue.put(a, False, True) # back to its original status
+		queue.put(b, True, False)
+		queue.put(b, False, None)
+		queue.put(c, True, False)
+		queue.put(c, False, False) # a heart-beat does not replace a transition
+		self.assertTrue(queue.join(5))
+		self.assertEqual(sender.batches, [[('b', None), ('c', False)]])
+		self.assertEqual(sender.heartbeats, [])
+		self.assertEqual((queue.sent, queue.coalesced), (2, 3))
+
+	def test_batches_and_heartbeats(self):
+		sender = FakeSender()
+		queue = self.queue(sender, batch_size=2)
+		for key in 'abc':
+			queue.put(self.checks[key], None, True)
+		queue.put(self.checks['d'], True, True)
+		self.assertTrue(queue.join(5))
+		self.assertEqual(sender.batches, [[('a', True), ('b', True)], [('c', True)]])
+		self.assertEqual(sender.heartbeats, ['d'])
+
+	def test_rate_limited(self):
+		""" a batch answered 429 is sent again after Retry-After, merged with the newer updates """
+		sender = FakeSender(RateLimited('.3'))
+		queue = self.queue(sender)
+		sender.gate.clear()
+		queue.put(self.checks['a'], None, True)
+		queue.put(self.checks['b'], None, True)
+		self.assertFalse(queue.join(.2)) # held by the sender
+		sender.gate.set()
+		self.assertTrue(queue.join(5))
+		self.assertEqual(sender.batches, [[('a', True), ('b', True)]])
+		self.assertTrue(sender.times[1] - sender.times[0] >= .3)
+		self.assertEqual((queue.sent, queue.failures), (2, 1))
+
+	def test_put_back_after_error(self):
+		sender = FakeSender(IOError('connection refused'))
+		queue = self.queue(sender)
+		sender.gate.clear()
+		queue.put(self.checks['a'], None, True)
+		queue.put(self.checks['b'], None, True)
+		self.assertFalse(queue.join(.1))
+		queue.put(self.checks['a'], True, False) # while the failing batch is being sent
+		sender.gate.set()
+		self.assertTrue(queue.join(5))
+		self.assertEqual(map(sorted, sender.batches), [[('a', False), ('b', True)]])
+		self.assertTrue(sender.times[1] - sender.times[0] >= 1.) # the first back-off
+
+	def test_parse_retry_after(self):
+		self.assertEqual(RateLimited.parse_retry_after('2'), 2.)
+		self.assertEqual(RateLimited.parse_retry_after('-1'), 0.)
+		self.assertEqual(RateLimited.parse_retry_after(None), RateLimited.DEFAULT_RETRY_AFTER)
+		self.assertEqual(RateLimited.parse_retry_after('soon'), RateLimited.DEFAULT_RETRY_AFTER)
+		self.assertAlmostEqual(RateLimited.parse_retry_after(formatdate(time() + 30, usegmt=True)), 30., delta=1.5)
+
+
+# clem 18/10/2026
+class TokenBucketTest(unittest.TestCase):
+	def timed(self, bucket, count):
+		started = time()
+		for _ in range(count):
+			bucket.acquire()
+		return time() - started
+
+	def test_rate(self):
+		bucket = TokenBucket(20., 5.)
+		self.assertTrue(self.timed(bucket, 5) < .05) # the burst
+		self.assertAlmostEqual(self.timed(bucket, 4), .2, delta=.05)
+
+	def test_no_limit(self):
+		self.assertTrue(self.timed(TokenBucket(), 1000) < .5)
+
+	def test_pause(self):
+		bucket = TokenBucket(100.)
+		bucket.pause(.2)
+		self.assertAlmostEqual(self.timed(bucket, 1), .2, delta=.05)
+
+
+if __name__ == '__main__':
+	unittest.main()
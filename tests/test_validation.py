@@ -0,0 +1,126 @@
+from os.path import dirname, abspath
+import unittest
+import json
+import sys
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+from validation import SubstringValidator, RegexValidator, JSONPathValidator, MaxSizeValidator, get_validator
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+# clem 18/10/2026
+class ChunkedBody(object):
+	""" a body read chunk bytes at most at a time, like a response arriving in small packets """
+	def __init__(self, body, chunk):
+		self.body = body
+		self.chunk = chunk
+		self.position = 0
+
+	def read(self, size):
+		data = self.body[self.position:self.position + min(size, self.chunk)]
+		self.position += len(data)
+		return data
+
+
+# clem 18/10/2026
+class ValidatorTestCase(unittest.TestCase):
+	def assertVerdict(self, factory, body, expected, chunks=None):
+		""" validates body with a new validator of factory, for every chunk size in chunks (all of them by default) """
+		for chunk in chunks or range(1, len(body) + 2):
+			self.assertEqual(factory().validate(ChunkedBody(body, chunk).read), expected, 'chunks of %s' % chunk)
+
+
+# clem 18/10/2026
+class SubstringValidatorTest(ValidatorTestCase):
+	BODY = '<html><body>status: all systems operational</body></html>'
+
+	def test_across_chunks(self):
+		self.assertVerdict(lambda: SubstringValidator('operational'), self.BODY, True)
+		self.assertVerdict(lambda: SubstringValidator('s'), self.BODY, True)
+		self.assertVerdict(lambda: SubstringValidator('degraded'), self.BODY, False)
+
+	def test_stops_reading(self):
+		body = ChunkedBody('OK' + 'x' * 100000, 10)
+		self.assertTrue(SubstringValidator('OK').validate(body.read))
+		self.assertEqual(body.position, 10)
+
+	def test_max_bytes(self):
+		validator = SubstringValidator('operational', 30)
+		body = ChunkedBody(self.BODY, 7)
+		self.assertFalse(validator.validate(body.read))
+		self.assertEqual((validator.read_bytes, body.position), (30, 30))
+		self.assertVerdict(lambda: SubstringValidator('status', 30), self.BODY, True)
+
+
+# clem 18/10/2026
+class RegexValidatorTest(ValidatorTestCase):
+	BODY = 'version: 1.2\nstatus: UP\nchecks: 12 passed\n'
+
+	def test_across_chunks(self):
+		self.assertVerdict(lambda: RegexValidator(r'status:\s*UP'), self.BODY, True)
+		self.assertVerdict(lambda: RegexValidator(r'\d+ passed'), self.BODY, True)
+		self.assertVerdict(lambda: RegexValidator(r'status:\s*DOWN'), self.BODY, False)
+
+	def test_anchors(self):
+		""" the end of a chunk is not the end of a line, a word or the body """
+		self.assertVerdict(lambda: RegexValidator(r'^status: UP$'), self.BODY, True)
+		self.assertVerdict(lambda: RegexValidator(r'status: U$'), self.BODY, False)
+		self.assertVerdict(lambda: RegexValidator(r'\b12\b'), self.BODY, True)
+		self.assertVerdict(lambda: RegexValidator(r'\b2 passed'), self.BODY, False)
+		self.assertVerdict(lambda: RegexValidator(r'passed\n\Z'), self.BODY, True)
+		self.assertVerdict(lambda: RegexValidator(r'UP\Z'), self.BODY, False)
+		self.assertVerdict(lambda: RegexValidator(r'(?<=status: )UP'), self.BODY, True)
+		self.assertVerdict(lambda: RegexValidator(r'12(?= passed)'), self.BODY, True)
+		self.assertVerdict(lambda: RegexValidator(r'12(?! passed)'), self.BODY, False)
+
+	def test_sliding_window(self):
+		body = 'x' * 5000 + 'status: UP' + 'y' * 5000
+		self.assertVerdict(lambda: RegexValidator(r'status: UP', window=100), body, True, [1, 7, 64, 1000, 20000])
+		self.assertVerdict(lambda: RegexValidator(r'^x', window=100), body, True, [1, 7, 64, 1000])
+		self.assertVerdict(lambda: RegexValidator(r'^y', window=100), body, False, [1, 7, 64, 1000])
+
+	def test_max_bytes(self):
+		self.assertVerdict(lambda: RegexValidator(r'passed', len(self.BODY) - 5), self.BODY, False)
+		self.assertVerdict(lambda: RegexValidator(r'status', len(self.BODY) - 5), self.BODY, True)
+
+
+# clem 18/10/2026
+class JSONPathValidatorTest(ValidatorTestCase):
+	BODY = json.dumps({'status': 'UP', 'checks': [{'name': 'db', 'state': True}, {'name': 'cache', 'state': False}]})
+
+	def test_paths(self):
+		for expression, expected in (('status', True), ('status=UP', True), ('status=DOWN', False),
+			('checks.0.state=true', True), ('checks.1.state', False), ('checks.-1.name=cache', True),
+			('checks.2.name', False), ('missing', False), ('status.deeper', False)):
+			self.assertVerdict(lambda: JSONPathValidator(expression), self.BODY, expected, [1, 13, 1000])
+
+	def test_invalid(self):
+		self.assertVerdict(lambda: JSONPathValidator('status'), self.BODY[:-1], False, [7])
+
+	def test_max_bytes(self):
+		self.assertVerdict(lambda: JSONPathValidator('status', len(self.BODY)), self.BODY, True, [1, 7, 1000])
+		self.assertVerdict(lambda: JSONPathValidator('status', len(self.BODY) - 1), self.BODY, False, [1, 7, 1000])
+
+
+# clem 18/10/2026
+class MaxSizeValidatorTest(ValidatorTestCase):
+	def test_size(self):
+		self.assertVerdict(lambda: MaxSizeValidator(10), 'x' * 10, True)
+		self.assertVerdict(lambda: MaxSizeValidator(10), 'x' * 11, False)
+		validator, body = MaxSizeValidator(10), ChunkedBody('x' * 100000, 4)
+		self.assertFalse(validator.validate(body.read))
+		self.assertEqual(body.position, 11) # stopped reading right after the limit
+
+	def test_get_validator(self):
+		self.assertTrue(isinstance(get_validator('max_size', '10'), MaxSizeValidator))
+		self.assertEqual(get_validator('', 'x'), None)
+		self.assertRaises(ValueError, get_validator, 'xml', 'x')
+		self.assertRaises(ValueError, get_validator, 'regex', '(unclosed')
+		self.assertRaises(ValueError, get_validator, 'max_size', 'big')
+
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,312 @@
+from threading import Thread, Lock, Condition
+from collections import OrderedDict
+from logging import getLogger
+from time import time, sleep
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+# clem 18/10/2026
+class RateLimited(IOError):
+	""" the remote API answered HTTP 429 Too Many Requests """
+	DEFAULT_RETRY_AFTER = 5.
+	retry_after = DEFAULT_RETRY_AFTER
+
+	def __init__(self, retry_after=None):
+		self.retry_after = self.parse_retry_after(retry_after)
+		super(RateLimited, self).__init__('Rate limited, retry after %.1f sec' % self.retry_after)
+
+	@classmethod
+	def parse_retry_after(cls, value):
+		""" :param value: Retry-After header value, either a delay in seconds or an HTTP date
+		:type value: str | None
+		:return: the delay in seconds
+		:rtype: float
+		"""
+		from email.utils import parsedate_tz, mktime_tz
+		if not value:
+			return cls.DEFAULT_RETRY_AFTER
+		try:
+			return max(0., float(value))
+		except ValueError:
+			date = parsedate_tz(value)
+			return max(0., mktime_tz(date) - time()) if date else cls.DEFAULT_RETRY_AFTER
+
+
+# clem 18/10/2026
+class TokenBucket(object):
+	""" Thread safe token bucket rate limiter, that can also be paused (i.e. on HTTP 429 Retry-After) """
+	rate = 0.
+	burst = 1.
+
+	def __init__(self, rate=0., burst=None):
+		"""
+
+		:param rate: tokens per second, 0 for no limit
+		:type rate: float
+		:param burst: maximum number of tokens available at once, defaults to max(1, rate)
+		:type burst: float | None
+		"""
+		self.rate = float(rate or 0)
+		self.burst = float(burst or max(1., self.rate))
+		self._tokens = self.burst
+		self._last = time()
+		self._paused_until = 0.
+		self._lock = Lock()
+
+	def pause(self, seconds):
+		""" no token will be given for the next seconds """
+		with self._lock:
+			self._paused_until = max(self._paused_until, time() + seconds)
+			self._tokens = 0.
+
+	def _delay(self):
+		""" takes a token if possible, and returns 0, or returns how long to wait before trying again """
+		with self._lock:
+			now = time()
+			if now < self._paused_until:
+				return self._paused_until - now
+			if not self.rate:
+				return 0.
+			self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+			self._last = now
+			if self._tokens >= 1.:
+				self._tokens -= 1.
+				return 0.
+			return (1. - self._tokens) / self.rate
+
+	def acquire(self):
+		""" blocks until a token is available, and takes it """
+		delay = self._delay()
+		while delay:
+			sleep(delay)
+			delay = self._delay()
+
+
+# clem 18/10/2026
+class _Update(object):
+	""" a pending status update of a check, or heart-beat if its status did not change """
+	def __init__(self, check_instance, old_status, new_status, seqs=None):
+		self.check = check_instance
+		self.old_status = old_status
+		self.new_status = new_status
+		self.seqs = seqs or list() # of its Outbox records
+
+	@property
+	def is_heartbeat(self):
+		return self.old_status == self.new_status
+
+
+# clem 18/10/2026
+class StatusUpdateQueue(object):
+	""" Queue of check status updates, between the checks and the remote status page, flushed on a background thread
+
+	Putting updates never blocks. Successive updates of the same check are coalesced : only the last status is sent,
+	and nothing at all if the check went back to its original status meanwhile. Pending transitions are sent in
+	batches of up to batch_size through set_many([(check_instance, status), ...]). Heart-beats (calls with an unchanged
+	status) are sent through heartbeat(check_instance, old_status, new_status) and superseded by any transition.
+	Failed batches are put back in the queue, after the delay requested by a RateLimited error, or after a growing
+	back-off for other errors.
+	With an Outbox, transitions are logged to disk when put and acknowledged once sent, and the ones a previous run did
+	not send are replayed first, resolving check ids to check instances with resolve(check_id).
+	"""
+	DEFAULT_BATCH_SIZE = 50
+	MAX_BACKOFF = 60.
+	REPLAY_CHUNK = 500
+
+	batch_size = DEFAULT_BATCH_SIZE
+	flush_delay = .2
+	sent = 0
+	coalesced = 0
+	failures = 0
+	_thread = None
+	_busy = False
+
+	def __init__(self, set_many, heartbeat=None, batch_size=DEFAULT_BATCH_SIZE, flush_delay=.2, outbox=None,
+		resolve=None):
+		"""
+
+		:param set_many: function updating a list of (check_instance, status) on the remote service
+		:type set_many: callable
+		:param heartbeat: function called for updates with an unchanged status
+		:type heartbeat: callable | None
+		:param batch_size: maximum number of transitions sent at once
+		:type batch_size: int
+		:param flush_delay: how long to wait for more updates to batch, after the first one is queued, in seconds
+		:type flush_delay: float
+		:param outbox: durable log of the pending transitions
+		:type outbox: outbox.Outbox | None
+		:param resolve: function returning the check instance of a check id, or None if it does not exist anymore
+		:type resolve: callable | None
+		"""
+		assert callable(set_many)
+		self._set_many = set_many
+		self._heartbeat = heartbeat if callable(heartbeat) else None
+		self.batch_size = max(1, int(batch_size))
+		self.flush_delay = flush_delay
+		self._pending = OrderedDict() # check id : _Update
+		self._first_put = 0.
+		self._backoff = 0.
+		self._outbox = outbox
+		self._resolve = resolve if callable(resolve) else lambda _: None
+		self._cond = Condition(Lock())
+
+	def start(self):
+		""" starts the background sending (and replay of the Outbox), done on first put() otherwise """
+		if not self._thread:
+			self._thread = Thread(target=self._run, name='status-updates')
+			self._thread.daemon = True
+			self._thread.start()
+
+	def _merge(self, update):
+		""" adds update to the pending ones, coalescing it with any pending one of the same check (to call locked) """
+		key = update.check.id
+		previous = self._pending.pop(key, None)
+		if previous:
+			self.coalesced += 1
+			if update.is_heartbeat and not previous.is_heartbeat:
+				update = previous # a heart-beat does not replace a transition
+			elif not update.is_heartbeat:
+				update = _Update(update.check, previous.old_status, update.new_status, previous.seqs + update.seqs)
+				if update.is_heartbeat: # back to its original status, nothing to send
+					self._ack(update)
+					return
+		if not self._pending:
+			self._first_put = time()
+		self._pending[key] = update
+
+	def _ack(self, *updates):
+		if self._outbox:
+			self._outbox.ack(sum((update.seqs for update in updates), list()))
+
+	def put(self, check_instance, old_status, new_status):
+		""" queues an update of check_instance (a heart-beat if its status did not change) """
+		update = _Update(check_instance, old_status, new_status)
+		if self._outbox and not update.is_heartbeat:
+			update.seqs.append(self._outbox.append(check_instance.id, old_status, new_status))
+		with self._cond:
+			self._merge(update)
+			self._cond.notify_all()
+		self.start()
+
+	@property
+	def pending_count(self):
+		return len(self._pending)
+
+	def _take(self):
+		""" waits for the next batch and removes it from the pending ones
+
+		:return: a list of transitions and a list of heart-beats
+		:rtype: (list[_Update], list[_Update])
+		"""
+		with self._cond:
+			while True:
+				while not self._pending:
+					self._cond.wait()
+				delay = max(self._first_put + self.flush_delay, self._backoff) - time()
+				if delay <= 0:
+					break
+				self._cond.wait(delay)
+			transitions, heartbeats = list(), list()
+			for key in list(self._pending):
+				if len(transitions) >= self.batch_size:
+					break
+				update = self._pending.pop(key)
+				(heartbeats if update.is_heartbeat else transitions).append(update)
+			self._first_put = time() if self._pending else 0.
+			self._busy = True
+			return transitions, heartbeats
+
+	def _put_back(self, updates):
+		""" re-queues failed updates, ahead of the newer ones """
+		with self._cond:
+			newer, self._pending = self._pending, OrderedDict()
+			for update in updates + newer.values():
+				self._merge(update)
+			self._first_put = time()
+
+	def _send(self, transitions):
+		try:
+			if transitions:
+				self._set_many([(update.check, update.new_status) for update in transitions])
+				self.sent += len(transitions)
+				self._ack(*transitions)
+			self._backoff = 0.
+			return True
+		except RateLimited as e:
+			logger.warning('status update : %s' % e)
+			self._backoff = time() + e.retry_after
+		except Exception as e:
+			logger.exception('status update failed : %s' % e)
+			self._backoff = time() + min(self.MAX_BACKOFF, 2 ** min(self.failures, 6))
+		self.failures += 1
+		self._put_back(transitions)
+		return False
+
+	def _replay(self):
+		""" puts back the updates the previous run did not send, by chunks so as not to hold the queue for long """
+		try:
+			records = self._outbox.replay()
+		except (IOError, OSError) as e:
+			logger.exception('Outbox replay failed : %s' % e)
+			return
+		for i in range(0, len(records), self.REPLAY_CHUNK):
+			updates = list()
+			for seq, check_id, old_status, new_status in records[i:i + self.REPLAY_CHUNK]:
+				check_instance = self._resolve(check_id)
+				if check_instance is not None:
+					updates.append(_Update(check_instance, old_status, new_status, [seq]))
+				else:
+					logger.info('Outbox : dropping update of unknown check %s' % check_id)
+					self._outbox.ack([seq])
+			self._put_back(updates)
+
+	def _run(self):
+		if self._outbox:
+			self._replay()
+		while True:
+			transitions, heartbeats = self._take()
+			try:
+				if self._send(transitions) and self._heartbeat:
+					for update in heartbeats:
+						try:
+							self._heartbeat(update.check, update.old_status, update.new_status)
+						except Exception as e: # next round will send a new one anyway
+							logger.warning('heart-beat of %s failed : %s' % (update.check.id, e))
+			finally:
+				with self._cond:
+					self._busy = False
+					self._cond.notify_all()
+
+	def join(self, timeout=None):
+		""" blocks until all the pending updates are sent, or timeout
+
+		:type timeout: float | None
+		:return: whether the queue is empty
+		:rtype: bool
+		"""
+		end = time() + timeout if timeout is not None else None
+		with self._cond:
+			while self._pending or self._busy:
+				remaining = end - time() if end is not None else None
+				if remaining is not None and remaining <= 0:
+					return False
+				self._cond.wait(remaining)
+		return True
+
+	def close(self):
+		""" flushes the Outbox to disk, the updates still pending will be sent by the next run """
+		if self._outbox:
+			self._outbox.close()
+
+	def __str__(self):
+		return 'status updates : %s sent, %s pending, %s coalesced, %s failures' % \
+			(self.sent, self.pending_count, self.coalesced, self.failures)
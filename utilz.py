@@ -1,5 +1,5 @@
 from ConfigParser import SafeConfigParser, NoSectionError, NoOptionError
-from os.path import isfile, basename
+from os.path import isfile, basename, dirname, join
 from collections import OrderedDict
 from logging import getLogger
 from threading import Lock
@@ -238,6 +238,10 @@ class ConfigFileNotFound(IOError):
 class ConfigObject(object):
 	CONFIG_GENERAL_SECTION = 'DEFAULT'
 	__config = None
+	__values = None # (section, option) : interpolated value, or _MISSING, of the current config
+	__compiled = None
+	_MISSING = object()
+	COMPILED_SUFFIX = None # set (i.e. to '.compiled') to keep a compiled copy of the config file, see config_cache
 	label = ''
 	name = ''
 	
@@ -255,10 +259,14 @@ class ConfigObject(object):
 		return getLogger()
 	
 	# clem 27/05/2016
-	def _load_config(self):
-		""" Load the config file in a ConfigParser.SafeConfigParser object """
+	def _load_config(self, data=None):
+		""" Load the config file (or data, its content) in a ConfigParser.SafeConfigParser object """
 		config = SafeConfigParser()
-		config.readfp(open(self.config_file_path))
+		if data is None:
+			config.readfp(open(self.config_file_path))
+		else:
+			from cStringIO import StringIO
+			config.readfp(StringIO(data), self.config_file_path)
 		self.log.debug(
 			'Config : loaded and parsed %s / %s ' % (basename(self.config_file_path), self.__class__.__name__))
 		return config
@@ -275,6 +283,81 @@ class ConfigObject(object):
 				raise ConfigFileNotFound(msg)
 		return self.__config
 	
+	# clem 18/10/2026
+	@property
+	def _compiled_path(self):
+		""" path of the compiled copy of the config file (hidden, next to it) """
+		return join(dirname(self.config_file_path), '.%s%s' % (basename(self.config_file_path), self.COMPILED_SUFFIX))
+	
+	# clem 18/10/2026
+	def _load(self):
+		""" reads the config file, from its compiled copy if COMPILED_SUFFIX is set and the copy is up to date, parsing
+		it (and saving its compiled copy) otherwise
+
+		:return: the parsed config (None if the compiled copy was used), and the compiled config (None if not enabled,
+			or if the config could not be compiled)
+		:rtype: (SafeConfigParser | None, config_cache.CompiledConfig | None)
+		:raise: IOError, ConfigParser.Error
+		"""
+		if not self.COMPILED_SUFFIX:
+			return self._load_config(), None
+		from config_cache import CompiledConfig
+		with open(self.config_file_path, 'rb') as config_file:
+			data = config_file.read()
+		digest = CompiledConfig.digest_of(data)
+		compiled = CompiledConfig.load(self._compiled_path, digest)
+		if compiled is not None:
+			self.log.debug('Config : loaded %s from its compiled copy' % basename(self.config_file_path))
+			return None, compiled
+		config = self._load_config(data)
+		compiled = CompiledConfig.compile(config, digest)
+		if compiled is not None:
+			compiled.save(self._compiled_path)
+		return config, compiled
+	
+	# clem 18/10/2026
+	@property
+	def compiled(self):
+		""" the compiled config if COMPILED_SUFFIX is set, None otherwise
+		
+		:rtype: config_cache.CompiledConfig | None
+		"""
+		if self.COMPILED_SUFFIX and self.__compiled is None:
+			if not isfile(self.config_file_path):
+				msg = 'Config file %s not found' % self.config_file_path
+				self.log.error(msg)
+				raise ConfigFileNotFound(msg)
+			config, self.__compiled = self._load()
+			if config:
+				self.__config = config
+		return self.__compiled
+	
+	# clem 18/10/2026
+	def reload(self):
+		""" re-reads the config file, the current configuration being kept if it cannot be read or parsed
+
+		:raise: IOError, ConfigParser.Error
+		"""
+		config, compiled = self._load()
+		self.__config, self.__compiled, self.__values = config, compiled, None
+	
+	# clem 18/10/2026
+	def _cached_value(self, section, option):
+		""" :return: the value of option, _MISSING if it does not exist, interpolated only once per loaded config
+		:raise: AttributeError
+		"""
+		if self.__values is None:
+			self.__values = dict()
+		key = (section, option)
+		value = self.__values.get(key)
+		if value is None:
+			try:
+				value = (self.compiled or self.config).get(section, option)
+			except (NoSectionError, NoOptionError):
+				value = self._MISSING
+			self.__values[key] = value
+		return value
+	
 	# clem 27/05/2016
 	def get_value(self, section, option):
 		""" get a string value from the config file with error handling (i.e. config.get() )
@@ -288,7 +371,10 @@ class ConfigObject(object):
 		:raise: self.ConfigParser.NoSectionError, AttributeError, self.ConfigParser.NoOptionError
 		"""
 		try:
-			return self.config.get(section, option)
+			value = self._cached_value(section, option)
+			if value is self._MISSING:
+				return self.config.get(section, option) # raises with the actual error
+			return value
 		except (NoSectionError, AttributeError, NoOptionError) as e:
 			self.log.warning('NotFound : %s' % str(e))
 			raise
@@ -307,14 +393,29 @@ class ConfigObject(object):
 		if not section:
 			section = self.CONFIG_GENERAL_SECTION
 		return self.get_value(section, property_name)
-	
+
+	# clem 18/10/2026
+	def get_or_default(self, property_name, default=None, section=None):
+		""" same as get() but returns default instead of raising if the option (or the section) is missing
+
+		:param property_name: name of the option value to get
+		:type property_name: basestring
+		:param default: value to return if not found
+		:param section: name of the section
+		:type section: basestring
+		:return: the option value or default
+		:rtype: str
+		"""
+		value = self._cached_value(section or self.CONFIG_GENERAL_SECTION, property_name)
+		return default if value is self._MISSING else value
+
 	@property
 	def sections(self):
 		""" same as ConfigParser function except that it returns a custom list that supports - and + ensemble operation
 
 		:rtype: EnsList
 		"""
-		return EnsList(self.config.sections())
+		return EnsList((self.compiled or self.config).sections())
 	
 	def _items(self, section, raw=False, x_vars=None):
 		""" same as ConfigParser function except that it returns a custom list that supports - and + ensemble operation
@@ -324,6 +425,8 @@ class ConfigObject(object):
 		:type x_vars:
 		:rtype: EnsList
 		"""
+		if not raw and not x_vars and self.compiled:
+			return EnsList(self.compiled.items(section))
 		return EnsList(self.config.items(section, raw, x_vars))
 	
 	def section(self, section_name=CONFIG_GENERAL_SECTION):
@@ -338,3 +441,4 @@ class ConfigObject(object):
 	
 	def save(self):
 		self.config.write(open(self.config_file_path, 'w'))
+		self.__compiled, self.__values = None, None
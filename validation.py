@@ -0,0 +1,246 @@
+from utilz import FunctionEnum
+from logging import getLogger
+import json
+import re
+
+__version__ = '0.1'
+__author__ = 'clem'
+__date__ = '18/10/2026'
+
+
+def get_logger():
+	return getLogger(__name__)
+
+logger = get_logger()
+
+
+# clem 18/10/2026
+class BodyValidator(object):
+	""" Base of the streaming validators of a response body : the body is fed to it chunk by chunk as it is read, and
+	reading stops as soon as it reached a verdict, or max_bytes were read (the verdict being then the one of a body
+	ending there), so that the body is never entirely buffered in memory.
+	"""
+	DEFAULT_MAX_BYTES = 1024 * 1024
+	CHUNK_SIZE = 8192
+
+	max_bytes = DEFAULT_MAX_BYTES
+	read_bytes = 0
+	verdict = None # None until decided
+
+	def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+		"""
+
+		:param max_bytes: maximum number of bytes read
+		:type max_bytes: int
+		"""
+		self.max_bytes = max_bytes
+
+	def _feed(self, chunk):
+		""" to override : processes the next chunk of the body
+
+		:type chunk: str
+		:return: the verdict if it can already be decided, None otherwise
+		:rtype: bool | None
+		"""
+		return None
+
+	def _finish(self):
+		""" to override : the verdict once the whole body (or max_bytes of it) was fed
+
+		:rtype: bool
+		"""
+		return False
+
+	def feed(self, chunk):
+		""" :type chunk: str
+		:return: the verdict if decided, None otherwise
+		:rtype: bool | None
+		"""
+		if self.verdict is None:
+			chunk = chunk[:self.max_bytes - self.read_bytes]
+			self.read_bytes += len(chunk)
+			self.verdict = self._feed(chunk)
+			if self.verdict is None and self.read_bytes >= self.max_bytes:
+				self.verdict = self._finish()
+		return self.verdict
+
+	def finish(self):
+		""" to call once the body ended
+
+		:rtype: bool
+		"""
+		if self.verdict is None:
+			self.verdict = self._finish()
+		return self.verdict
+
+	def validate(self, read):
+		""" reads and validates the body until a verdict is reached
+
+		:param read: function reading up to n bytes of the body, returning '' once it ended (i.e. response.read)
+		:type read: callable
+		:rtype: bool
+		"""
+		while self.verdict is None:
+			chunk = read(min(self.CHUNK_SIZE, self.max_bytes - self.read_bytes))
+			if not chunk:
+				return self.finish()
+			self.feed(chunk)
+		return self.verdict
+
+
+# clem 18/10/2026
+class SubstringValidator(BodyValidator):
+	""" the body contains a string """
+	def __init__(self, needle, max_bytes=BodyValidator.DEFAULT_MAX_BYTES):
+		super(SubstringValidator, self).__init__(max_bytes)
+		self.needle = needle
+		self._tail = '' # end of the previous chunks, for a match across two chunks
+
+	def _feed(self, chunk):
+		window = self._tail + chunk
+		if self.needle in window:
+			return True
+		self._tail = window[-(len(self.needle) - 1):] if len(self.needle) > 1 else ''
+		return None
+
+
+# clem 18/10/2026
+class RegexValidator(BodyValidator):
+	""" the body matches a regular expression, searched in a sliding window so that a match may span several chunks
+	(but not be longer than window bytes)
+
+	A match is only accepted before the end of the body if some data follows it, so that assertions at its end ($, \Z,
+	\b) are decided by the actual body, and the window keeps CONTEXT bytes before its start for ^ and look-behinds.
+	Lookaheads may depend on any later data : patterns having one are searched in the whole body (up to max_bytes)
+	once it ended.
+	"""
+	DEFAULT_WINDOW = 64 * 1024
+	CONTEXT = 256
+
+	def __init__(self, pattern, max_bytes=BodyValidator.DEFAULT_MAX_BYTES, window=DEFAULT_WINDOW):
+		super(RegexValidator, self).__init__(max_bytes)
+		self.regex = re.compile(pattern, re.MULTILINE)
+		self.window = window
+		self._buffered = '(?=' in pattern or '(?!' in pattern
+		self._chunks = list()
+		self._tail = ''
+		self._start = 0 # where the window starts in _tail, the rest being context
+
+	def _feed(self, chunk):
+		if self._buffered:
+			self._chunks.append(chunk)
+			return None
+		window = self._tail + chunk
+		match = self.regex.search(window, self._start)
+		if match and match.end() < len(window):
+			return True
+		if len(window) - self._start > self.window:
+			self._tail = window[-(self.window + self.CONTEXT):]
+			self._start = max(0, len(self._tail) - self.window)
+		else:
+			self._tail = window
+		return None
+
+	def _finish(self):
+		if self._buffered:
+			body, self._chunks = ''.join(self._chunks), list()
+			return self.regex.search(body) is not None
+		return self.regex.search(self._tail, self._start) is not None
+
+
+# clem 18/10/2026
+class JSONPathValidator(BodyValidator):
+	""" the JSON body has a value at a path, i.e. "status" (any true value), "status=UP" or "checks.0.state=true"
+	(compared to the JSON text of the value, unless a string). The body has to be parsed as a whole, so it is buffered,
+	but never beyond max_bytes. """
+	def __init__(self, expression, max_bytes=BodyValidator.DEFAULT_MAX_BYTES):
+		super(JSONPathValidator, self).__init__(max_bytes + 1) # one more byte, to tell a body of max_bytes from a longer one
+		self.limit = max_bytes
+		path, self.has_expected, self.expected = expression.partition('=')
+		self.path = [each for each in path.strip().split('.') if each]
+		self.expected = self.expected.strip()
+		self._chunks = list()
+		self._truncated = False
+
+	def _feed(self, chunk):
+		self._chunks.append(chunk)
+		self._truncated = self.read_bytes > self.limit
+		return None
+
+	def _resolve(self, document):
+		for key in self.path:
+			if isinstance(document, list) and key.lstrip('-').isdigit():
+				document = document[int(key)]
+			elif isinstance(document, dict):
+				document = document[key]
+			else:
+				raise KeyError(key)
+		return document
+
+	def _finish(self):
+		if self._truncated:
+			logger.warning('JSON body larger than %s bytes' % self.limit)
+			return False
+		try:
+			value = self._resolve(json.loads(''.join(self._chunks)))
+		except ValueError as e:
+			logger.warning('invalid JSON body : %s' % e)
+			return False
+		except (KeyError, IndexError):
+			return False
+		finally:
+			self._chunks = list()
+		if not self.has_expected:
+			return bool(value)
+		return (value if isinstance(value, basestring) else json.dumps(value)) == self.expected
+
+
+# clem 18/10/2026
+class MaxSizeValidator(BodyValidator):
+	""" the body is not larger than a number of bytes """
+	def __init__(self, size):
+		self.size = int(size)
+		super(MaxSizeValidator, self).__init__(self.size + 1)
+
+	def _feed(self, chunk):
+		return False if self.read_bytes > self.size else None
+
+	def _finish(self):
+		return self.read_bytes <= self.size
+
+
+# clem 18/10/2026
+class Validators(FunctionEnum):
+	""" the factories of the BodyValidator of each validation type (pass_t of a check), from its data (pass_d) """
+	@staticmethod
+	def substring(data):
+		return SubstringValidator(data)
+
+	@staticmethod
+	def regex(data):
+		return RegexValidator(data)
+
+	@staticmethod
+	def json(data):
+		return JSONPathValidator(data)
+
+	@staticmethod
+	def max_size(data):
+		return MaxSizeValidator(data)
+
+
+# clem 18/10/2026
+def get_validator(validation_type, data):
+	""" :return: a new BodyValidator of validation_type, None if validation_type is empty
+	:rtype: BodyValidator | None
+	:raises: ValueError if the type is unknown or the data invalid for it
+	"""
+	if not validation_type:
+		return None
+	factories = Validators.enum_functions()
+	if validation_type not in factories:
+		raise ValueError('unknown validation type "%s", not in %s' % (validation_type, sorted(factories)))
+	try:
+		return factories[validation_type](data)
+	except re.error as e:
+		raise ValueError('invalid regex "%s" : %s' % (data, e))